@@ -0,0 +1,39 @@
+"""add_room_inventory
+
+Revision ID: a7b8c9d0e1f2
+Revises: f1a2b3c4d5e6
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7b8c9d0e1f2'
+down_revision: Union[str, Sequence[str], None] = 'f1a2b3c4d5e6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('room_types', sa.Column('room_count', sa.Integer(), server_default='1', nullable=False))
+    op.create_table('room_inventory',
+    sa.Column('room_type_id', sa.Integer(), nullable=False),
+    sa.Column('stay_date', sa.Date(), nullable=False),
+    sa.Column('allotment', sa.Integer(), nullable=True),
+    sa.Column('reserved', sa.Integer(), server_default='0', nullable=False),
+    sa.CheckConstraint('reserved >= 0', name='ck_room_inventory_reserved_non_negative'),
+    sa.CheckConstraint('allotment IS NULL OR reserved <= allotment', name='ck_room_inventory_not_oversold'),
+    sa.ForeignKeyConstraint(['room_type_id'], ['room_types.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('room_type_id', 'stay_date')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('room_inventory')
+    op.drop_column('room_types', 'room_count')
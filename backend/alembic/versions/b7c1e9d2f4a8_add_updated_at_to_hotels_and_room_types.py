@@ -0,0 +1,30 @@
+"""add_updated_at_to_hotels_and_room_types
+
+Revision ID: b7c1e9d2f4a8
+Revises: a1b2c3d4e5f6
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7c1e9d2f4a8'
+down_revision: Union[str, Sequence[str], None] = 'a1b2c3d4e5f6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('hotels', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')))
+    op.add_column('room_types', sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.text('now()')))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('room_types', 'updated_at')
+    op.drop_column('hotels', 'updated_at')
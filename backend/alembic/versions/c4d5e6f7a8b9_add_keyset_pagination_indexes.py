@@ -0,0 +1,30 @@
+"""add_keyset_pagination_indexes
+
+Revision ID: c4d5e6f7a8b9
+Revises: b7c1e9d2f4a8
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d5e6f7a8b9'
+down_revision: Union[str, Sequence[str], None] = 'b7c1e9d2f4a8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_hotels_name_id', 'hotels', ['name', 'id'], unique=False)
+    op.create_index('ix_rate_adjustments_effective_date_id', 'rate_adjustments', ['effective_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_rate_adjustments_effective_date_id', table_name='rate_adjustments')
+    op.drop_index('ix_hotels_name_id', table_name='hotels')
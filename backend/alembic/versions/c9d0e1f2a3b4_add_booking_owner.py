@@ -0,0 +1,35 @@
+"""add_booking_owner
+
+Revision ID: c9d0e1f2a3b4
+Revises: b8c9d0e1f2a3
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9d0e1f2a3b4'
+down_revision: Union[str, Sequence[str], None] = 'b8c9d0e1f2a3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing bookings keep no owner: only superusers can reach them
+    op.add_column('bookings', sa.Column('user_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'bookings_user_id_fkey', 'bookings', 'users', ['user_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(op.f('ix_bookings_user_id'), 'bookings', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_bookings_user_id'), table_name='bookings')
+    op.drop_constraint('bookings_user_id_fkey', 'bookings', type_='foreignkey')
+    op.drop_column('bookings', 'user_id')
@@ -0,0 +1,36 @@
+"""cascade_rate_adjustment_deletes
+
+Revision ID: d2e3f4a5b6c7
+Revises: c4d5e6f7a8b9
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd2e3f4a5b6c7'
+down_revision: Union[str, Sequence[str], None] = 'c4d5e6f7a8b9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.drop_constraint('rate_adjustments_room_type_id_fkey', 'rate_adjustments', type_='foreignkey')
+    op.create_foreign_key(
+        'rate_adjustments_room_type_id_fkey', 'rate_adjustments', 'room_types',
+        ['room_type_id'], ['id'], ondelete='CASCADE',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('rate_adjustments_room_type_id_fkey', 'rate_adjustments', type_='foreignkey')
+    op.create_foreign_key(
+        'rate_adjustments_room_type_id_fkey', 'rate_adjustments', 'room_types',
+        ['room_type_id'], ['id'],
+    )
@@ -0,0 +1,46 @@
+"""add_fk_indexes_and_hotel_cascade
+
+Revision ID: e5f6a7b8c9d0
+Revises: d2e3f4a5b6c7
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5f6a7b8c9d0'
+down_revision: Union[str, Sequence[str], None] = 'd2e3f4a5b6c7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_rate_adjustments_room_type_date_amount',
+        'rate_adjustments',
+        ['room_type_id', sa.text('effective_date DESC')],
+        unique=False,
+        postgresql_include=['adjustment_amount'],
+    )
+    op.create_index('ix_room_types_hotel_id', 'room_types', ['hotel_id'], unique=False)
+    op.drop_constraint('room_types_hotel_id_fkey', 'room_types', type_='foreignkey')
+    op.create_foreign_key(
+        'room_types_hotel_id_fkey', 'room_types', 'hotels',
+        ['hotel_id'], ['id'], ondelete='CASCADE',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_constraint('room_types_hotel_id_fkey', 'room_types', type_='foreignkey')
+    op.create_foreign_key(
+        'room_types_hotel_id_fkey', 'room_types', 'hotels',
+        ['hotel_id'], ['id'],
+    )
+    op.drop_index('ix_room_types_hotel_id', table_name='room_types')
+    op.drop_index('ix_rate_adjustments_room_type_date_amount', table_name='rate_adjustments')
@@ -0,0 +1,44 @@
+"""add_hotel_search_indexes
+
+Revision ID: f1a2b3c4d5e6
+Revises: e5f6a7b8c9d0
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f1a2b3c4d5e6'
+down_revision: Union[str, Sequence[str], None] = 'e5f6a7b8c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    op.create_index(
+        'ix_hotels_name_trgm', 'hotels', ['name'], unique=False,
+        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+    )
+    op.create_index(
+        'ix_hotels_location_trgm', 'hotels', ['location'], unique=False,
+        postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'},
+    )
+    # Must match app.models.hotel.hotel_search_document()
+    op.create_index(
+        'ix_hotels_search_document', 'hotels',
+        [sa.text("to_tsvector('simple'::regconfig, (coalesce(name, '') || ' ') || coalesce(description, ''))")],
+        unique=False, postgresql_using='gin',
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_hotels_search_document', table_name='hotels')
+    op.drop_index('ix_hotels_location_trgm', table_name='hotels')
+    op.drop_index('ix_hotels_name_trgm', table_name='hotels')
@@ -5,9 +5,10 @@ from sqlalchemy import select
 from jose import jwt, JWTError
 from pydantic import ValidationError
 
-from app.db.session import AsyncSessionLocal
+from app.db.session import AsyncSessionLocal, read_session
 from app.core import security
 from app.core.config import settings
+from app.core.user_cache import user_cache
 from app.models.user import User
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
@@ -16,6 +17,16 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
 
 SessionDep = Annotated[AsyncSession, Depends(get_db)]
 
+# Set on responses to a client's writes; its reads stay on the primary until it expires
+READ_PRIMARY_COOKIE = "read_primary"
+
+async def get_read_db(request: Request) -> AsyncGenerator[AsyncSession, None]:
+    """Session for read-only endpoints, served by the read replica when configured."""
+    async with read_session(prefer_primary=READ_PRIMARY_COOKIE in request.cookies) as session:
+        yield session
+
+ReadSessionDep = Annotated[AsyncSession, Depends(get_read_db)]
+
 async def get_current_user(
     session: SessionDep, request: Request
 ) -> User:
@@ -41,12 +52,18 @@ async def get_current_user(
             detail="Could not validate credentials",
         )
     
-    result = await session.execute(select(User).where(User.id == int(token_data)))
-    user = result.scalar_one_or_none()
-    
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-        
+    user_id = int(token_data)
+    user = user_cache.get_user(user_id)
+    if user is None:
+        # The session only connects here, so cache hits cost no round trip
+        result = await session.execute(select(User).where(User.id == user_id))
+        user = result.scalar_one_or_none()
+
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+
+        user_cache.set_user(user)
+
     if not user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
         
@@ -0,0 +1,179 @@
+import logging
+import re
+import time
+from uuid import uuid4
+
+from starlette.datastructures import Headers
+from starlette.requests import HTTPConnection
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.api.deps import READ_PRIMARY_COOKIE
+from app.core.logging import request_id_var
+from app.core.metrics import (
+    RequestDbStats,
+    http_request_db_duration,
+    http_request_db_queries,
+    http_request_duration,
+    http_requests,
+    http_requests_in_progress,
+    request_db_stats,
+)
+from app.db.session import read_routing
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = {"GET", "HEAD", "OPTIONS"}
+
+class ReadYourWritesMiddleware:
+    """Pins a client's reads to the primary for a short window after it writes.
+
+    Successful non-GET requests from authenticated clients get a short-lived
+    cookie that ``get_read_db`` honours, and mark this worker as recently
+    written so its own caches are not refilled from a lagging replica.
+    """
+
+    def __init__(self, app: ASGIApp, sticky_seconds: int):
+        self.app = app
+        self.cookie = (
+            f"{READ_PRIMARY_COOKIE}=1; Max-Age={sticky_seconds}; Path=/; HttpOnly; SameSite=lax"
+        ).encode()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or scope["method"] in SAFE_METHODS
+            or "access_token" not in HTTPConnection(scope).cookies
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                read_routing.note_write()
+                message["headers"] = [*message.get("headers", []), (b"set-cookie", self.cookie)]
+            await send(message)
+
+        await self.app(scope, receive, send_wrapper)
+
+def route_template(scope: Scope) -> str:
+    """Path template of the matched route, e.g. ``/api/v1/hotels/{hotel_id}``."""
+    route = scope.get("route")
+    if route is None:
+        return "unmatched"
+    # Depending on the FastAPI version route.path may lack the include_router
+    # prefixes; take them from the request path (every parameter is one segment)
+    segments = [segment for segment in route.path.split("/") if segment]
+    parts = scope["path"].rstrip("/").split("/")
+    return "/".join(parts[: len(parts) - len(segments)]) + route.path
+
+class MetricsMiddleware:
+    """Records latency, status and database usage of every HTTP request.
+
+    Requests are labeled with the matched route template (``/hotels/{hotel_id}``),
+    not the raw path, so label cardinality stays bounded.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status = 500
+        stats = RequestDbStats(parent=request_db_stats.get())
+        token = request_db_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_requests_in_progress.inc(method)
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - started
+            http_requests_in_progress.dec(method)
+            request_db_stats.reset(token)
+            template = route_template(scope)
+            http_requests.inc(method, template, str(status))
+            http_request_duration.observe(method, template, value=elapsed)
+            http_request_db_queries.observe(method, template, value=stats.queries)
+            http_request_db_duration.observe(method, template, value=stats.seconds)
+
+class QueryDebugMiddleware:
+    """Development aid: reports each request's queries.
+
+    Adds a ``Server-Timing`` header with the DB time and statement count up to
+    the response start, and logs a warning with the statement when a request
+    repeats one ``repeat_threshold`` times or more (typically an N+1 loop).
+    """
+
+    def __init__(self, app: ASGIApp, repeat_threshold: int):
+        self.app = app
+        self.repeat_threshold = repeat_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Statements still reach the metrics middleware's stats through parent
+        stats = RequestDbStats(parent=request_db_stats.get())
+        stats.count_statements()
+        token = request_db_stats.set(stats)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [
+                    *message.get("headers", []),
+                    (b"server-timing", stats.server_timing().encode()),
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_db_stats.reset(token)
+            for statement, count in stats.repeated(self.repeat_threshold):
+                logger.warning(
+                    "%s %s ran the same statement %d times (%d queries in total): %s",
+                    scope["method"], scope["path"], count, stats.queries, statement,
+                )
+
+_REQUEST_ID = re.compile(r"[A-Za-z0-9._-]{1,128}")
+
+class RequestIdMiddleware:
+    """Correlates log records with the request that produced them.
+
+    Reuses a well-formed incoming ``X-Request-ID`` (set by a proxy) or
+    generates one, exposes it to logging and echoes it on the response.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = Headers(scope=scope).get("x-request-id")
+        if request_id is None or not _REQUEST_ID.fullmatch(request_id):
+            request_id = uuid4().hex
+        token = request_id_var.set(request_id)
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = [*message.get("headers", []), (b"x-request-id", request_id.encode())]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            request_id_var.reset(token)
@@ -0,0 +1,23 @@
+from datetime import date, timedelta
+from typing import Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.core.config import settings
+
+def stay_nights(start: date, end: Optional[date]) -> Tuple[date, int]:
+    """Validate a stay and return (check-out date, nights).
+
+    ``end`` is the check-out date (exclusive) and defaults to a single night.
+    """
+    if end is None:
+        end = start + timedelta(days=1)
+    nights = (end - start).days
+    if nights < 1:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if nights > settings.PRICE_CALENDAR_MAX_NIGHTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Date range cannot exceed {settings.PRICE_CALENDAR_MAX_NIGHTS} nights",
+        )
+    return end, nights
@@ -1,8 +1,11 @@
 from fastapi import APIRouter
-from app.api.v1.endpoints import login, users, hotels, rates
+from app.api.v1.endpoints import login, users, hotels, rates, availability, bookings, monitoring
 
 api_router = APIRouter()
 api_router.include_router(login.router, tags=["login"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(hotels.router, prefix="/hotels", tags=["hotels"])
 api_router.include_router(rates.router, prefix="/rates", tags=["rates"])
+api_router.include_router(availability.router, prefix="/availability", tags=["availability"])
+api_router.include_router(bookings.router, prefix="/bookings", tags=["bookings"])
+api_router.include_router(monitoring.router, prefix="/monitoring", tags=["monitoring"])
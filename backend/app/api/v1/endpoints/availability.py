@@ -0,0 +1,73 @@
+from typing import List, Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.api.deps import CurrentUser
+from app.api.params import stay_nights
+from app.core.config import settings
+from app.crud import crud_hotel, crud_inventory
+from app.schemas import inventory as schemas
+
+router = APIRouter()
+
+@router.get("/", response_model=List[schemas.HotelAvailability], response_model_by_alias=True)
+async def read_availability(
+    start: date,
+    hotel_ids: List[int] = Query(..., alias="hotelId", description="Repeat for several hotels"),
+    end: Optional[date] = None,
+    guests: int = Query(1, ge=1),
+    rooms: int = Query(1, ge=1),
+    db: AsyncSession = Depends(deps.get_read_db),
+):
+    """
+    Public endpoint - room types that can be sold for the whole stay.
+
+    ``end`` is the check-out date (exclusive), defaulting to a single night.
+    Only room types sleeping ``guests`` with at least ``rooms`` rooms free on
+    every night are listed; hotels with none are omitted.
+    """
+    end, nights = stay_nights(start, end)
+    if len(hotel_ids) > settings.AVAILABILITY_MAX_HOTELS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot query more than {settings.AVAILABILITY_MAX_HOTELS} hotels at once",
+        )
+
+    rows = await crud_inventory.get_availability(
+        db, hotel_ids=sorted(set(hotel_ids)), start=start, nights=nights, guests=guests, rooms=rooms
+    )
+    hotels = {}
+    for row in rows:
+        hotel = hotels.get(row.hotel_id)
+        if hotel is None:
+            hotel = hotels[row.hotel_id] = schemas.HotelAvailability(hotel_id=row.hotel_id, room_types=[])
+        hotel.room_types.append(schemas.RoomTypeAvailability(
+            room_type_id=row.room_type_id, name=row.name, capacity=row.capacity, available_rooms=row.available
+        ))
+    return list(hotels.values())
+
+@router.put("/rooms/{room_id}", status_code=204)
+async def update_allotment(
+    room_id: int,
+    update: schemas.AllotmentUpdate,
+    current_user: CurrentUser,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Set how many rooms of a type are for sale on each night of a range.
+
+    Refused with 409 when a night already has more rooms reserved than the
+    new allotment; nothing is changed in that case.
+    """
+    _, nights = stay_nights(update.start, update.end)
+    if await crud_hotel.get_room_type_hotel_id(db, room_id=room_id) is None:
+        raise HTTPException(status_code=404, detail="Room type not found")
+    conflicts = await crud_inventory.set_allotment(
+        db, room_type_id=room_id, start=update.start, nights=nights, allotment=update.allotment
+    )
+    if conflicts:
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "More rooms already reserved than the new allotment", "dates": [day.isoformat() for day in conflicts]},
+        )
@@ -0,0 +1,109 @@
+import uuid
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api import deps
+from app.api.deps import CurrentUser
+from app.api.params import stay_nights
+from app.core.config import settings
+from app.crud import crud_booking
+from app.models.booking import Booking
+from app.schemas import booking as schemas
+
+router = APIRouter()
+
+def _owner_filter(user) -> Optional[int]:
+    # Superusers see and change every booking; everyone else only their own
+    return None if user.is_superuser else user.id
+
+@router.post("/", response_model=schemas.Booking, response_model_by_alias=True, status_code=201)
+async def create_hold(
+    hold: schemas.BookingCreate,
+    current_user: CurrentUser,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Protected endpoint - hold rooms for a stay.
+
+    The hold expires after ``HOLD_TTL_SECONDS`` unless confirmed. Returns 409
+    when any night does not have enough rooms left, and 429 while the user
+    already has ``HOLD_MAX_ACTIVE_PER_USER`` live holds.
+    """
+    _, nights = stay_nights(hold.start, hold.end)
+    if await crud_booking.lock_active_holds(db, user_id=current_user.id) >= settings.HOLD_MAX_ACTIVE_PER_USER:
+        await db.rollback()
+        raise HTTPException(
+            status_code=429,
+            detail=f"At most {settings.HOLD_MAX_ACTIVE_PER_USER} active holds; confirm or cancel one first",
+        )
+    try:
+        booking = await crud_booking.create_hold(
+            db,
+            room_type_id=hold.room_type_id,
+            start=hold.start,
+            nights=nights,
+            quantity=hold.quantity,
+            ttl_seconds=settings.HOLD_TTL_SECONDS,
+            user_id=current_user.id,
+            guest_email=hold.guest_email,
+        )
+    except IntegrityError:
+        # The inventory FK rejected the room type id
+        await db.rollback()
+        raise HTTPException(status_code=404, detail="Room type not found")
+    if booking is None:
+        raise HTTPException(status_code=409, detail="Not enough rooms available for these dates")
+    return booking
+
+@router.get("/{booking_id}", response_model=schemas.Booking, response_model_by_alias=True)
+async def read_booking(
+    booking_id: uuid.UUID,
+    current_user: CurrentUser,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """Protected endpoint - 404 for bookings of other users"""
+    booking = await crud_booking.get_booking(db, booking_id=booking_id, user_id=_owner_filter(current_user))
+    if booking is None:
+        raise HTTPException(status_code=404, detail="Booking not found")
+    return booking
+
+async def _transition_failed(db: AsyncSession, booking_id: uuid.UUID, user_id: Optional[int], action: str) -> HTTPException:
+    # Only runs after the compare-and-set matched nothing, to pick the right error
+    booking: Optional[Booking] = await crud_booking.get_booking(db, booking_id=booking_id, user_id=user_id)
+    if booking is None:
+        return HTTPException(status_code=404, detail="Booking not found")
+    return HTTPException(
+        status_code=409,
+        detail={"message": f"Booking cannot be {action}", "status": booking.status, "version": booking.version},
+    )
+
+@router.post("/{booking_id}/confirm", response_model=schemas.Booking, response_model_by_alias=True)
+async def confirm_booking(
+    booking_id: uuid.UUID,
+    current_user: CurrentUser,
+    transition: Optional[schemas.BookingTransition] = None,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """Protected endpoint - confirm a live hold; 409 if it expired, was cancelled or changed since ``version``"""
+    version = transition.version if transition else None
+    owner = _owner_filter(current_user)
+    booking = await crud_booking.confirm_hold(db, booking_id=booking_id, expected_version=version, user_id=owner)
+    if booking is None:
+        raise await _transition_failed(db, booking_id, owner, "confirmed")
+    return booking
+
+@router.post("/{booking_id}/cancel", response_model=schemas.Booking, response_model_by_alias=True)
+async def cancel_booking(
+    booking_id: uuid.UUID,
+    current_user: CurrentUser,
+    transition: Optional[schemas.BookingTransition] = None,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """Protected endpoint - cancel a hold or booking and release its rooms"""
+    version = transition.version if transition else None
+    owner = _owner_filter(current_user)
+    booking = await crud_booking.cancel_booking(db, booking_id=booking_id, expected_version=version, user_id=owner)
+    if booking is None:
+        raise await _transition_failed(db, booking_id, owner, "cancelled")
+    return booking
@@ -1,22 +1,211 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+from typing import List, Literal, Optional, Union
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
+from app.api.conditional import is_not_modified, make_etag, not_modified, start_of_day, validator_headers
 from app.api.deps import CurrentUser
+from app.api.params import stay_nights
+from app.core.cache import CATALOG_ROOMS_SCOPE, CATALOG_SCOPE, bump_rooms, hotel_scope, response_cache, version_time
+from app.core.config import settings
+from app.core.export import EXPORT_MEDIA_TYPES, encode_rows
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.serialization import dumps
 from app.schemas import hotel as schemas
-from app.crud import crud_hotel
+from app.schemas.pagination import CursorPage
+from app.crud import crud_hotel, crud_inventory, crud_rate
+from app.db.session import read_session
 
 router = APIRouter()
 
-@router.get("/", response_model=List[schemas.Hotel], response_model_by_alias=True)
+_hotel_adapter = TypeAdapter(schemas.Hotel)
+_hotel_min_price_list_adapter = TypeAdapter(List[schemas.HotelWithMinPrice])
+
+def _dump_json(adapter: TypeAdapter, obj) -> bytes:
+    return adapter.dump_json(adapter.validate_python(obj, from_attributes=True), by_alias=True)
+
+def _fill_session():
+    """Session for producing shared cache entries.
+
+    An entry is stored under the cache version read before it was produced; a
+    lagging replica may not reflect the write behind that version yet, so the
+    primary fills it.
+    """
+    return read_session(prefer_primary=True)
+
+def _json_response(body: bytes, headers: Optional[dict] = None) -> Response:
+    return Response(content=body, media_type="application/json", headers=headers)
+
+def _parse_hotel_cursor(cursor: str, order_by: str) -> Optional[tuple]:
+    if not cursor:
+        return None
+    try:
+        sort, *key = decode_cursor(cursor)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if sort != order_by:
+        raise HTTPException(status_code=400, detail="Cursor does not match order_by")
+    if order_by == "name":
+        valid = len(key) == 2 and isinstance(key[0], str) and isinstance(key[1], int)
+    else:
+        valid = len(key) == 1 and isinstance(key[0], int)
+    if not valid:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return tuple(key)
+
+HOTEL_INCLUDES = {"rooms", "prices"}
+
+def _parse_include(include: Optional[str]) -> frozenset:
+    if not include:
+        return frozenset()
+    parts = frozenset(part.strip() for part in include.split(",") if part.strip())
+    unknown = parts - HOTEL_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown include: {', '.join(sorted(unknown))} (allowed: {', '.join(sorted(HOTEL_INCLUDES))})",
+        )
+    return parts
+
+def _hotel_item_schema(includes: frozenset) -> type:
+    if "rooms" in includes:
+        return schemas.HotelWithRooms
+    if "prices" in includes:
+        return schemas.HotelWithMinPrice
+    return schemas.Hotel
+
+_hotel_list_adapters = {
+    item: TypeAdapter(List[item]) for item in (schemas.Hotel, schemas.HotelWithMinPrice, schemas.HotelWithRooms)
+}
+_hotel_page_adapters = {
+    item: TypeAdapter(CursorPage[item]) for item in (schemas.Hotel, schemas.HotelWithMinPrice, schemas.HotelWithRooms)
+}
+
+@router.get(
+    "/",
+    response_model=Union[
+        List[schemas.Hotel],
+        CursorPage[schemas.Hotel],
+        List[schemas.HotelWithMinPrice],
+        CursorPage[schemas.HotelWithMinPrice],
+        List[schemas.HotelWithRooms],
+        CursorPage[schemas.HotelWithRooms],
+    ],
+    response_model_by_alias=True,
+)
 async def read_hotels(
-    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
+    order_by: Literal["id", "name"] = "id",
+    include: Optional[str] = Query(
+        None, description="Comma separated: rooms (embed room types), prices (each hotel's lowest price today)"
+    ),
 ):
-    """Public endpoint - no authentication required"""
-    hotels = await crud_hotel.get_hotels(db, skip=skip, limit=limit)
-    return hotels
+    """
+    Public endpoint - no authentication required
+
+    Offset paging (a plain list) unless ``cursor`` is given: pass it empty for the
+    first page, then the returned ``nextCursor``, to page by keyset instead.
+
+    ``include`` embeds related data for the whole page in a fixed number of
+    queries (one for the room types, at most one for uncached prices);
+    ``rooms`` implies ``prices``.
+    """
+    includes = _parse_include(include)
+    after = _parse_hotel_cursor(cursor, order_by) if cursor is not None else None
+    page = ("offset", skip, limit) if cursor is None else ("cursor", order_by, cursor, limit)
+
+    # Every hotel write bumps the catalog version, so it identifies the data
+    # and dates its last change without scanning the table
+    version = await response_cache.version(CATALOG_SCOPE)
+    representation = ()
+    modified = ()
+    if includes:
+        # Room and rate writes bump the catalog room version and prices roll
+        # over at midnight, so both identify the embedded rooms and prices
+        today = date.today()
+        rooms_version = await response_cache.version(CATALOG_ROOMS_SCOPE)
+        if rooms_version is None:
+            version = None
+        else:
+            representation = (tuple(sorted(includes)), rooms_version, today)
+            modified = (version_time(rooms_version), start_of_day(today))
+    headers = None
+    if version is not None:
+        last_modified = max(version_time(version), *modified)
+        headers = validator_headers(make_etag("hotels", version, *page, *representation), last_modified)
+        if is_not_modified(request, headers["ETag"], last_modified):
+            return not_modified(headers)
+
+    item = _hotel_item_schema(includes)
+
+    async def load_rows() -> bytes:
+        # Fast path: response-shaped Core rows encoded directly, no ORM or Pydantic
+        async with _fill_session() as fill_db:
+            if cursor is None:
+                return dumps(await crud_hotel.get_hotel_rows(fill_db, skip=skip, limit=limit))
+            rows, next_key = await crud_hotel.get_hotel_rows_page(fill_db, limit=limit, order_by=order_by, after=after)
+        return dumps({"items": rows, "nextCursor": encode_cursor(order_by, *next_key) if next_key else None})
+
+    async def load() -> bytes:
+        async with _fill_session() as fill_db:
+            if cursor is None:
+                hotels = await crud_hotel.get_hotels(fill_db, skip=skip, limit=limit, include_rooms=True)
+                next_cursor = None
+            else:
+                hotels, next_key = await crud_hotel.get_hotels_page(
+                    fill_db, limit=limit, order_by=order_by, after=after, include_rooms=True
+                )
+                next_cursor = encode_cursor(order_by, *next_key) if next_key else None
+            # Stored for every worker: not from this worker's price cache, which
+            # other workers' rate writes do not invalidate
+            await crud_hotel.resolve_hotel_prices(fill_db, hotels, use_cache=False)
+        if cursor is None:
+            return _dump_json(_hotel_list_adapters[item], hotels)
+        return _dump_json(_hotel_page_adapters[item], CursorPage[item](items=hotels, next_cursor=next_cursor))
+
+    # Without a version (cache backend down) the response is neither cached nor validated
+    key = None if version is None else response_cache.key(CATALOG_SCOPE, version, "hotels", *page, *representation)
+    return _json_response(await response_cache.get_or_set(key, load if includes else load_rows), headers)
+
+@router.get("/search", response_model=List[schemas.HotelWithMinPrice], response_model_by_alias=True)
+async def search_hotels(
+    q: Optional[str] = Query(None, description="Free text matched against name and description"),
+    location: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    capacity: Optional[int] = Query(None, ge=1),
+    sort: Literal["relevance", "rating", "price", "name"] = "relevance",
+    skip: int = Query(0, ge=0),
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(deps.get_read_db),
+):
+    """
+    Public endpoint - search hotels by text, location, rating, price band and capacity.
+
+    Prices are today's effective room prices; each result carries the
+    cheapest matching room as ``minPrice``.
+    """
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(status_code=400, detail="min_price cannot exceed max_price")
+    hotels = await crud_hotel.search_hotels(
+        db,
+        q=q.strip() if q else None,
+        location=location.strip() if location else None,
+        min_rating=min_rating,
+        min_price=min_price,
+        max_price=max_price,
+        capacity=capacity,
+        sort=sort,
+        skip=skip,
+        limit=limit,
+    )
+    return _json_response(_dump_json(_hotel_min_price_list_adapter, hotels))
 
 @router.post("/", response_model=schemas.Hotel, response_model_by_alias=True)
 async def create_hotel(
@@ -25,18 +214,33 @@ async def create_hotel(
     db: AsyncSession = Depends(deps.get_db),
 ):
     """Protected endpoint - requires authentication"""
-    return await crud_hotel.create_hotel(db=db, hotel=hotel)
+    db_hotel = await crud_hotel.create_hotel(db=db, hotel=hotel)
+    await response_cache.bump(CATALOG_SCOPE)
+    return db_hotel
 
 @router.get("/{hotel_id}", response_model=schemas.Hotel, response_model_by_alias=True)
 async def read_hotel(
     hotel_id: int,
-    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
+    db: AsyncSession = Depends(deps.get_read_db),
 ):
     """Public endpoint - no authentication required"""
-    db_hotel = await crud_hotel.get_hotel(db, hotel_id=hotel_id)
-    if db_hotel is None:
+    last_modified = await crud_hotel.get_hotel_updated_at(db, hotel_id=hotel_id)
+    if last_modified is None:
         raise HTTPException(status_code=404, detail="Hotel not found")
-    return db_hotel
+    headers = validator_headers(make_etag("hotel", hotel_id, last_modified), last_modified)
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return not_modified(headers)
+
+    async def load() -> bytes:
+        async with _fill_session() as fill_db:
+            db_hotel = await crud_hotel.get_hotel(fill_db, hotel_id=hotel_id)
+        if db_hotel is None:
+            raise HTTPException(status_code=404, detail="Hotel not found")
+        return _dump_json(_hotel_adapter, db_hotel)
+
+    key = await response_cache.versioned_key(hotel_scope(hotel_id), "detail")
+    return _json_response(await response_cache.get_or_set(key, load), headers)
 
 @router.put("/{hotel_id}", response_model=schemas.Hotel, response_model_by_alias=True)
 async def update_hotel(
@@ -49,6 +253,7 @@ async def update_hotel(
     db_hotel = await crud_hotel.update_hotel(db, hotel_id=hotel_id, hotel=hotel)
     if db_hotel is None:
         raise HTTPException(status_code=404, detail="Hotel not found")
+    await response_cache.bump(CATALOG_SCOPE, hotel_scope(hotel_id))
     return db_hotel
 
 @router.delete("/{hotel_id}", response_model=schemas.Hotel, response_model_by_alias=True)
@@ -58,10 +263,10 @@ async def delete_hotel(
     db: AsyncSession = Depends(deps.get_db),
 ):
     """Protected endpoint - requires authentication"""
-    db_hotel = await crud_hotel.get_hotel(db, hotel_id=hotel_id)
+    db_hotel = await crud_hotel.delete_hotel(db, hotel_id=hotel_id)
     if not db_hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
-    await crud_hotel.delete_hotel(db, hotel_id=hotel_id)
+    await response_cache.bump(CATALOG_SCOPE, hotel_scope(hotel_id))
     return db_hotel
 
 @router.post("/{hotel_id}/rooms", response_model=schemas.RoomType, response_model_by_alias=True)
@@ -75,20 +280,119 @@ async def create_room_type(
     db_hotel = await crud_hotel.get_hotel(db, hotel_id=hotel_id)
     if not db_hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
-    return await crud_hotel.create_room_type(db=db, room_type=room_type, hotel_id=hotel_id)
+    db_room_type = await crud_hotel.create_room_type(db=db, room_type=room_type, hotel_id=hotel_id)
+    await bump_rooms([hotel_id])
+    return db_room_type
 
 @router.get("/{hotel_id}/rooms", response_model=List[schemas.RoomType], response_model_by_alias=True)
 async def read_room_types(
     hotel_id: int,
-    skip: int = 0,
-    limit: int = 100,
-    db: AsyncSession = Depends(deps.get_db),
+    request: Request,
+    db: AsyncSession = Depends(deps.get_read_db),
 ):
-    """Public endpoint - no authentication required"""
+    """
+    Public endpoint - no authentication required
+
+    Always the hotel's full room list, which the ETag and cached entry cover.
+    """
+    validators = await crud_hotel.get_room_types_validators(db, hotel_id=hotel_id)
+    if validators is None:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+    count, rooms_modified = validators
+    # Effective prices roll over at midnight, so the date is part of the representation
+    today = date.today()
+    last_modified = max(filter(None, (rooms_modified, start_of_day(today))))
+    headers = validator_headers(make_etag("rooms", hotel_id, count, rooms_modified, today), last_modified)
+    if is_not_modified(request, headers["ETag"], last_modified):
+        return not_modified(headers)
+
+    async def load() -> bytes:
+        async with _fill_session() as fill_db:
+            hotel = await crud_hotel.get_hotel(fill_db, hotel_id=hotel_id)
+            if not hotel:
+                raise HTTPException(status_code=404, detail="Hotel not found")
+            # Shared entry: prices bypass this worker's price cache (see read_hotels)
+            return dumps(await crud_hotel.get_room_type_rows(fill_db, hotel_id=hotel_id, use_cache=False))
+
+    key = await response_cache.versioned_key(hotel_scope(hotel_id), "rooms", today)
+    return _json_response(await response_cache.get_or_set(key, load), headers)
+
+@router.get("/{hotel_id}/rooms/prices", response_model=schemas.PriceCalendar, response_model_by_alias=True)
+async def read_room_prices(
+    hotel_id: int,
+    start: date,
+    end: Optional[date] = None,
+    db: AsyncSession = Depends(deps.get_read_db),
+):
+    """
+    Public endpoint - per-night price calendar for every room type.
+
+    ``start`` is the first night and ``end`` the check-out date (exclusive),
+    defaulting to a single night. Each room type carries the stay total.
+    """
+    end, nights = stay_nights(start, end)
+
     hotel = await crud_hotel.get_hotel(db, hotel_id=hotel_id)
     if not hotel:
         raise HTTPException(status_code=404, detail="Hotel not found")
-    return await crud_hotel.get_room_types(db, hotel_id=hotel_id)
+
+    rows = await crud_rate.get_price_calendar(db, hotel_id=hotel_id, start=start, nights=nights)
+    room_types = {}
+    for row in rows:
+        calendar = room_types.get(row.room_type_id)
+        if calendar is None:
+            calendar = room_types[row.room_type_id] = schemas.RoomTypePriceCalendar(
+                room_type_id=row.room_type_id, name=row.name, nights=[], total_price=0.0
+            )
+        calendar.nights.append(schemas.NightlyPrice(stay_date=row.night, price=row.price))
+        calendar.total_price += row.price
+
+    return schemas.PriceCalendar(
+        hotel_id=hotel_id,
+        start=start,
+        end=end,
+        night_count=nights,
+        room_types=list(room_types.values()),
+    )
+
+@router.get("/{hotel_id}/rooms/prices/export")
+async def export_room_prices(
+    hotel_id: int,
+    request: Request,
+    start: date,
+    end: Optional[date] = None,
+    fmt: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    db: AsyncSession = Depends(deps.get_read_db),
+):
+    """Public endpoint - stream the price calendar as CSV or NDJSON rows"""
+    end, nights = stay_nights(start, end)
+    hotel = await crud_hotel.get_hotel(db, hotel_id=hotel_id)
+    if not hotel:
+        raise HTTPException(status_code=404, detail="Hotel not found")
+
+    async def body():
+        # Own session: the cursor must outlive the request's dependencies
+        async with read_session(prefer_primary=deps.READ_PRIMARY_COOKIE in request.cookies) as stream_db:
+            batches = crud_rate.stream_price_calendar(
+                stream_db, hotel_id=hotel_id, start=start, nights=nights, batch_size=settings.EXPORT_BATCH_SIZE
+            )
+            async for chunk in encode_rows(fmt, ("room_type_id", "room_type", "date", "price"), batches):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="hotel_{hotel_id}_prices.{fmt}"'},
+    )
+
+async def _room_type_not_found(db: AsyncSession, hotel_id: int, room_id: int) -> HTTPException:
+    # Only runs after a targeted write matched nothing, to pick the right error
+    hotel_exists, room_hotel_id = await crud_hotel.locate_room_type(db, hotel_id=hotel_id, room_id=room_id)
+    if not hotel_exists:
+        return HTTPException(status_code=404, detail="Hotel not found")
+    if room_hotel_id is None:
+        return HTTPException(status_code=404, detail="Room type not found")
+    return HTTPException(status_code=400, detail="Room type does not belong to this hotel")
 
 @router.put("/{hotel_id}/rooms/{room_id}", response_model=schemas.RoomType, response_model_by_alias=True)
 async def update_room_type(
@@ -98,22 +402,26 @@ async def update_room_type(
     current_user: CurrentUser,
     db: AsyncSession = Depends(deps.get_db),
 ):
-    """Protected endpoint - requires authentication"""
-    # Verify hotel exists
-    hotel = await crud_hotel.get_hotel(db, hotel_id=hotel_id)
-    if not hotel:
-        raise HTTPException(status_code=404, detail="Hotel not found")
-    
-    # Get room type to verify it belongs to hotel
-    db_room_type = await crud_hotel.get_room_type(db, room_id=room_id)
-    if not db_room_type:
-        raise HTTPException(status_code=404, detail="Room type not found")
-    
-    if db_room_type.hotel_id != hotel_id:
-        raise HTTPException(status_code=400, detail="Room type does not belong to this hotel")
-    
-    # Update room type
-    updated_room = await crud_hotel.update_room_type(db, room_id=room_id, room_type=room_type)
+    """
+    Protected endpoint - requires authentication
+
+    Lowering ``roomCount`` below the rooms already reserved on a future night
+    (one without an explicit allotment) is refused with 409; nothing is
+    changed in that case.
+    """
+    # Holds in flight finish first and new ones wait until the new count commits
+    if room_type.room_count is not None and await crud_inventory.lock_room_type(db, hotel_id=hotel_id, room_type_id=room_id):
+        conflicts = await crud_inventory.overbooked_nights(db, room_type_id=room_id, room_count=room_type.room_count)
+        if conflicts:
+            await db.rollback()
+            raise HTTPException(
+                status_code=409,
+                detail={"message": "More rooms already reserved than the new room count", "dates": [day.isoformat() for day in conflicts]},
+            )
+    updated_room = await crud_hotel.update_room_type(db, hotel_id=hotel_id, room_id=room_id, room_type=room_type)
+    if updated_room is None:
+        raise await _room_type_not_found(db, hotel_id, room_id)
+    await bump_rooms([hotel_id])
     return updated_room
 
 @router.delete("/{hotel_id}/rooms/{room_id}", response_model=schemas.RoomType, response_model_by_alias=True)
@@ -124,20 +432,8 @@ async def delete_room_type(
     db: AsyncSession = Depends(deps.get_db),
 ):
     """Protected endpoint - requires authentication"""
-    # Verify hotel exists
-    hotel = await crud_hotel.get_hotel(db, hotel_id=hotel_id)
-    if not hotel:
-        raise HTTPException(status_code=404, detail="Hotel not found")
-    
-    # Get room type before deletion
-    db_room_type = await crud_hotel.get_room_type(db, room_id=room_id)
-    if not db_room_type:
-        raise HTTPException(status_code=404, detail="Room type not found")
-    
-    # Verify room belongs to hotel
-    if db_room_type.hotel_id != hotel_id:
-        raise HTTPException(status_code=400, detail="Room type does not belong to this hotel")
-    
-    # Delete room type
-    await crud_hotel.delete_room_type(db, room_id=room_id)
+    db_room_type = await crud_hotel.delete_room_type(db, hotel_id=hotel_id, room_id=room_id)
+    if db_room_type is None:
+        raise await _room_type_not_found(db, hotel_id, room_id)
+    await bump_rooms([hotel_id])
     return db_room_type
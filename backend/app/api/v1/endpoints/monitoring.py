@@ -0,0 +1,25 @@
+from fastapi import APIRouter
+
+from app.api.deps import CurrentUser
+from app.db.session import pool_stats, read_routing
+from app.schemas.monitoring import DbPoolStats, ReadRoutingStats
+
+router = APIRouter()
+
+@router.get("/db-pool", response_model=DbPoolStats)
+async def read_db_pool_stats(
+    current_user: CurrentUser,
+):
+    """
+    Connection pool usage and checkout wait times of this worker.
+    """
+    return pool_stats()
+
+@router.get("/read-routing", response_model=ReadRoutingStats)
+async def read_read_routing_stats(
+    current_user: CurrentUser,
+):
+    """
+    How this worker's read-only requests were split between replica and primary.
+    """
+    return read_routing.stats()
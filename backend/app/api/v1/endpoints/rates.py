@@ -1,10 +1,27 @@
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException
+import itertools
+import json
+import logging
+import time
+from typing import List, Literal, Optional, Union
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, UploadFile
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from app.api import deps
 from app.api.deps import CurrentUser
 from app.schemas import rate as schemas
-from app.crud import crud_rate
+from app.schemas.pagination import CursorPage
+from app.core.cache import bump_rooms
+from app.core.config import settings
+from app.core.export import EXPORT_MEDIA_TYPES, encode_rows
+from app.core.pagination import decode_cursor, encode_cursor
+from app.core.price_cache import price_cache
+from app.core.serialization import dumps
+from app.crud import crud_hotel, crud_rate
+from app.crud.crud_rate_import import import_rate_adjustments, iter_lines, iter_records
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
@@ -17,16 +34,175 @@ async def create_rate_adjustment(
     """
     Create a new rate adjustment.
     """
-    return await crud_rate.create_rate_adjustment(db=db, rate=rate)
+    # The room's effective price changes: bump its updated_at (committed together
+    # with the adjustment) and the cached room lists and hotel list prices
+    hotel_id = await crud_hotel.touch_room_type(db, room_id=rate.room_type_id)
+    if hotel_id is None:
+        raise HTTPException(status_code=404, detail="Room type not found")
+    db_rate = await crud_rate.create_rate_adjustment(db=db, rate=rate)
+    await bump_rooms([hotel_id])
+    return db_rate
+
+@router.post("/bulk", response_model=schemas.RateAdjustmentBulkResult)
+async def bulk_upsert_rate_adjustments(
+    payload: schemas.RateAdjustmentBulk,
+    current_user: CurrentUser,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    Insert or update many rate adjustments in one transaction.
+
+    Explicit ``adjustments`` and the nights expanded from ``rules`` are merged;
+    when several rows target the same room and date the last one wins and the
+    earlier ones are reported as superseded.
+    """
+    started = time.perf_counter()
+    rows = [adjustment.model_dump() for adjustment in payload.adjustments]
+    rows.extend(itertools.islice(crud_rate.expand_rate_rules(payload.rules), settings.RATE_BULK_MAX_ROWS + 1))
+    if len(rows) > settings.RATE_BULK_MAX_ROWS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Bulk load cannot exceed {settings.RATE_BULK_MAX_ROWS} adjustments",
+        )
+
+    latest = {}
+    for index, row in enumerate(rows):
+        latest[(row["room_type_id"], row["effective_date"])] = index
+    upserted, room_hotels = await crud_rate.bulk_upsert_rate_adjustments(
+        db, rows=[rows[index] for index in latest.values()]
+    )
+    by_key = {(rate.room_type_id, rate.effective_date): rate for rate in upserted}
+
+    results = []
+    for index, row in enumerate(rows):
+        key = (row["room_type_id"], row["effective_date"])
+        result = schemas.RateAdjustmentBulkRow(room_type_id=key[0], effective_date=key[1], status="error")
+        if latest[key] != index:
+            result.status = "superseded"
+        elif key[0] not in room_hotels:
+            result.error = "Room type not found"
+        else:
+            result.id = by_key[key].id
+            result.status = "inserted" if by_key[key].inserted else "updated"
+        results.append(result)
+
+    await bump_rooms(room_hotels.values())
+    elapsed = time.perf_counter() - started
+    counts = {status: 0 for status in ("inserted", "updated", "superseded", "error")}
+    for result in results:
+        counts[result.status] += 1
+    return schemas.RateAdjustmentBulkResult(
+        received=len(rows),
+        inserted=counts["inserted"],
+        updated=counts["updated"],
+        superseded=counts["superseded"],
+        failed=counts["error"],
+        elapsed_ms=round(elapsed * 1000, 3),
+        rows_per_second=round(len(rows) / elapsed, 1) if elapsed > 0 else 0.0,
+        results=results,
+    )
+
+@router.post("/import")
+async def import_rate_sheet(
+    current_user: CurrentUser,
+    file: UploadFile,
+    fmt: Optional[Literal["csv", "ndjson"]] = Query(None, alias="format"),
+):
+    """
+    Stream-import a rate sheet: CSV with a header row, or NDJSON.
+
+    Columns/keys are those of a rate adjustment. Rows are validated and merged
+    in chunks (last row wins per room and date); the response streams NDJSON
+    events: ``error`` per rejected line, ``progress`` per committed chunk and a
+    final ``summary``.
+    """
+    if fmt is None:
+        name = (file.filename or "").lower()
+        is_ndjson = name.endswith((".ndjson", ".jsonl")) or "ndjson" in (file.content_type or "")
+        fmt = "ndjson" if is_ndjson else "csv"
 
-@router.get("/", response_model=List[schemas.RateAdjustment])
+    async def events():
+        # Own session: the import outlives the request's dependencies
+        async with AsyncSessionLocal() as db:
+            try:
+                async for event in import_rate_adjustments(
+                    db,
+                    iter_records(iter_lines(file.read), fmt),
+                    chunk_size=settings.RATE_IMPORT_CHUNK_SIZE,
+                    max_errors=settings.RATE_IMPORT_MAX_ERRORS,
+                    on_chunk=lambda room_hotels: bump_rooms(room_hotels.values()),
+                ):
+                    yield json.dumps(event, default=str) + "\n"
+            except Exception as exc:
+                logger.exception("Rate import failed")
+                yield json.dumps({"event": "failed", "error": str(exc)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@router.get("/export")
+async def export_rate_adjustments(
+    current_user: CurrentUser,
+    fmt: Literal["csv", "ndjson"] = Query("csv", alias="format"),
+    room_type_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+):
+    """
+    Stream all matching rate adjustments as CSV or NDJSON, in id order.
+
+    Rows come from a server-side cursor and are written as they arrive, so
+    memory does not grow with the size of the export.
+    """
+    async def body():
+        # Own session: the cursor must outlive the request's dependencies
+        async with AsyncSessionLocal() as db:
+            batches = crud_rate.stream_rate_adjustments(
+                db, room_type_id=room_type_id, start=start, end=end, batch_size=settings.EXPORT_BATCH_SIZE
+            )
+            async for chunk in encode_rows(fmt, crud_rate.EXPORT_COLUMNS, batches):
+                yield chunk
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="rate_adjustments.{fmt}"'},
+    )
+
+@router.get("/", response_model=Union[List[schemas.RateAdjustment], CursorPage[schemas.RateAdjustment]])
 async def read_rate_adjustments(
     current_user: CurrentUser,
     skip: int = 0,
     limit: int = 100,
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(deps.get_db),
 ):
     """
-    Retrieve rate adjustments.
+    Retrieve rate adjustments, newest effective date first.
+
+    Offset paging unless ``cursor`` is given (empty for the first page), in which
+    case a keyset page with ``nextCursor`` is returned.
+    """
+    if cursor is None:
+        rows = await crud_rate.get_rate_adjustment_rows(db, skip=skip, limit=limit)
+        return Response(content=dumps(rows), media_type="application/json")
+
+    after = None
+    if cursor:
+        try:
+            effective_date, rate_id = decode_cursor(cursor)
+            after = (date.fromisoformat(effective_date), int(rate_id))
+        except (ValueError, TypeError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    rows, next_key = await crud_rate.get_rate_adjustment_rows_page(db, limit=limit, after=after)
+    body = {"items": rows, "nextCursor": encode_cursor(*next_key) if next_key else None}
+    return Response(content=dumps(body), media_type="application/json")
+
+@router.get("/price-cache", response_model=schemas.PriceCacheStats)
+async def read_price_cache_stats(
+    current_user: CurrentUser,
+):
+    """
+    Hit/miss/eviction counters of this worker's price cache.
     """
-    return await crud_rate.get_rate_adjustments(db, skip=skip, limit=limit)
+    return price_cache.stats()
@@ -0,0 +1,367 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Tuple
+from urllib.parse import unquote, urlparse
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+class CacheBackend(ABC):
+    """Minimal key/value interface shared by every cache implementation."""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]: ...
+
+    @abstractmethod
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None: ...
+
+    @abstractmethod
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        """Set ``key`` only if it does not exist. Returns True when the value was stored."""
+
+    @abstractmethod
+    async def delete(self, key: str) -> None: ...
+
+    @abstractmethod
+    async def advance(self, key: str, floor: int) -> int:
+        """Atomically set the counter ``key`` to max(current + 1, ``floor``) and return it."""
+
+    async def close(self) -> None:
+        pass
+
+class InMemoryCacheBackend(CacheBackend):
+    """Per-process stand-in for Redis: bounded LRU with per-key expiry."""
+
+    def __init__(self, maxsize: int = 10_000):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Tuple[bytes, Optional[float]]]" = OrderedDict()
+        # Counters live outside the LRU: evicting a version would resurrect old keys
+        self._counters: Dict[str, int] = {}
+
+    def _live(self, key: str) -> Optional[bytes]:
+        if key in self._counters:
+            return str(self._counters[key]).encode()
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return self._live(key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + ttl if ttl else None
+        self._data[key] = (value, expires_at)
+        self._data.move_to_end(key)
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        if self._live(key) is not None:
+            return False
+        await self.set(key, value, ttl)
+        return True
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+        self._counters.pop(key, None)
+
+    async def advance(self, key: str, floor: int) -> int:
+        value = max(self._counters.get(key, 0) + 1, floor)
+        self._counters[key] = value
+        return value
+
+class RedisError(Exception):
+    pass
+
+class _RedisConnection:
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    async def execute(self, *args) -> object:
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        self.writer.write(b"".join(parts))
+        await self.writer.drain()
+        return await self._read_reply()
+
+    async def _read_reply(self) -> object:
+        line = await self.reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b"-":
+            raise RedisError(payload.decode())
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length == -1:
+                return None
+            data = await self.reader.readexactly(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            if length == -1:
+                return None
+            return [await self._read_reply() for _ in range(length)]
+        raise RedisError(f"Unexpected reply type {kind!r}")
+
+    def close(self) -> None:
+        self.writer.close()
+
+class RedisCacheBackend(CacheBackend):
+    """Cache backend speaking the Redis protocol (RESP2) over asyncio streams.
+
+    Works with Redis, Valkey, KeyDB or any RESP-compatible fake server. Keeps a
+    small pool of connections; each command borrows one for its round trip.
+    """
+
+    def __init__(self, url: str, pool_size: int = 10, timeout: float = 1.0):
+        parsed = urlparse(url)
+        self.host = parsed.hostname or "localhost"
+        self.port = parsed.port or 6379
+        self.password = unquote(parsed.password) if parsed.password else None
+        self.db = int(parsed.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._pool: "asyncio.LifoQueue[Optional[_RedisConnection]]" = asyncio.LifoQueue()
+        for _ in range(pool_size):
+            self._pool.put_nowait(None)
+
+    async def _connect(self) -> _RedisConnection:
+        reader, writer = await asyncio.open_connection(self.host, self.port)
+        conn = _RedisConnection(reader, writer)
+        if self.password:
+            await conn.execute("AUTH", self.password)
+        if self.db:
+            await conn.execute("SELECT", self.db)
+        return conn
+
+    async def execute(self, *args) -> object:
+        conn = await self._pool.get()
+        try:
+            if conn is None:
+                conn = await asyncio.wait_for(self._connect(), self.timeout)
+            reply = await asyncio.wait_for(conn.execute(*args), self.timeout)
+        except BaseException:
+            # Drop the connection: a half-read reply would desync the stream
+            if conn is not None:
+                conn.close()
+            self._pool.put_nowait(None)
+            raise
+        self._pool.put_nowait(conn)
+        return reply
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self.execute("GET", key)
+
+    async def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        if ttl:
+            await self.execute("SET", key, value, "PX", int(ttl * 1000))
+        else:
+            await self.execute("SET", key, value)
+
+    async def add(self, key: str, value: bytes, ttl: Optional[float] = None) -> bool:
+        if ttl:
+            reply = await self.execute("SET", key, value, "NX", "PX", int(ttl * 1000))
+        else:
+            reply = await self.execute("SET", key, value, "NX")
+        return reply == "OK"
+
+    async def delete(self, key: str) -> None:
+        await self.execute("DEL", key)
+
+    # Lua numbers are doubles: exact for millisecond timestamps, and %d keeps them out of exponent notation
+    _ADVANCE_SCRIPT = (
+        "local value = math.max(tonumber(redis.call('GET', KEYS[1]) or '0') + 1, tonumber(ARGV[1])) "
+        "redis.call('SET', KEYS[1], string.format('%d', value)) "
+        "return value"
+    )
+
+    async def advance(self, key: str, floor: int) -> int:
+        return await self.execute("EVAL", self._ADVANCE_SCRIPT, 1, key, floor)
+
+    async def close(self) -> None:
+        while not self._pool.empty():
+            conn = self._pool.get_nowait()
+            if conn is not None:
+                conn.close()
+
+def create_cache_backend(url: Optional[str]) -> CacheBackend:
+    if not url or url.startswith("memory://"):
+        return InMemoryCacheBackend(maxsize=settings.CACHE_MAX_ENTRIES)
+    if url.startswith(("redis://", "valkey://")):
+        return RedisCacheBackend(url)
+    raise ValueError(f"Unsupported cache URL: {url}")
+
+class ResponseCache:
+    """Serialized-response cache with versioned keys and stampede protection.
+
+    Keys embed a version per scope (the catalog, or one hotel); writers bump
+    the version instead of deleting keys, so every worker stops reading the
+    old entries at once and they simply age out. A version is the time of the
+    scope's last bump in milliseconds (kept strictly increasing), so it also
+    serves as the ETag and Last-Modified of what the scope covers, without
+    querying the database. Writes that bypass the API must bump the scopes
+    they change.
+
+    On a miss only one caller recomputes a key: concurrent callers in this
+    process await the same task, and across processes a short-lived lock key
+    makes the others poll for the winner's value. Backend failures degrade to
+    computing the response uncached.
+    """
+
+    def __init__(self, backend: CacheBackend, ttl: float, lock_ttl: float, namespace: str = "bhp"):
+        self.backend = backend
+        self.ttl = ttl
+        self.lock_ttl = lock_ttl
+        self.namespace = namespace
+        self._inflight: Dict[str, "asyncio.Task[bytes]"] = {}
+
+    async def version(self, scope: str) -> Optional[int]:
+        """Current version of ``scope``; None when the backend is unavailable.
+
+        A scope without a version (never bumped, or lost by the backend)
+        starts at the current time, since nothing says it is older.
+        """
+        key = f"{self.namespace}:ver:{scope}"
+        try:
+            value = await self.backend.get(key)
+            if value is None:
+                return await self.backend.advance(key, _now_ms())
+            return int(value)
+        except (OSError, RedisError, asyncio.TimeoutError):
+            logger.warning("Cache backend unavailable reading version of %s", scope, exc_info=True)
+            return None
+
+    def key(self, scope: str, version: int, *parts) -> str:
+        return ":".join([self.namespace, scope, f"v{version}", *map(str, parts)])
+
+    async def versioned_key(self, scope: str, *parts) -> Optional[str]:
+        """Key of ``parts`` under the current version of ``scope``; None when it is unknown."""
+        version = await self.version(scope)
+        return None if version is None else self.key(scope, version, *parts)
+
+    async def bump(self, *scopes: str) -> None:
+        for scope in scopes:
+            try:
+                await self.backend.advance(f"{self.namespace}:ver:{scope}", _now_ms())
+            except (OSError, RedisError, asyncio.TimeoutError):
+                logger.warning("Cache backend unavailable bumping %s", scope, exc_info=True)
+
+    async def get_or_set(self, key: Optional[str], producer: Callable[[], Awaitable[bytes]]) -> bytes:
+        """Cached value of ``key``, computing and storing it on a miss; uncached when ``key`` is None."""
+        if key is None:
+            return await producer()
+        task = self._inflight.get(key)
+        if task is None:
+            # Its own task, so a caller cancelled mid-way (client gone) neither
+            # aborts it nor hands CancelledError to the callers still waiting
+            task = asyncio.ensure_future(self._fetch(key, producer))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._fetched(key, done))
+        return await asyncio.shield(task)
+
+    def _fetched(self, key: str, task: "asyncio.Task[bytes]") -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark retrieved so an error nobody awaited any more is not logged
+            task.exception()
+
+    async def _fetch(self, key: str, producer: Callable[[], Awaitable[bytes]]) -> bytes:
+        lock_key = f"{key}:lock"
+        try:
+            cached = await self.backend.get(key)
+            if cached is not None:
+                return cached
+            locked = await self.backend.add(lock_key, b"1", self.lock_ttl)
+            if not locked:
+                cached = await self._wait_for(key)
+                if cached is not None:
+                    return cached
+        except (OSError, RedisError, asyncio.TimeoutError):
+            logger.warning("Cache backend unavailable, serving %s uncached", key, exc_info=True)
+            return await producer()
+
+        try:
+            value = await producer()
+            try:
+                await self.backend.set(key, value, self.ttl)
+            except (OSError, RedisError, asyncio.TimeoutError):
+                logger.warning("Cache backend unavailable storing %s", key, exc_info=True)
+        finally:
+            if locked:
+                try:
+                    await self.backend.delete(lock_key)
+                except (OSError, RedisError, asyncio.TimeoutError):
+                    pass
+        return value
+
+    async def _wait_for(self, key: str) -> Optional[bytes]:
+        # Another worker holds the lock; poll until it publishes or the lock expires
+        deadline = time.monotonic() + self.lock_ttl
+        delay = 0.01
+        while time.monotonic() < deadline:
+            await asyncio.sleep(delay)
+            cached = await self.backend.get(key)
+            if cached is not None:
+                return cached
+            delay = min(delay * 2, 0.2)
+        return None
+
+    async def close(self) -> None:
+        await self.backend.close()
+
+def _now_ms() -> int:
+    return time.time_ns() // 1_000_000
+
+def version_time(version: int) -> datetime:
+    """When the scope at ``version`` was last bumped, for Last-Modified."""
+    return datetime.fromtimestamp(version / 1000, timezone.utc)
+
+CATALOG_SCOPE = "catalog"
+# Bumped by every room and rate write: dates the rooms and prices embedded
+# in the hotel list without scanning room_types
+CATALOG_ROOMS_SCOPE = "catalog:rooms"
+
+def hotel_scope(hotel_id: int) -> str:
+    return f"hotel:{hotel_id}"
+
+async def bump_rooms(hotel_ids: Iterable[int]) -> None:
+    """After room or rate writes: the scopes of the hotels they belong to and the catalog room scope."""
+    scopes = {hotel_scope(hotel_id) for hotel_id in hotel_ids}
+    if scopes:
+        await response_cache.bump(CATALOG_ROOMS_SCOPE, *scopes)
+
+response_cache = ResponseCache(
+    create_cache_backend(settings.CACHE_URL),
+    ttl=settings.CACHE_TTL_SECONDS,
+    lock_ttl=settings.CACHE_LOCK_TTL_SECONDS,
+)
+
+def warn_if_cache_not_shared(command: str) -> None:
+    """For scripts writing the catalog outside the API: their bumps only reach API workers through a shared backend."""
+    if isinstance(response_cache.backend, InMemoryCacheBackend):
+        logger.warning(
+            "%s: CACHE_URL is not a shared cache, so running API workers will not see this run's cache "
+            "bumps: they serve cached responses for up to CACHE_TTL_SECONDS and stale ETags until "
+            "restarted. Set CACHE_URL to the API's Redis to invalidate them.",
+            command,
+        )
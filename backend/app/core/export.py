@@ -0,0 +1,30 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, Sequence
+
+EXPORT_MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+async def encode_csv(columns: Sequence[str], batches: AsyncIterator[Sequence[Sequence]]) -> AsyncIterator[str]:
+    """Header line first (so the first byte goes out immediately), then one chunk per batch."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(columns)
+    yield buffer.getvalue()
+    async for rows in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue()
+
+async def encode_ndjson(columns: Sequence[str], batches: AsyncIterator[Sequence[Sequence]]) -> AsyncIterator[str]:
+    async for rows in batches:
+        yield "".join(
+            json.dumps(dict(zip(columns, row)), default=str, separators=(",", ":")) + "\n"
+            for row in rows
+        )
+
+def encode_rows(fmt: str, columns: Sequence[str], batches: AsyncIterator[Sequence[Sequence]]) -> AsyncIterator[str]:
+    if fmt == "ndjson":
+        return encode_ndjson(columns, batches)
+    return encode_csv(columns, batches)
@@ -0,0 +1,266 @@
+import bisect
+import collections
+import re
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value)
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+
+    def samples(self) -> Iterable[Tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(f"{name}{labels} {_format_value(value)}" for name, labels, value in self.samples())
+        return lines
+
+class Counter(Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self.values: Dict[tuple, float] = {}
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        self.values[labels] = self.values.get(labels, 0) + amount
+
+    def set(self, *labels: str, value: float) -> None:
+        # For collectors mirroring a total kept elsewhere
+        self.values[labels] = value
+
+    def samples(self):
+        for labels, value in sorted(self.values.items()):
+            yield self.name, _format_labels(self.labelnames, labels), value
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # labels -> [count per bucket (last one is +Inf), sum]
+        self.values: Dict[tuple, list] = {}
+
+    def observe(self, *labels: str, value: float) -> None:
+        entry = self.values.get(labels)
+        if entry is None:
+            entry = self.values[labels] = [[0] * (len(self.buckets) + 1), 0.0]
+        entry[0][bisect.bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+
+    def samples(self):
+        for labels, (counts, total) in sorted(self.values.items()):
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield f"{self.name}_bucket", _format_labels(self.labelnames, labels, le), cumulative
+            yield f"{self.name}_sum", _format_labels(self.labelnames, labels), total
+            yield f"{self.name}_count", _format_labels(self.labelnames, labels), cumulative
+
+class Registry:
+    """Metrics of this worker, rendered in the Prometheus text exposition format.
+
+    Collectors are called on every scrape to refresh gauges that mirror state
+    owned elsewhere (pool sizes, limiter queues).
+    """
+
+    def __init__(self):
+        self.metrics: List[Metric] = []
+        self.collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, help, labelnames))
+
+    def gauge(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, help, labelnames))
+
+    def histogram(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labelnames, buckets))
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        if collector not in self.collectors:
+            self.collectors.append(collector)
+
+    def render(self) -> str:
+        for collector in self.collectors:
+            collector()
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+registry = Registry()
+
+http_requests = registry.counter(
+    "http_requests_total", "HTTP requests by route template and status code.", ("method", "route", "status")
+)
+http_request_duration = registry.histogram(
+    "http_request_duration_seconds", "HTTP request latency, until the response body is sent.", ("method", "route")
+)
+http_requests_in_progress = registry.gauge(
+    "http_requests_in_progress", "HTTP requests currently being handled.", ("method",)
+)
+http_request_db_queries = registry.histogram(
+    "http_request_db_queries", "Database statements executed per HTTP request.", ("method", "route"), QUERY_COUNT_BUCKETS
+)
+http_request_db_duration = registry.histogram(
+    "http_request_db_duration_seconds", "Database time per HTTP request.", ("method", "route"), LATENCY_BUCKETS
+)
+db_queries = registry.counter("db_queries_total", "Database statements executed.", ("engine",))
+db_query_duration = registry.histogram(
+    "db_query_duration_seconds", "Database statement execution time.", ("engine",), QUERY_BUCKETS
+)
+db_query_errors = registry.counter("db_query_errors_total", "Database statements that raised.", ("engine",))
+
+# asyncpg binds render as $1::INTEGER, $2::TIMESTAMP WITH TIME ZONE, $3::VARCHAR[]
+_CAST = re.compile(r"::\w+(?: PRECISION| WITH(?:OUT)? TIME ZONE)?(?:\(\d+(?:,\s*\d+)?\))?(?:\[\])*", re.IGNORECASE)
+_PARAMETER = re.compile(r"\$\d+|%\(\w+\)s|\?|'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PARAMETER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_WHITESPACE = re.compile(r"\s+")
+
+def fingerprint(statement: str) -> str:
+    """Statement with parameters, literals and IN lists collapsed, so repeats compare equal."""
+    normalized = _PARAMETER.sub("?", _CAST.sub("", statement))
+    normalized = _PARAMETER_LIST.sub("(...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+class RequestDbStats:
+    """Statements run for one request (or one ``track_queries`` block) and their total time.
+
+    Statement fingerprints are only counted once ``count_statements`` is
+    called (query debugging, query budgets), so plain metrics skip the
+    normalization. Statements also count towards ``parent``: the stats that
+    were current when these were created, e.g. a test's ``track_queries``
+    around the request.
+    """
+    __slots__ = ("queries", "seconds", "fingerprints", "parent")
+
+    def __init__(self, parent: Optional["RequestDbStats"] = None):
+        self.queries = 0
+        self.seconds = 0.0
+        self.fingerprints: Optional[collections.Counter] = None
+        self.parent = parent
+
+    def count_statements(self) -> None:
+        if self.fingerprints is None:
+            self.fingerprints = collections.Counter()
+
+    def record(self, statement: str, elapsed: float) -> None:
+        shape = None
+        stats = self
+        while stats is not None:
+            stats.queries += 1
+            stats.seconds += elapsed
+            if stats.fingerprints is not None:
+                if shape is None:
+                    shape = fingerprint(statement)
+                stats.fingerprints[shape] += 1
+            stats = stats.parent
+
+    def repeated(self, threshold: int = 2) -> List[Tuple[str, int]]:
+        # The same statement shape run ``threshold`` times or more: usually a loop of lazy loads
+        if not self.fingerprints:
+            return []
+        return [(statement, count) for statement, count in self.fingerprints.most_common() if count >= threshold]
+
+    def server_timing(self) -> str:
+        return f'db;dur={self.seconds * 1000:.1f};desc="{self.queries} queries"'
+
+    def report(self) -> str:
+        lines = [f"{self.queries} queries in {self.seconds * 1000:.1f} ms"]
+        if self.fingerprints:
+            lines.extend(f"  {count}x {statement}" for statement, count in self.fingerprints.most_common())
+        return "\n".join(lines)
+
+# Set by the metrics and query debug middlewares and by track_queries;
+# SQLAlchemy runs event hooks in the caller's context
+request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+@contextmanager
+def track_queries() -> Iterator[RequestDbStats]:
+    """Record the statements run from this context, with fingerprints, until the block exits.
+
+    Tasks started inside the block inherit it, and so do TestClient requests
+    (the portal copies the calling thread's context); background tasks,
+    other requests and other threads do not.
+    """
+    stats = RequestDbStats(parent=request_db_stats.get())
+    stats.count_statements()
+    token = request_db_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        request_db_stats.reset(token)
+
+_engine_names: Dict[Engine, str] = {}
+
+def instrument_engine(engine: AsyncEngine, name: str) -> None:
+    """Count and time every statement of ``engine``, per engine and per request."""
+    sync_engine = engine.sync_engine
+    if sync_engine in _engine_names:
+        return
+    _engine_names[sync_engine] = name
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["query_started"].pop()
+    name = _engine_names[conn.engine]
+    db_queries.inc(name)
+    db_query_duration.observe(name, value=elapsed)
+    stats = request_db_stats.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+
+def _handle_error(context):
+    conn = context.connection
+    if conn is not None and conn.info.get("query_started"):
+        conn.info["query_started"].pop()
+    db_query_errors.inc(_engine_names.get(context.engine, "unknown"))
@@ -0,0 +1,23 @@
+import base64
+import json
+from datetime import date
+from typing import Any, List
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque, URL-safe cursor holding the sort key of the last row of a page."""
+    payload = json.dumps(
+        [value.isoformat() if isinstance(value, date) else value for value in values],
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Inverse of encode_cursor. Raises ValueError on anything malformed."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, UnicodeDecodeError) as exc:
+        raise ValueError("Invalid cursor") from exc
+    if not isinstance(values, list):
+        raise ValueError("Invalid cursor")
+    return values
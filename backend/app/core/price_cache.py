@@ -0,0 +1,63 @@
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+
+PriceKey = Tuple[int, date]
+
+class PriceCache(TTLCache):
+    """Resolved effective prices keyed by (room_type_id, date).
+
+    Keeps a per-room index of cached dates so a rate write only drops the
+    entries it can affect: an adjustment effective on D changes prices on
+    D and later, a base price change affects every date of that room.
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize, ttl)
+        self._dates_by_room: Dict[int, Set[date]] = {}
+        # Bumped by every invalidation; readers pass the value they saw before
+        # querying so a result computed before a write is never cached after it.
+        self.generation = 0
+        self.invalidations = 0
+
+    def get_price(self, room_type_id: int, on_date: date) -> Optional[float]:
+        return self.get((room_type_id, on_date))
+
+    def set_prices(self, prices: Iterable[Tuple[PriceKey, float]], generation: int) -> None:
+        if generation != self.generation:
+            return
+        for key, price in prices:
+            self.set(key, price)
+            if key in self._data:
+                self._dates_by_room.setdefault(key[0], set()).add(key[1])
+
+    def invalidate_room(self, room_type_id: int, from_date: Optional[date] = None) -> None:
+        self.generation += 1
+        dates = self._dates_by_room.get(room_type_id)
+        if not dates:
+            return
+        stale: List[date] = [d for d in dates if from_date is None or d >= from_date]
+        for stale_date in stale:
+            self.pop((room_type_id, stale_date))
+        self.invalidations += len(stale)
+
+    def _remove(self, key: PriceKey) -> None:
+        super()._remove(key)
+        dates = self._dates_by_room.get(key[0])
+        if dates is not None:
+            dates.discard(key[1])
+            if not dates:
+                del self._dates_by_room[key[0]]
+
+    def stats(self):
+        stats = super().stats()
+        stats["rooms"] = len(self._dates_by_room)
+        stats["invalidations"] = self.invalidations
+        return stats
+
+price_cache = PriceCache(
+    maxsize=settings.PRICE_CACHE_MAX_ENTRIES,
+    ttl=settings.PRICE_CACHE_TTL_SECONDS,
+)
@@ -1,5 +1,8 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Dict, TypeVar, Union
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -21,3 +24,68 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
+
+T = TypeVar("T")
+
+class HashingPool:
+    """Bounded thread pool for bcrypt so hashing never blocks the event loop.
+
+    bcrypt releases the GIL while it works, so a few threads give real
+    parallelism. Jobs beyond ``max_workers`` wait in the executor queue; the
+    counters expose how deep that queue gets and how long jobs wait in it.
+    """
+
+    def __init__(self, max_workers: int):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.completed = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.total_run = 0.0
+
+    async def run(self, fn: Callable[..., T], *args) -> T:
+        submitted = time.perf_counter()
+        started = None
+
+        def job() -> T:
+            nonlocal started
+            started = time.perf_counter()
+            return fn(*args)
+
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, job)
+        finally:
+            self.in_flight -= 1
+            if started is not None:
+                wait = started - submitted
+                self.completed += 1
+                self.total_wait += wait
+                self.max_wait = max(self.max_wait, wait)
+                self.total_run += time.perf_counter() - started
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "in_flight": self.in_flight,
+            "queued": max(0, self.in_flight - self.max_workers),
+            "max_in_flight": self.max_in_flight,
+            "completed": self.completed,
+            "avg_wait_ms": self.total_wait / self.completed * 1000 if self.completed else 0.0,
+            "max_wait_ms": self.max_wait * 1000,
+            "avg_run_ms": self.total_run / self.completed * 1000 if self.completed else 0.0,
+        }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+hashing_pool = HashingPool(max_workers=settings.PASSWORD_HASH_WORKERS)
+
+async def averify_password(plain_password: str, hashed_password: str) -> bool:
+    return await hashing_pool.run(verify_password, plain_password, hashed_password)
+
+async def aget_password_hash(password: str) -> str:
+    return await hashing_pool.run(get_password_hash, password)
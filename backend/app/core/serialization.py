@@ -0,0 +1,22 @@
+from typing import Any, Collection, List, Type
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy.sql.elements import Label
+
+def schema_columns(schema: Type[BaseModel], model: Any, exclude: Collection[str] = ()) -> List[Label]:
+    """Columns of ``model`` for each field of ``schema``, labeled with the field's alias.
+
+    Rows selected this way are already in the response shape (same keys, same
+    order as the Pydantic dump), so they can be encoded without building ORM
+    instances or models. Fields without a column must be listed in ``exclude``.
+    """
+    return [
+        getattr(model, name).label(field.alias or name)
+        for name, field in schema.model_fields.items()
+        if name not in exclude
+    ]
+
+def dumps(obj: Any) -> bytes:
+    # dates, datetimes and floats encode exactly as Pydantic's dump_json does
+    return orjson.dumps(obj)
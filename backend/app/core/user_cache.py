@@ -0,0 +1,79 @@
+from typing import NamedTuple, Optional
+
+from sqlalchemy import event
+from sqlalchemy.orm import ORMExecuteState, Session, object_session
+
+from app.core.config import settings
+from app.core.ttl_cache import TTLCache
+from app.models.user import User
+
+class CachedUser(NamedTuple):
+    id: int
+    email: str
+    is_active: bool
+    is_superuser: bool
+
+class UserCache(TTLCache):
+    """Identity and flags of recently authenticated users, keyed by user id.
+
+    Lets ``get_current_user`` skip the users query on steady-state requests.
+    Entries are dropped when a transaction that updated or deleted user rows
+    through the ORM in this process commits (per instance, or wholesale for
+    bulk statements); other workers pick the change up within ``ttl``.
+    """
+
+    def get_user(self, user_id: int) -> Optional[User]:
+        cached = self.get(user_id)
+        if cached is None:
+            return None
+        # Transient instance: carries no password hash and is bound to no session
+        return User(**cached._asdict())
+
+    def set_user(self, user: User) -> None:
+        self.set(user.id, CachedUser(user.id, user.email, user.is_active, user.is_superuser))
+
+    def invalidate(self, user_id: int) -> None:
+        self.pop(user_id)
+
+user_cache = UserCache(
+    maxsize=settings.AUTH_USER_CACHE_MAX_ENTRIES,
+    ttl=settings.AUTH_USER_CACHE_TTL_SECONDS,
+)
+
+# Pending invalidations live on the session until its transaction commits:
+# dropping entries at flush would let a concurrent request re-cache the old row
+_PENDING = "user_cache_pending"
+_ALL_USERS = object()
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING, set())
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_user(mapper, connection, target: User) -> None:
+    _pending(object_session(target)).add(target.id)
+
+@event.listens_for(Session, "do_orm_execute")
+def _invalidate_users_on_bulk_write(orm_execute_state: ORMExecuteState) -> None:
+    # update(User)/delete(User) statements skip the mapper events above
+    if (orm_execute_state.is_update or orm_execute_state.is_delete) and orm_execute_state.bind_mapper is User.__mapper__:
+        _pending(orm_execute_state.session).add(_ALL_USERS)
+
+@event.listens_for(Session, "after_commit")
+def _apply_pending_invalidations(session: Session) -> None:
+    # Releasing a savepoint is not a commit; wait for the outermost transaction
+    if session.in_nested_transaction():
+        return
+    pending = session.info.pop(_PENDING, None)
+    if not pending:
+        return
+    if _ALL_USERS in pending:
+        user_cache.clear()
+        return
+    for user_id in pending:
+        user_cache.invalidate(user_id)
+
+@event.listens_for(Session, "after_rollback")
+def _discard_pending_invalidations(session: Session) -> None:
+    if not session.in_nested_transaction():
+        session.info.pop(_PENDING, None)
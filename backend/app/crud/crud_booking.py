@@ -0,0 +1,144 @@
+import uuid
+from typing import Iterable, Optional
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func
+from app.crud import crud_inventory
+from app.models.booking import Booking
+from app.models.user import User
+
+async def get_booking(db: AsyncSession, booking_id: uuid.UUID, user_id: Optional[int] = None) -> Optional[Booking]:
+    """The booking, if it exists and (when ``user_id`` is given) belongs to that user."""
+    conditions = [Booking.id == booking_id]
+    if user_id is not None:
+        conditions.append(Booking.user_id == user_id)
+    result = await db.execute(select(Booking).where(*conditions))
+    return result.scalar_one_or_none()
+
+async def lock_active_holds(db: AsyncSession, user_id: int) -> int:
+    """Lock the user's row and count their live holds.
+
+    The lock lasts until the caller's transaction ends, so concurrent hold
+    requests of one user are counted one after another and cannot all slip
+    under a cap together. Does not commit.
+    """
+    await db.execute(select(User.id).where(User.id == user_id).with_for_update(key_share=True))
+    # A statement of its own: its snapshot includes holds committed while waiting for the lock
+    return await db.scalar(
+        select(func.count())
+        .select_from(Booking)
+        .where(Booking.user_id == user_id, Booking.status == "held", Booking.expires_at > func.now())
+    )
+
+async def create_hold(
+    db: AsyncSession,
+    room_type_id: int,
+    start: date,
+    nights: int,
+    quantity: int,
+    ttl_seconds: int,
+    user_id: int,
+    guest_email: Optional[str] = None,
+) -> Optional[Booking]:
+    """Take ``quantity`` rooms for the stay and record a hold expiring after ``ttl_seconds``.
+
+    The inventory is claimed with one guarded UPDATE rather than a locked
+    read-modify-write, so holds on other nights or room types never wait on
+    each other. Returns None (nothing kept) when any night is sold out.
+    A missing room type surfaces as an IntegrityError from the inventory FK.
+    """
+    if not await crud_inventory.allocate(db, room_type_id=room_type_id, start=start, nights=nights, quantity=quantity):
+        await db.rollback()
+        return None
+    booking = Booking(
+        user_id=user_id,
+        room_type_id=room_type_id,
+        start_date=start,
+        end_date=start + timedelta(days=nights),
+        quantity=quantity,
+        guest_email=guest_email,
+        status="held",
+        expires_at=datetime.now(timezone.utc) + timedelta(seconds=ttl_seconds),
+        version=1,
+    )
+    db.add(booking)
+    await db.commit()
+    return booking
+
+async def _transition(
+    db: AsyncSession,
+    booking_id: uuid.UUID,
+    from_statuses: Iterable[str],
+    to_status: str,
+    expected_version: Optional[int],
+    release: bool,
+    user_id: Optional[int],
+) -> Optional[Booking]:
+    # Compare-and-set on (status, version): a concurrent change makes this match nothing
+    conditions = [Booking.id == booking_id, Booking.status.in_(list(from_statuses))]
+    if user_id is not None:
+        conditions.append(Booking.user_id == user_id)
+    if expected_version is not None:
+        conditions.append(Booking.version == expected_version)
+    values = {"status": to_status, "version": Booking.version + 1}
+    if to_status == "confirmed":
+        conditions.append(Booking.expires_at > func.now())
+        values["expires_at"] = None
+    result = await db.execute(
+        update(Booking).where(*conditions).values(**values).returning(Booking)
+    )
+    booking = result.scalar_one_or_none()
+    if booking is None:
+        await db.rollback()
+        return None
+    if release:
+        await crud_inventory.release(
+            db,
+            room_type_id=booking.room_type_id,
+            start=booking.start_date,
+            nights=(booking.end_date - booking.start_date).days,
+            quantity=booking.quantity,
+        )
+    await db.commit()
+    return booking
+
+async def confirm_hold(
+    db: AsyncSession, booking_id: uuid.UUID, expected_version: Optional[int] = None, user_id: Optional[int] = None
+) -> Optional[Booking]:
+    """Turn a live hold into a booking; None if it is not a live hold of ``user_id`` (or the version moved on)."""
+    return await _transition(db, booking_id, ["held"], "confirmed", expected_version, release=False, user_id=user_id)
+
+async def cancel_booking(
+    db: AsyncSession, booking_id: uuid.UUID, expected_version: Optional[int] = None, user_id: Optional[int] = None
+) -> Optional[Booking]:
+    """Cancel a hold or booking of ``user_id`` and give its rooms back; None if there is nothing to cancel."""
+    return await _transition(db, booking_id, ["held", "confirmed"], "cancelled", expected_version, release=True, user_id=user_id)
+
+async def expire_holds(db: AsyncSession, batch_size: int = 500) -> int:
+    """Expire up to ``batch_size`` overdue holds and return their rooms; returns how many.
+
+    Claims rows with FOR UPDATE SKIP LOCKED, so several workers can sweep at
+    once and a hold being confirmed right now is skipped rather than waited
+    on. Commits.
+    """
+    overdue = (
+        select(Booking.id)
+        .where(Booking.status == "held", Booking.expires_at <= func.now())
+        .order_by(Booking.expires_at)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("overdue")
+    )
+    result = await db.execute(
+        update(Booking)
+        .where(Booking.id.in_(select(overdue.c.id)))
+        .values(status="expired", version=Booking.version + 1)
+        .returning(Booking.room_type_id, Booking.start_date, Booking.end_date, Booking.quantity)
+    )
+    expired = result.all()
+    for room_type_id, start_date, end_date, quantity in expired:
+        await crud_inventory.release(
+            db, room_type_id=room_type_id, start=start_date, nights=(end_date - start_date).days, quantity=quantity
+        )
+    await db.commit()
+    return len(expired)
@@ -1,16 +1,144 @@
-from typing import List, Optional
+from typing import List, Optional, Tuple
+from datetime import date, datetime
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
-from app.models.hotel import Hotel, RoomType
+from sqlalchemy import select, update, delete, func, text, true, tuple_
+from sqlalchemy.orm import selectinload, with_expression
+from sqlalchemy.orm.attributes import set_committed_value
+from app.core.price_cache import price_cache
+from app.core.serialization import schema_columns
+from app.crud.crud_rate import effective_price_expr, get_effective_prices
+from app.models.hotel import Hotel, RoomType, hotel_search_document
+from app.schemas import hotel as schemas
 from app.schemas.hotel import HotelCreate, HotelUpdate, RoomTypeCreate, RoomTypeUpdate
 
+# Response-shaped columns for the read-only JSON fast path
+HOTEL_ROW_COLUMNS = schema_columns(schemas.Hotel, Hotel)
+ROOM_TYPE_ROW_COLUMNS = schema_columns(schemas.RoomType, RoomType, exclude={"effective_price"})
+
 async def get_hotel(db: AsyncSession, hotel_id: int) -> Optional[Hotel]:
     result = await db.execute(select(Hotel).filter(Hotel.id == hotel_id))
     return result.scalars().first()
 
-async def get_hotels(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[Hotel]:
-    result = await db.execute(select(Hotel).offset(skip).limit(limit))
+async def get_hotel_updated_at(db: AsyncSession, hotel_id: int) -> Optional[datetime]:
+    result = await db.execute(select(Hotel.updated_at).where(Hotel.id == hotel_id))
+    return result.scalar_one_or_none()
+
+def _hotels_query(include_rooms: bool):
+    query = select(Hotel)
+    if include_rooms:
+        # One extra SELECT ... WHERE hotel_id IN (page ids) for the whole page
+        query = query.options(selectinload(Hotel.room_types))
+    return query
+
+async def get_hotels(db: AsyncSession, skip: int = 0, limit: int = 100, include_rooms: bool = False) -> List[Hotel]:
+    result = await db.execute(_hotels_query(include_rooms).offset(skip).limit(limit))
+    return result.scalars().all()
+
+async def get_hotels_page(
+    db: AsyncSession,
+    limit: int = 100,
+    order_by: str = "id",
+    after: Optional[tuple] = None,
+    include_rooms: bool = False,
+) -> Tuple[List[Hotel], Optional[tuple]]:
+    """Keyset page of hotels ordered by id or by (name, id).
+
+    ``after`` is the sort key of the previous page's last row; the returned key
+    is the one to resume from, or None when this is the last page.
+    """
+    sort_key = (Hotel.name, Hotel.id) if order_by == "name" else (Hotel.id,)
+    query = _hotels_query(include_rooms)
+    if after is not None:
+        query = query.where(tuple_(*sort_key) > tuple_(*after))
+    result = await db.execute(query.order_by(*sort_key).limit(limit + 1))
+    hotels = result.scalars().all()
+    if len(hotels) <= limit:
+        return hotels, None
+    hotels = hotels[:limit]
+    last = hotels[-1]
+    return hotels, ((last.name, last.id) if order_by == "name" else (last.id,))
+
+async def get_hotel_rows(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[dict]:
+    """``get_hotels`` as plain dicts keyed by the schema aliases, ready to encode."""
+    result = await db.execute(select(*HOTEL_ROW_COLUMNS).offset(skip).limit(limit))
+    return [dict(row) for row in result.mappings()]
+
+async def get_hotel_rows_page(
+    db: AsyncSession, limit: int = 100, order_by: str = "id", after: Optional[tuple] = None
+) -> Tuple[List[dict], Optional[tuple]]:
+    """``get_hotels_page`` as plain dicts keyed by the schema aliases."""
+    sort_key = (Hotel.name, Hotel.id) if order_by == "name" else (Hotel.id,)
+    query = select(*HOTEL_ROW_COLUMNS)
+    if after is not None:
+        query = query.where(tuple_(*sort_key) > tuple_(*after))
+    result = await db.execute(query.order_by(*sort_key).limit(limit + 1))
+    rows = [dict(row) for row in result.mappings()]
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1]
+    return rows, ((last["name"], last["id"]) if order_by == "name" else (last["id"],))
+
+def _contains_pattern(value: str) -> str:
+    # ILIKE pattern matching ``value`` literally anywhere (trigram-indexable)
+    escaped = value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+async def search_hotels(
+    db: AsyncSession,
+    q: Optional[str] = None,
+    location: Optional[str] = None,
+    min_rating: Optional[float] = None,
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    capacity: Optional[int] = None,
+    sort: str = "relevance",
+    skip: int = 0,
+    limit: int = 20,
+    on_date: Optional[date] = None,
+) -> List[Hotel]:
+    """Filter and sort hotels in the database, with ``Hotel.min_price`` populated.
+
+    Text filters are served by the trigram and full-text GIN indexes. The
+    cheapest effective price of each hotel's matching rooms comes from a
+    LATERAL subquery; room filters (capacity, price band) drop hotels without
+    a matching room. ``sort="relevance"`` falls back to name without ``q``.
+    """
+    price = effective_price_expr(on_date)
+    rooms = select(func.min(price).label("min_price")).where(RoomType.hotel_id == Hotel.id)
+    if capacity is not None:
+        rooms = rooms.where(RoomType.capacity >= capacity)
+    if min_price is not None:
+        rooms = rooms.where(price >= min_price)
+    if max_price is not None:
+        rooms = rooms.where(price <= max_price)
+    rooms = rooms.lateral("rooms")
+
+    query = select(Hotel).join(rooms, true()).options(with_expression(Hotel.min_price, rooms.c.min_price))
+    if capacity is not None or min_price is not None or max_price is not None:
+        query = query.where(rooms.c.min_price.is_not(None))
+    if location:
+        query = query.where(Hotel.location.ilike(_contains_pattern(location), escape="\\"))
+    if min_rating is not None:
+        query = query.where(Hotel.rating >= min_rating)
+
+    order_by = [Hotel.name]
+    if q:
+        tsquery = func.websearch_to_tsquery(text("'simple'::regconfig"), q)
+        document = hotel_search_document()
+        query = query.where(
+            document.bool_op("@@")(tsquery) | Hotel.name.ilike(_contains_pattern(q), escape="\\")
+        )
+        if sort == "relevance":
+            order_by = [(func.ts_rank(document, tsquery) + func.similarity(Hotel.name, q)).desc()]
+    if sort == "rating":
+        order_by = [Hotel.rating.desc().nulls_last()]
+    elif sort == "price":
+        order_by = [rooms.c.min_price.asc().nulls_last()]
+    elif sort == "name":
+        order_by = [Hotel.name]
+
+    result = await db.execute(query.order_by(*order_by, Hotel.id).offset(skip).limit(limit))
     return result.scalars().all()
 
 async def create_hotel(db: AsyncSession, hotel: HotelCreate) -> Hotel:
@@ -40,14 +168,18 @@ async def update_hotel(db: AsyncSession, hotel_id: int, hotel: HotelUpdate) -> O
     await db.refresh(db_hotel)
     return db_hotel
 
-async def delete_hotel(db: AsyncSession, hotel_id: int) -> bool:
-    db_hotel = await get_hotel(db, hotel_id)
-    if not db_hotel:
-        return False
-    
-    await db.delete(db_hotel)
-    await db.commit()
-    return True
+async def delete_hotel(db: AsyncSession, hotel_id: int) -> Optional[Hotel]:
+    """Delete a hotel in a single DELETE ... RETURNING; None if it does not exist.
+
+    Room types and their rate adjustments are removed by ON DELETE CASCADE,
+    without being loaded. Their price cache entries are left to expire: the
+    rooms can no longer be read.
+    """
+    result = await db.execute(delete(Hotel).where(Hotel.id == hotel_id).returning(Hotel))
+    db_hotel = result.scalar_one_or_none()
+    if db_hotel is not None:
+        await db.commit()
+    return db_hotel
 
 async def create_room_type(db: AsyncSession, room_type: RoomTypeCreate, hotel_id: int) -> RoomType:
     db_room_type = RoomType(
@@ -57,49 +189,140 @@ async def create_room_type(db: AsyncSession, room_type: RoomTypeCreate, hotel_id
     db.add(db_room_type)
     await db.commit()
     
-    # Re-fetch with eager loading to allow serialization of properties
+    # Re-fetch so the effective price is resolved for serialization
+    return await get_room_type(db, db_room_type.id)
+
+async def _resolve_prices(
+    db: AsyncSession, room_types: List[RoomType], on_date: Optional[date] = None, use_cache: bool = True
+) -> None:
+    # Fill RoomType.resolved_price from the price cache, querying only the misses
+    if not room_types:
+        return
+    prices = await get_effective_prices(db, [rt.id for rt in room_types], on_date, use_cache)
+    for rt in room_types:
+        set_committed_value(rt, "resolved_price", prices.get(rt.id))
+
+async def resolve_hotel_prices(
+    db: AsyncSession, hotels: List[Hotel], on_date: Optional[date] = None, use_cache: bool = True
+) -> None:
+    """Resolve the effective price of the rooms loaded on ``hotels`` and set each ``min_price``.
+
+    Expects ``room_types`` eager-loaded; prices come from the price cache (see
+    ``get_effective_prices`` for ``use_cache``) with at most one query for all
+    misses of the page.
+    """
+    room_types = [room_type for hotel in hotels for room_type in hotel.room_types]
+    await _resolve_prices(db, room_types, on_date, use_cache)
+    for hotel in hotels:
+        prices = [room_type.effective_price for room_type in hotel.room_types]
+        set_committed_value(hotel, "min_price", min(prices) if prices else None)
+
+async def get_room_types(db: AsyncSession, hotel_id: int, on_date: Optional[date] = None) -> List[RoomType]:
     result = await db.execute(
-        select(RoomType)
-        .where(RoomType.id == db_room_type.id)
-        .options(selectinload(RoomType.rate_adjustments))
+        select(RoomType).filter(RoomType.hotel_id == hotel_id)
     )
-    return result.scalars().one()
+    room_types = result.scalars().all()
+    await _resolve_prices(db, room_types, on_date)
+    return room_types
+
+async def get_room_type_rows(
+    db: AsyncSession, hotel_id: int, on_date: Optional[date] = None, use_cache: bool = True
+) -> List[dict]:
+    """``get_room_types`` as plain dicts keyed by the schema aliases, prices from the price cache."""
+    result = await db.execute(select(*ROOM_TYPE_ROW_COLUMNS).where(RoomType.hotel_id == hotel_id))
+    rows = [dict(row) for row in result.mappings()]
+    if rows:
+        prices = await get_effective_prices(db, [row["id"] for row in rows], on_date, use_cache)
+        for row in rows:
+            price = prices.get(row["id"])
+            row["effectivePrice"] = row["basePrice"] if price is None else price
+    return rows
 
-async def get_room_types(db: AsyncSession, hotel_id: int) -> List[RoomType]:
+async def get_room_type(db: AsyncSession, room_id: int, on_date: Optional[date] = None) -> Optional[RoomType]:
     result = await db.execute(
-        select(RoomType)
-        .filter(RoomType.hotel_id == hotel_id)
-        .options(selectinload(RoomType.rate_adjustments))
+        select(RoomType).where(RoomType.id == room_id)
     )
-    return result.scalars().all()
+    db_room_type = result.scalars().first()
+    if db_room_type:
+        await _resolve_prices(db, [db_room_type], on_date)
+    return db_room_type
 
-async def get_room_type(db: AsyncSession, room_id: int) -> Optional[RoomType]:
+async def get_room_types_validators(db: AsyncSession, hotel_id: int) -> Optional[Tuple[int, Optional[datetime]]]:
+    # (room count, newest room updated_at) of a hotel, or None if the hotel does not exist
     result = await db.execute(
-        select(RoomType)
+        select(func.count(RoomType.id), func.max(RoomType.updated_at))
+        .select_from(Hotel)
+        .outerjoin(RoomType, RoomType.hotel_id == Hotel.id)
+        .where(Hotel.id == hotel_id)
+        .group_by(Hotel.id)
+    )
+    row = result.one_or_none()
+    return tuple(row) if row is not None else None
+
+async def get_room_type_hotel_id(db: AsyncSession, room_id: int) -> Optional[int]:
+    result = await db.execute(select(RoomType.hotel_id).where(RoomType.id == room_id))
+    return result.scalar_one_or_none()
+
+async def touch_room_type(db: AsyncSession, room_id: int) -> Optional[int]:
+    """Bump a room type's updated_at without committing; returns its hotel_id, or None if missing."""
+    result = await db.execute(
+        update(RoomType)
         .where(RoomType.id == room_id)
-        .options(selectinload(RoomType.rate_adjustments))
+        .values(updated_at=func.now())
+        .returning(RoomType.hotel_id)
     )
-    return result.scalars().first()
+    return result.scalar_one_or_none()
 
-async def update_room_type(db: AsyncSession, room_id: int, room_type: RoomTypeUpdate) -> Optional[RoomType]:
-    db_room_type = await get_room_type(db, room_id)
-    if not db_room_type:
-        return None
-    
+async def locate_room_type(db: AsyncSession, hotel_id: int, room_id: int) -> Tuple[bool, Optional[int]]:
+    """(hotel exists, hotel_id the room belongs to or None) in one query; explains a missed targeted write."""
+    result = await db.execute(
+        select(
+            select(Hotel.id).where(Hotel.id == hotel_id).exists(),
+            select(RoomType.hotel_id).where(RoomType.id == room_id).scalar_subquery(),
+        )
+    )
+    hotel_exists, room_hotel_id = result.one()
+    return hotel_exists, room_hotel_id
+
+def _with_resolved_price(row) -> RoomType:
+    db_room_type, price = row
+    set_committed_value(db_room_type, "resolved_price", price)
+    return db_room_type
+
+async def update_room_type(db: AsyncSession, hotel_id: int, room_id: int, room_type: RoomTypeUpdate) -> Optional[RoomType]:
+    """Update a room type of ``hotel_id`` in a single UPDATE ... RETURNING.
+
+    Returns None, without writing, if the room does not exist or belongs to
+    another hotel. The effective price is computed in the RETURNING clause.
+    """
     update_data = room_type.model_dump(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_room_type, key, value)
-    
-    db.add(db_room_type)
+    result = await db.execute(
+        update(RoomType)
+        .where(RoomType.id == room_id, RoomType.hotel_id == hotel_id)
+        .values(**update_data, updated_at=func.now())
+        .returning(RoomType, effective_price_expr())
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
     await db.commit()
-    await db.refresh(db_room_type)
-    return db_room_type
+    if "base_price" in update_data:
+        price_cache.invalidate_room(room_id)
+    return _with_resolved_price(row)
 
-async def delete_room_type(db: AsyncSession, room_id: int) -> bool:
-    db_room_type = await get_room_type(db, room_id)
-    if not db_room_type:
-        return False
-    
-    await db.delete(db_room_type)
+async def delete_room_type(db: AsyncSession, hotel_id: int, room_id: int) -> Optional[RoomType]:
+    """Delete a room type of ``hotel_id`` in a single DELETE ... RETURNING; None if nothing matched.
+
+    Its rate adjustments go with it through ON DELETE CASCADE, without being loaded.
+    """
+    result = await db.execute(
+        delete(RoomType)
+        .where(RoomType.id == room_id, RoomType.hotel_id == hotel_id)
+        .returning(RoomType, effective_price_expr())
+    )
+    row = result.one_or_none()
+    if row is None:
+        return None
     await db.commit()
-    return True
+    price_cache.invalidate_room(room_id)
+    return _with_resolved_price(row)
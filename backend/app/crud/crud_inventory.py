@@ -0,0 +1,172 @@
+from typing import List, NamedTuple, Optional, Sequence
+from datetime import date, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, update, func, cast, literal, true, Date
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from app.models.hotel import RoomType
+from app.models.inventory import RoomInventory
+
+class RoomAvailability(NamedTuple):
+    hotel_id: int
+    room_type_id: int
+    name: str
+    capacity: int
+    available: int
+
+def _nights(start: date, nights: int):
+    offsets = func.generate_series(0, nights - 1).table_valued("offset").render_derived(name="nights")
+    return offsets, (cast(start, Date) + offsets.c.offset).label("night")
+
+def _sellable():
+    # Rooms still for sale on a night of the joined inventory row (or lack of one)
+    return func.coalesce(RoomInventory.allotment, RoomType.room_count) - func.coalesce(RoomInventory.reserved, 0)
+
+async def get_availability(
+    db: AsyncSession,
+    hotel_ids: Sequence[int],
+    start: date,
+    nights: int,
+    guests: int = 1,
+    rooms: int = 1,
+) -> List[RoomAvailability]:
+    """Room types of ``hotel_ids`` with at least ``rooms`` rooms free on every night.
+
+    One set-based query: every night of the stay is joined to the sparse
+    inventory rows and the minimum free count per room type wins.
+    """
+    offsets, night = _nights(start, nights)
+    available = func.min(_sellable()).label("available")
+    result = await db.execute(
+        select(RoomType.hotel_id, RoomType.id, RoomType.name, RoomType.capacity, available)
+        .select_from(RoomType)
+        .join(offsets, true())
+        .outerjoin(
+            RoomInventory,
+            (RoomInventory.room_type_id == RoomType.id) & (RoomInventory.stay_date == night),
+        )
+        .where(RoomType.hotel_id.in_(hotel_ids), RoomType.capacity >= guests)
+        .group_by(RoomType.id)
+        .having(available >= rooms)
+        .order_by(RoomType.hotel_id, RoomType.id)
+    )
+    return [RoomAvailability(*row) for row in result.all()]
+
+async def _ensure_rows(db: AsyncSession, room_type_id: int, start: date, nights: int) -> None:
+    offsets, night = _nights(start, nights)
+    await db.execute(
+        pg_insert(RoomInventory)
+        .from_select(["room_type_id", "stay_date"], select(literal(room_type_id), night).select_from(offsets))
+        .on_conflict_do_nothing()
+    )
+
+async def _share_room_type(db: AsyncSession, room_type_id: int) -> None:
+    # FOR SHARE: conflicts only with lock_room_type's FOR UPDATE (and row updates)
+    await db.execute(select(RoomType.id).where(RoomType.id == room_type_id).with_for_update(read=True))
+
+async def allocate(db: AsyncSession, room_type_id: int, start: date, nights: int, quantity: int = 1) -> bool:
+    """Reserve ``quantity`` rooms on every night of the stay, or none at all.
+
+    A guarded UPDATE only increments nights that still have room; the row
+    locks it takes serialize concurrent allocations of the same nights, so
+    the second one re-checks against the first one's reservation. The room
+    type's row is shared first: allocations proceed side by side, but a room
+    count change (``lock_room_type``) waits for them and they for it, so the
+    guard never compares against a superseded count. Returns False when any
+    night is short, in which case the caller must roll back the partial
+    increments. Does not commit.
+    """
+    await _share_room_type(db, room_type_id)
+    await _ensure_rows(db, room_type_id, start, nights)
+    result = await db.execute(
+        update(RoomInventory)
+        .where(
+            RoomInventory.room_type_id == room_type_id,
+            RoomInventory.stay_date >= start,
+            RoomInventory.stay_date < start + timedelta(days=nights),
+            RoomType.id == RoomInventory.room_type_id,
+            RoomInventory.reserved + quantity <= func.coalesce(RoomInventory.allotment, RoomType.room_count),
+        )
+        .values(reserved=RoomInventory.reserved + quantity)
+        .returning(RoomInventory.stay_date)
+    )
+    return len(result.all()) == nights
+
+async def release(db: AsyncSession, room_type_id: int, start: date, nights: int, quantity: int = 1) -> None:
+    """Give back rooms taken by ``allocate``. Does not commit."""
+    await db.execute(
+        update(RoomInventory)
+        .where(
+            RoomInventory.room_type_id == room_type_id,
+            RoomInventory.stay_date >= start,
+            RoomInventory.stay_date < start + timedelta(days=nights),
+        )
+        .values(reserved=func.greatest(RoomInventory.reserved - quantity, 0))
+    )
+
+async def lock_room_type(db: AsyncSession, hotel_id: int, room_type_id: int) -> bool:
+    """Lock a room type of ``hotel_id`` FOR UPDATE, before changing its room count.
+
+    Holds share the row (see ``allocate``), so this waits for the ones in
+    flight and keeps new ones out until the caller's transaction ends. False
+    when the room type does not exist or belongs to another hotel. Does not
+    commit.
+    """
+    result = await db.execute(
+        select(RoomType.id).where(RoomType.id == room_type_id, RoomType.hotel_id == hotel_id).with_for_update()
+    )
+    return result.scalar_one_or_none() is not None
+
+async def overbooked_nights(db: AsyncSession, room_type_id: int, room_count: int) -> List[date]:
+    """Nights from today on that have more rooms reserved than ``room_count``.
+
+    Only nights without an explicit allotment follow the room count, so only
+    those are checked. Call with the room type locked (``lock_room_type``) so
+    no hold changes the answer before the new count commits.
+    """
+    result = await db.execute(
+        select(RoomInventory.stay_date)
+        .where(
+            RoomInventory.room_type_id == room_type_id,
+            RoomInventory.stay_date >= date.today(),
+            RoomInventory.allotment.is_(None),
+            RoomInventory.reserved > room_count,
+        )
+        .order_by(RoomInventory.stay_date)
+    )
+    return list(result.scalars().all())
+
+async def set_allotment(
+    db: AsyncSession, room_type_id: int, start: date, nights: int, allotment: Optional[int]
+) -> List[date]:
+    """Set the rooms for sale on each night (None: back to room_count).
+
+    Nights where more rooms are already reserved than the new allotment (or
+    the room count) are left untouched and returned; the change is only committed when there are
+    none.
+    """
+    offsets, night = _nights(start, nights)
+    stmt = pg_insert(RoomInventory).from_select(
+        ["room_type_id", "stay_date", "allotment"],
+        select(literal(room_type_id), night, cast(allotment, RoomInventory.allotment.type)).select_from(offsets),
+    )
+    if allotment is None:
+        # Back to the room count, which must also cover what is reserved
+        await _share_room_type(db, room_type_id)
+        room_count = select(RoomType.room_count).where(RoomType.id == room_type_id).scalar_subquery()
+        guard = RoomInventory.reserved <= room_count
+    else:
+        guard = RoomInventory.reserved <= stmt.excluded.allotment
+    result = await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["room_type_id", "stay_date"],
+            set_={"allotment": stmt.excluded.allotment},
+            where=guard,
+        ).returning(RoomInventory.stay_date)
+    )
+    updated = {row.stay_date for row in result.all()}
+    conflicts = [day for day in (start + timedelta(days=offset) for offset in range(nights)) if day not in updated]
+    if conflicts:
+        await db.rollback()
+    else:
+        await db.commit()
+    return conflicts
@@ -1,17 +1,313 @@
-from typing import List, Optional
-from datetime import date
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+from datetime import date, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, desc
+from sqlalchemy import select, update, desc, func, cast, true, tuple_, literal_column, Date, Row
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.sql.elements import ColumnElement
+from app.core.price_cache import price_cache
+from app.core.serialization import schema_columns
+from app.models.hotel import RoomType
 from app.models.rate import RateAdjustment
 from app.schemas import rate as schemas
 
+# Response-shaped columns for the read-only JSON fast path
+RATE_ROW_COLUMNS = schema_columns(schemas.RateAdjustment, RateAdjustment)
+
+def latest_adjustment_amount(on_date) -> ColumnElement:
+    """Amount of the latest adjustment on or before ``on_date`` for the enclosing RoomType row.
+
+    Correlated subquery served by the covering (room_type_id, effective_date DESC)
+    index, so it reads one index entry per room regardless of history size.
+    """
+    return (
+        select(RateAdjustment.adjustment_amount)
+        .where(
+            RateAdjustment.room_type_id == RoomType.id,
+            RateAdjustment.effective_date <= on_date,
+        )
+        .order_by(RateAdjustment.effective_date.desc())
+        .limit(1)
+        .correlate_except(RateAdjustment)
+        .scalar_subquery()
+    )
+
+def effective_price_expr(on_date: Optional[date] = None) -> ColumnElement:
+    if on_date is None:
+        on_date = date.today()
+    return RoomType.base_price + func.coalesce(latest_adjustment_amount(on_date), 0.0)
+
+class PriceCell(NamedTuple):
+    room_type_id: int
+    name: str
+    night: date
+    price: float
+
+def price_calendar_query(start: date, nights: int):
+    """PriceCell rows of every room type for ``nights`` nights from ``start``, ordered by room and night.
+
+    Callers narrow the rooms with ``.where()`` on the result.
+    """
+    # generate_series of nights cross joined with room types
+    offsets = func.generate_series(0, nights - 1).table_valued("offset").render_derived(name="nights")
+    night = (cast(start, Date) + offsets.c.offset).label("night")
+    return (
+        select(
+            RoomType.id.label("room_type_id"),
+            RoomType.name,
+            night,
+            effective_price_expr(night).label("price"),
+        )
+        .select_from(RoomType)
+        .join(offsets, true())
+        .order_by(RoomType.id, offsets.c.offset)
+    )
+
+async def get_effective_prices(
+    db: AsyncSession, room_type_ids: Sequence[int], on_date: Optional[date] = None, use_cache: bool = True
+) -> Dict[int, float]:
+    """Effective price per room type on ``on_date``, served from the price cache where possible.
+
+    ``use_cache=False`` queries every room (still refreshing the cache): for
+    results shared with other workers, whose price caches this one's
+    invalidations do not reach.
+    """
+    if on_date is None:
+        on_date = date.today()
+    prices: Dict[int, float] = {}
+    missing = []
+    for room_type_id in room_type_ids:
+        price = price_cache.get_price(room_type_id, on_date) if use_cache else None
+        if price is None:
+            missing.append(room_type_id)
+        else:
+            prices[room_type_id] = price
+
+    if missing:
+        generation = price_cache.generation
+        result = await db.execute(
+            select(RoomType.id, effective_price_expr(on_date)).where(RoomType.id.in_(missing))
+        )
+        fetched = {room_type_id: price for room_type_id, price in result.all()}
+        price_cache.set_prices((((room_type_id, on_date), price) for room_type_id, price in fetched.items()), generation)
+        prices.update(fetched)
+    return prices
+
+async def get_price_calendar(db: AsyncSession, hotel_id: int, start: date, nights: int) -> List[PriceCell]:
+    """Effective price of every room type of a hotel for each of ``nights`` nights from ``start``.
+
+    Cells are served from the price cache; rooms with any uncached night are
+    resolved in one set-based query: a generate_series of nights cross joined
+    with the room types, each cell using the indexed latest-adjustment lookup.
+    Cells are ordered by room type then night.
+    """
+    result = await db.execute(
+        select(RoomType.id, RoomType.name).where(RoomType.hotel_id == hotel_id).order_by(RoomType.id)
+    )
+    room_types = result.all()
+    stay_dates = [start + timedelta(days=offset) for offset in range(nights)]
+
+    cells: Dict[int, List[PriceCell]] = {}
+    missing = []
+    for room_type_id, name in room_types:
+        room_cells = []
+        for night in stay_dates:
+            price = price_cache.get_price(room_type_id, night)
+            if price is None:
+                break
+            room_cells.append(PriceCell(room_type_id, name, night, price))
+        else:
+            cells[room_type_id] = room_cells
+            continue
+        missing.append(room_type_id)
+
+    if missing:
+        generation = price_cache.generation
+        result = await db.execute(price_calendar_query(start, nights).where(RoomType.id.in_(missing)))
+        fetched = [PriceCell(*row) for row in result.all()]
+        price_cache.set_prices((((cell.room_type_id, cell.night), cell.price) for cell in fetched), generation)
+        for cell in fetched:
+            cells.setdefault(cell.room_type_id, []).append(cell)
+
+    return [cell for room_type_id, _ in room_types for cell in cells.get(room_type_id, [])]
+
+async def stream_price_calendar(
+    db: AsyncSession, hotel_id: int, start: date, nights: int, batch_size: int = 1000
+) -> AsyncIterator[Sequence[Row]]:
+    """Price calendar cells straight from a server-side cursor, in batches of plain rows."""
+    result = await db.stream(
+        price_calendar_query(start, nights)
+        .where(RoomType.hotel_id == hotel_id)
+        .execution_options(yield_per=batch_size)
+    )
+    async for rows in result.partitions():
+        yield rows
+
 async def create_rate_adjustment(db: AsyncSession, rate: schemas.RateAdjustmentCreate) -> RateAdjustment:
     db_rate = RateAdjustment(**rate.model_dump())
     db.add(db_rate)
     await db.commit()
+    price_cache.invalidate_room(db_rate.room_type_id, from_date=db_rate.effective_date)
     await db.refresh(db_rate)
     return db_rate
 
+async def touch_room_types(db: AsyncSession, room_type_ids) -> Dict[int, int]:
+    """Lock the existing rooms among ``room_type_ids`` and bump their updated_at (ETags).
+
+    ``room_type_ids`` is a collection or a SELECT of ids. Rows are locked in
+    id order before anything is written, so concurrent rate writes over
+    overlapping rooms queue behind each other instead of deadlocking, and
+    their adjustment upserts never interleave. Returns room_type_id ->
+    hotel_id. Does not commit.
+    """
+    result = await db.execute(
+        select(RoomType.id, RoomType.hotel_id)
+        .where(RoomType.id.in_(room_type_ids))
+        .order_by(RoomType.id)
+        # NO KEY: inserts referencing the rooms (bookings, inventory) are not blocked
+        .with_for_update(key_share=True)
+    )
+    room_hotels = dict(result.all())
+    if room_hotels:
+        await db.execute(
+            update(RoomType)
+            .where(RoomType.id.in_(list(room_hotels)))
+            .values(updated_at=func.now())
+            .execution_options(synchronize_session=False)
+        )
+    return room_hotels
+
+class UpsertedRate(NamedTuple):
+    id: int
+    room_type_id: int
+    effective_date: date
+    inserted: bool
+
+def expand_rate_rules(rules: Iterable[schemas.RateRule]) -> Iterator[dict]:
+    for rule in rules:
+        day = rule.start_date
+        while day <= rule.end_date:
+            if rule.weekdays is None or day.weekday() in rule.weekdays:
+                for room_type_id in rule.room_type_ids:
+                    yield {
+                        "room_type_id": room_type_id,
+                        "adjustment_amount": rule.adjustment_amount,
+                        "effective_date": day,
+                        "reason": rule.reason,
+                    }
+            day += timedelta(days=1)
+
+async def bulk_upsert_rate_adjustments(db: AsyncSession, rows: List[dict]) -> Tuple[List[UpsertedRate], Dict[int, int]]:
+    """Insert or update adjustments in a single transaction.
+
+    Rows must be unique per (room_type_id, effective_date): they are sent as
+    multi-row INSERT ... ON CONFLICT (uq_rate_adjustment_room_date) DO UPDATE
+    batches, which cannot touch the same row twice. Rows for unknown room types
+    are skipped. Returns the upserted rows and room_type_id -> hotel_id of the
+    rooms that exist.
+    """
+    room_type_ids = {row["room_type_id"] for row in rows}
+    if not room_type_ids:
+        return [], {}
+
+    room_hotels = await touch_room_types(db, room_type_ids)
+    valid_rows = [row for row in rows if row["room_type_id"] in room_hotels]
+
+    upserted: List[UpsertedRate] = []
+    if valid_rows:
+        table = RateAdjustment.__table__
+        stmt = pg_insert(table)
+        stmt = stmt.on_conflict_do_update(
+            constraint="uq_rate_adjustment_room_date",
+            set_={"adjustment_amount": stmt.excluded.adjustment_amount, "reason": stmt.excluded.reason},
+        ).returning(
+            table.c.id,
+            table.c.room_type_id,
+            table.c.effective_date,
+            # xmax is 0 only for freshly inserted tuples
+            literal_column("xmax = 0").label("inserted"),
+        )
+        # executemany: SQLAlchemy batches this into multi-row VALUES statements
+        result = await db.execute(stmt, valid_rows)
+        upserted = [UpsertedRate(*row) for row in result.all()]
+    await db.commit()
+
+    earliest: Dict[int, date] = {}
+    for row in valid_rows:
+        room_type_id = row["room_type_id"]
+        if room_type_id not in earliest or row["effective_date"] < earliest[room_type_id]:
+            earliest[room_type_id] = row["effective_date"]
+    for room_type_id, from_date in earliest.items():
+        price_cache.invalidate_room(room_type_id, from_date=from_date)
+    return upserted, room_hotels
+
 async def get_rate_adjustments(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[RateAdjustment]:
     result = await db.execute(select(RateAdjustment).order_by(desc(RateAdjustment.effective_date)).offset(skip).limit(limit))
     return result.scalars().all()
+
+async def get_rate_adjustments_page(
+    db: AsyncSession, limit: int = 100, after: Optional[Tuple[date, int]] = None
+) -> Tuple[List[RateAdjustment], Optional[Tuple[date, int]]]:
+    """Keyset page of adjustments, newest effective date first.
+
+    Seeks on (effective_date, id) so deep pages cost the same as the first one.
+    """
+    query = select(RateAdjustment)
+    if after is not None:
+        query = query.where(tuple_(RateAdjustment.effective_date, RateAdjustment.id) < tuple_(*after))
+    result = await db.execute(
+        query.order_by(RateAdjustment.effective_date.desc(), RateAdjustment.id.desc()).limit(limit + 1)
+    )
+    rates = result.scalars().all()
+    if len(rates) <= limit:
+        return rates, None
+    rates = rates[:limit]
+    return rates, (rates[-1].effective_date, rates[-1].id)
+
+async def get_rate_adjustment_rows(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[dict]:
+    """``get_rate_adjustments`` as plain dicts in the response shape, ready to encode."""
+    result = await db.execute(
+        select(*RATE_ROW_COLUMNS).order_by(desc(RateAdjustment.effective_date)).offset(skip).limit(limit)
+    )
+    return [dict(row) for row in result.mappings()]
+
+async def get_rate_adjustment_rows_page(
+    db: AsyncSession, limit: int = 100, after: Optional[Tuple[date, int]] = None
+) -> Tuple[List[dict], Optional[Tuple[date, int]]]:
+    """``get_rate_adjustments_page`` as plain dicts in the response shape."""
+    query = select(*RATE_ROW_COLUMNS)
+    if after is not None:
+        query = query.where(tuple_(RateAdjustment.effective_date, RateAdjustment.id) < tuple_(*after))
+    result = await db.execute(
+        query.order_by(RateAdjustment.effective_date.desc(), RateAdjustment.id.desc()).limit(limit + 1)
+    )
+    rows = [dict(row) for row in result.mappings()]
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, (rows[-1]["effective_date"], rows[-1]["id"])
+
+EXPORT_COLUMNS = ("id", "room_type_id", "effective_date", "adjustment_amount", "reason")
+
+async def stream_rate_adjustments(
+    db: AsyncSession,
+    room_type_id: Optional[int] = None,
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    batch_size: int = 1000,
+) -> AsyncIterator[Sequence[Row]]:
+    """Adjustments in id order from a server-side cursor, in batches of plain rows.
+
+    Selects columns rather than the entity, so no ORM instances or identity-map
+    entries are built and memory stays at one batch.
+    """
+    table = RateAdjustment.__table__
+    query = select(*(table.c[name] for name in EXPORT_COLUMNS))
+    if room_type_id is not None:
+        query = query.where(table.c.room_type_id == room_type_id)
+    if start is not None:
+        query = query.where(table.c.effective_date >= start)
+    if end is not None:
+        query = query.where(table.c.effective_date <= end)
+    result = await db.stream(query.order_by(table.c.id).execution_options(yield_per=batch_size))
+    async for rows in result.partitions():
+        yield rows
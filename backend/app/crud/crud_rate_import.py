@@ -0,0 +1,200 @@
+import codecs
+import csv
+import json
+from datetime import date
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy import Date, Float, Integer, String, column, select, table, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.price_cache import price_cache
+from app.crud.crud_rate import touch_room_types
+from app.models.hotel import RoomType
+from app.models.rate import RateAdjustment
+from app.schemas.rate import RateAdjustmentCreate
+
+STAGING_TABLE = "rate_import_staging"
+STAGING_COLUMNS = ("line", "room_type_id", "adjustment_amount", "effective_date", "reason")
+
+_staging = table(
+    STAGING_TABLE,
+    column("line", Integer),
+    column("room_type_id", Integer),
+    column("adjustment_amount", Float),
+    column("effective_date", Date),
+    column("reason", String),
+)
+
+# (line number, parsed record) or (line number, error message)
+Record = Tuple[int, Union[dict, str]]
+StagedRow = Tuple[int, int, float, date, Optional[str]]
+
+async def iter_lines(read: Callable[[int], Awaitable[bytes]], block_size: int = 64 * 1024) -> AsyncIterator[str]:
+    """Decode a byte stream incrementally and yield its lines, holding one block at a time."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    while True:
+        block = await read(block_size)
+        pending += decoder.decode(block, final=not block)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line.rstrip("\r")
+        if not block:
+            break
+    if pending:
+        yield pending.rstrip("\r")
+
+async def iter_records(lines: AsyncIterator[str], fmt: str) -> AsyncIterator[Record]:
+    """Parse CSV (with a header row) or NDJSON lines into dicts.
+
+    CSV fields cannot span lines; such rows surface as per-line errors.
+    """
+    header: Optional[List[str]] = None
+    line_no = 0
+    async for line in lines:
+        line_no += 1
+        if not line.strip():
+            continue
+        if fmt == "ndjson":
+            try:
+                record = json.loads(line)
+            except ValueError as exc:
+                yield line_no, f"Invalid JSON: {exc}"
+                continue
+            if not isinstance(record, dict):
+                yield line_no, "Expected a JSON object"
+                continue
+            yield line_no, record
+            continue
+
+        try:
+            values = next(csv.reader([line]))
+        except csv.Error as exc:
+            yield line_no, f"Invalid CSV: {exc}"
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        if len(values) != len(header):
+            yield line_no, f"Expected {len(header)} fields, got {len(values)}"
+            continue
+        # Empty CSV cells mean "not provided" (e.g. no reason)
+        yield line_no, {name: value for name, value in zip(header, values) if value != ""}
+
+async def _merge_chunk(db: AsyncSession, rows: List[StagedRow]) -> Tuple[List[int], Dict[int, int]]:
+    """COPY one chunk into a transaction-scoped staging table and upsert it.
+
+    Returns the lines whose room type does not exist and room_type_id -> hotel_id
+    for the rooms that were written. Commits the chunk.
+    """
+    conn = await db.connection()
+    await conn.execute(text(
+        f"CREATE TEMP TABLE {STAGING_TABLE} ("
+        "line integer, room_type_id integer, adjustment_amount double precision, "
+        "effective_date date, reason varchar) ON COMMIT DROP"
+    ))
+    raw = await conn.get_raw_connection()
+    await raw.driver_connection.copy_records_to_table(STAGING_TABLE, records=rows, columns=STAGING_COLUMNS)
+
+    room_hotels = await touch_room_types(db, select(_staging.c.room_type_id).distinct())
+
+    # The last line wins when a chunk repeats a (room, date)
+    latest = (
+        select(
+            _staging.c.room_type_id,
+            _staging.c.adjustment_amount,
+            _staging.c.effective_date,
+            _staging.c.reason,
+        )
+        .distinct(_staging.c.room_type_id, _staging.c.effective_date)
+        .join(RoomType.__table__, RoomType.__table__.c.id == _staging.c.room_type_id)
+        .order_by(_staging.c.room_type_id, _staging.c.effective_date, _staging.c.line.desc())
+    )
+    stmt = pg_insert(RateAdjustment.__table__).from_select(
+        ["room_type_id", "adjustment_amount", "effective_date", "reason"], latest
+    )
+    await conn.execute(
+        stmt.on_conflict_do_update(
+            constraint="uq_rate_adjustment_room_date",
+            set_={"adjustment_amount": stmt.excluded.adjustment_amount, "reason": stmt.excluded.reason},
+        )
+    )
+    await db.commit()
+
+    earliest: Dict[int, date] = {}
+    for _, room_type_id, _, effective_date, _ in rows:
+        if room_type_id in room_hotels and (room_type_id not in earliest or effective_date < earliest[room_type_id]):
+            earliest[room_type_id] = effective_date
+    for room_type_id, from_date in earliest.items():
+        price_cache.invalidate_room(room_type_id, from_date=from_date)
+
+    missing = [line for line, room_type_id, *_ in rows if room_type_id not in room_hotels]
+    return missing, room_hotels
+
+async def import_rate_adjustments(
+    db: AsyncSession,
+    records: AsyncIterator[Record],
+    chunk_size: int = 5000,
+    max_errors: int = 1000,
+    on_chunk: Optional[Callable[[Dict[int, int]], Awaitable[None]]] = None,
+) -> AsyncIterator[dict]:
+    """Validate, stage and merge records chunk by chunk, yielding progress events.
+
+    Only one chunk is held in memory and the next one is not read until the
+    previous chunk is committed and its events consumed, so a slow client or
+    database throttles reading the input. Events are dicts with an ``event``
+    key: ``error`` (per rejected line, up to ``max_errors``), ``progress`` (per
+    chunk) and a final ``summary``. ``on_chunk`` receives room_type_id ->
+    hotel_id of every committed chunk.
+    """
+    counts = {"rows_read": 0, "imported": 0, "failed": 0, "chunks": 0}
+    reported = 0
+    chunk: List[StagedRow] = []
+
+    def error(line: int, message: str) -> Optional[dict]:
+        nonlocal reported
+        counts["failed"] += 1
+        if reported >= max_errors:
+            return None
+        reported += 1
+        return {"event": "error", "line": line, "error": message}
+
+    async def flush() -> AsyncIterator[dict]:
+        missing, room_hotels = await _merge_chunk(db, chunk)
+        counts["chunks"] += 1
+        counts["imported"] += len(chunk) - len(missing)
+        for line in missing:
+            event = error(line, "Room type not found")
+            if event:
+                yield event
+        if on_chunk is not None:
+            await on_chunk(room_hotels)
+        chunk.clear()
+        yield {"event": "progress", **counts}
+
+    async for line, record in records:
+        counts["rows_read"] += 1
+        if isinstance(record, str):
+            event = error(line, record)
+        else:
+            try:
+                rate = RateAdjustmentCreate.model_validate(record)
+            except ValidationError as exc:
+                event = error(line, "; ".join(
+                    f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in exc.errors()
+                ))
+            else:
+                chunk.append((line, rate.room_type_id, rate.adjustment_amount, rate.effective_date, rate.reason))
+                event = None
+        if event:
+            yield event
+        if len(chunk) >= chunk_size:
+            async for event in flush():
+                yield event
+
+    if chunk:
+        async for event in flush():
+            yield event
+    yield {"event": "summary", **counts}
@@ -0,0 +1,238 @@
+"""Deterministic synthetic catalog loaded with COPY, for load tests and benchmarks.
+
+Every hotel gets its own seeded generator, so the rows of hotel N are the
+same whatever the chunking or the number of worker processes. Hotels, room
+types and adjustments get explicit ids (room types of hotel N are numbered
+consecutively), which lets chunks load in parallel without coordinating.
+"""
+import asyncio
+import logging
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import date, timedelta
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+
+import asyncpg
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.security import aget_password_hash
+from app.db.session import engine, url
+
+logger = logging.getLogger(__name__)
+
+CITIES = (
+    "New York, NY", "Miami, FL", "Aspen, CO", "San Francisco, CA", "Lake Tahoe, NV", "Phoenix, AZ",
+    "Boston, MA", "Honolulu, HI", "Portland, OR", "Chicago, IL", "Austin, TX", "Seattle, WA",
+    "Denver, CO", "Nashville, TN", "New Orleans, LA", "San Diego, CA", "Savannah, GA", "Santa Fe, NM",
+)
+ADJECTIVES = ("Grand", "Royal", "Sunset", "Harbor", "Garden", "Summit", "Urban", "Historic", "Coastal", "Lakeside")
+NOUNS = ("Plaza", "Resort", "Lodge", "Inn", "Suites", "Tower", "Retreat", "House", "Hotel", "Villas")
+ROOM_NAMES = ("Standard", "Deluxe King", "Double Queen", "Junior Suite", "Family Suite", "Penthouse", "Studio", "Loft")
+AMENITIES = ("wifi", "breakfast", "parking", "pool", "gym", "spa", "minibar", "balcony")
+REASONS = ("Weekend", "Holiday", "Event", "Low season", "Promotion", None)
+
+# Adjustments fall on distinct nights of this window around the reference date
+ADJUSTMENT_WINDOW = (-30, 365)
+MAX_ADJUSTMENTS_PER_ROOM = ADJUSTMENT_WINDOW[1] - ADJUSTMENT_WINDOW[0]
+
+HOTEL_COLUMNS = ("id", "name", "location", "description", "rating", "image_url")
+ROOM_COLUMNS = ("id", "hotel_id", "name", "description", "base_price", "capacity", "room_count", "amenities")
+ADJUSTMENT_COLUMNS = ("room_type_id", "adjustment_amount", "effective_date", "reason")
+
+class LoadedRows(NamedTuple):
+    hotels: int
+    room_types: int
+    adjustments: int
+
+def hotel_rng(seed: int, hotel_id: int) -> random.Random:
+    return random.Random(f"{seed}:{hotel_id}")
+
+def generate_hotel(rng: random.Random, hotel_id: int) -> Tuple:
+    city = rng.choice(CITIES)
+    name = f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)} {hotel_id}"
+    description = f"{name} in {city.split(',')[0]}, {rng.randint(5, 400)} steps from the center."
+    return (hotel_id, name, city, description, round(rng.uniform(2.5, 5.0), 1), None)
+
+def generate_rooms(
+    rng: random.Random, hotel_id: int, rooms: int, adjustments: int, first_room_id: int, today: date
+) -> Tuple[list, list]:
+    room_rows, adjustment_rows = [], []
+    window = range(*ADJUSTMENT_WINDOW)
+    for offset in range(rooms):
+        room_id = first_room_id + offset
+        base_price = float(rng.randrange(60, 900, 5))
+        room_rows.append((
+            room_id,
+            hotel_id,
+            f"{rng.choice(ROOM_NAMES)} {offset + 1}",
+            None,
+            base_price,
+            rng.randint(1, 6),
+            rng.randint(1, 40),
+            ",".join(rng.sample(AMENITIES, rng.randint(1, 4))),
+        ))
+        for day in sorted(rng.sample(window, adjustments)):
+            adjustment_rows.append((
+                room_id,
+                float(rng.randrange(-100, 150, 5)),
+                today + timedelta(days=day),
+                rng.choice(REASONS),
+            ))
+    return room_rows, adjustment_rows
+
+def generate(
+    first_hotel: int, last_hotel: int, rooms: int, adjustments: int, seed: int, today: date
+) -> Iterator[Tuple[Tuple, list, list]]:
+    """(hotel row, room rows, adjustment rows) for hotel ids first..last inclusive."""
+    for hotel_id in range(first_hotel, last_hotel + 1):
+        rng = hotel_rng(seed, hotel_id)
+        hotel = generate_hotel(rng, hotel_id)
+        room_rows, adjustment_rows = generate_rooms(
+            rng, hotel_id, rooms, adjustments, (hotel_id - 1) * rooms + 1, today
+        )
+        yield hotel, room_rows, adjustment_rows
+
+async def copy_hotels(
+    conn: asyncpg.Connection,
+    first_hotel: int,
+    last_hotel: int,
+    rooms: int,
+    adjustments: int,
+    seed: int,
+    today: date,
+    batch: int = 500,
+) -> LoadedRows:
+    """COPY the generated rows of a hotel id range, ``batch`` hotels per round trip."""
+    hotel_rows: List[Tuple] = []
+    room_rows: List[Tuple] = []
+    adjustment_rows: List[Tuple] = []
+    totals = [0, 0, 0]
+
+    async def flush():
+        await conn.copy_records_to_table("hotels", records=hotel_rows, columns=HOTEL_COLUMNS)
+        await conn.copy_records_to_table("room_types", records=room_rows, columns=ROOM_COLUMNS)
+        await conn.copy_records_to_table("rate_adjustments", records=adjustment_rows, columns=ADJUSTMENT_COLUMNS)
+        totals[0] += len(hotel_rows)
+        totals[1] += len(room_rows)
+        totals[2] += len(adjustment_rows)
+        hotel_rows.clear()
+        room_rows.clear()
+        adjustment_rows.clear()
+
+    for hotel, hotel_rooms, hotel_adjustments in generate(first_hotel, last_hotel, rooms, adjustments, seed, today):
+        hotel_rows.append(hotel)
+        room_rows.extend(hotel_rooms)
+        adjustment_rows.extend(hotel_adjustments)
+        if len(hotel_rows) >= batch:
+            await flush()
+    if hotel_rows:
+        await flush()
+    return LoadedRows(*totals)
+
+def _asyncpg_dsn() -> str:
+    return url.set(drivername="postgresql").render_as_string(hide_password=False)
+
+async def _load_chunk_async(first_hotel, last_hotel, rooms, adjustments, seed, today, batch) -> LoadedRows:
+    conn = await asyncpg.connect(_asyncpg_dsn())
+    try:
+        async with conn.transaction():
+            return await copy_hotels(conn, first_hotel, last_hotel, rooms, adjustments, seed, today, batch)
+    finally:
+        await conn.close()
+
+def _load_chunk(*args) -> LoadedRows:
+    # Worker process entry point: its own event loop and connection, one transaction per chunk
+    return asyncio.run(_load_chunk_async(*args))
+
+async def reset_catalog(conn: AsyncConnection) -> None:
+    await conn.execute(text(
+        "TRUNCATE hotels, room_types, rate_adjustments, room_inventory, bookings RESTART IDENTITY CASCADE"
+    ))
+
+async def catalog_size(conn: AsyncConnection) -> int:
+    return await conn.scalar(text("SELECT count(*) FROM hotels"))
+
+async def seed_users(conn: AsyncConnection, emails: Dict[str, str]) -> None:
+    """Create or reset users (email -> password), hashing each distinct password once, concurrently."""
+    passwords = sorted(set(emails.values()))
+    hashes = dict(zip(passwords, await asyncio.gather(*(aget_password_hash(password) for password in passwords))))
+    await conn.execute(
+        text(
+            "INSERT INTO users (email, hashed_password, is_active, is_superuser) "
+            "VALUES (:email, :hashed_password, true, false) "
+            "ON CONFLICT (email) DO UPDATE SET hashed_password = excluded.hashed_password, is_active = true"
+        ),
+        [{"email": email, "hashed_password": hashes[password]} for email, password in emails.items()],
+    )
+
+async def seed_numbered_users(conn: AsyncConnection, count: int, password: str) -> None:
+    """``count`` users loadN@example.com sharing one password, hashed once, in one statement."""
+    await conn.execute(
+        text(
+            "INSERT INTO users (email, hashed_password, is_active, is_superuser) "
+            "SELECT 'load' || n || '@example.com', :hashed_password, true, false "
+            "FROM generate_series(1, :count) AS n "
+            "ON CONFLICT (email) DO NOTHING"
+        ),
+        {"hashed_password": await aget_password_hash(password), "count": count},
+    )
+
+async def finish_load(conn: AsyncConnection) -> None:
+    # Explicit ids were copied; move the sequences past them
+    for table in ("hotels", "room_types"):
+        await conn.execute(text(
+            f"SELECT setval(pg_get_serial_sequence('{table}', 'id'), "
+            f"(SELECT coalesce(max(id), 0) + 1 FROM {table}), false)"
+        ))
+
+async def analyze_catalog() -> None:
+    # Fresh statistics so the first queries get the same plans as later ones
+    async with engine.connect() as conn:
+        await conn.execution_options(isolation_level="AUTOCOMMIT")
+        await conn.execute(text("ANALYZE hotels, room_types, rate_adjustments, users"))
+
+def load_catalog(
+    hotels: int,
+    rooms: int,
+    adjustments: int,
+    seed: int,
+    today: date,
+    workers: int = 1,
+    chunk_size: int = 2000,
+    batch: int = 500,
+) -> LoadedRows:
+    """Generate and COPY hotels 1..``hotels`` in chunks of ``chunk_size``, ``workers`` processes at once.
+
+    The catalog must be empty (see ``reset_catalog``). Each chunk commits on
+    its own, so a failed load leaves a partial catalog to reset. Blocking;
+    async callers run it with ``asyncio.to_thread``.
+    """
+    if adjustments > MAX_ADJUSTMENTS_PER_ROOM:
+        raise ValueError(f"At most {MAX_ADJUSTMENTS_PER_ROOM} adjustments per room type")
+    chunks = [
+        (first, min(first + chunk_size - 1, hotels), rooms, adjustments, seed, today, batch)
+        for first in range(1, hotels + 1, chunk_size)
+    ]
+    totals = [0, 0, 0]
+    started = time.perf_counter()
+    if workers <= 1:
+        results = (_load_chunk(*chunk) for chunk in chunks)
+    else:
+        # spawn: workers must not inherit the parent's event loop, pool or hashing threads
+        executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+        results = (future.result() for future in as_completed([executor.submit(_load_chunk, *chunk) for chunk in chunks]))
+    try:
+        for done, loaded in enumerate(results, 1):
+            totals = [total + count for total, count in zip(totals, loaded)]
+            elapsed = time.perf_counter() - started
+            logger.info(
+                "chunk %d/%d: %d hotels, %d room types, %d adjustments so far (%.0f adjustments/s)",
+                done, len(chunks), *totals, totals[2] / elapsed if elapsed else 0.0,
+            )
+    finally:
+        if workers > 1:
+            executor.shutdown(cancel_futures=True)
+    return LoadedRows(*totals)
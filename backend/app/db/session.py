@@ -1,16 +1,83 @@
-from typing import AsyncGenerator
-from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
-from sqlalchemy.engine.url import make_url
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, AsyncIterator, Dict, Optional
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.engine.url import URL, make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
 url = make_url(str(settings.DATABASE_URL))
 
+class InstrumentedPool(AsyncAdaptedQueuePool):
+    """Queue pool that records how long checkouts wait for a connection.
+
+    The wait includes opening a new connection when the pool grows, which is
+    what a request actually experiences. ``recreate`` (engine.dispose) builds
+    a fresh instance, so counters restart with the new pool.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            self.checkout_timeouts += 1
+            raise
+        finally:
+            wait = time.perf_counter() - start
+            self.checkouts += 1
+            self.total_wait += wait
+            self.max_wait = max(self.max_wait, wait)
+
+def _connect_args(url: URL) -> Dict[str, Any]:
+    if url.get_driver_name() != "asyncpg":
+        return {}
+    args: Dict[str, Any] = {
+        # asyncpg's own cache and SQLAlchemy's dialect-level cache
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+    }
+    if settings.DB_PGBOUNCER:
+        # Server connections are shared between clients, so named statements
+        # would collide or vanish; unique names keep unnamed-per-query semantics
+        args["statement_cache_size"] = 0
+        args["prepared_statement_cache_size"] = 0
+        args["prepared_statement_name_func"] = lambda: f"__asyncpg_{uuid4()}__"
+    if settings.DB_STATEMENT_TIMEOUT_MS:
+        # Sent as a startup parameter; PgBouncer needs it in ignore_startup_parameters
+        args["server_settings"] = {"statement_timeout": str(settings.DB_STATEMENT_TIMEOUT_MS)}
+    return args
+
+def create_engine(url: URL, **connect_args) -> AsyncEngine:
+    return create_async_engine(
+        url,
+        echo=settings.DB_ECHO,
+        poolclass=InstrumentedPool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+        pool_pre_ping=settings.DB_POOL_PRE_PING,
+        connect_args={**_connect_args(url), **connect_args},
+    )
+
 # create_async_engine with psycopg handle ssl differently
-engine = create_async_engine(
-    url,
-    echo=True,
-)
+engine = create_engine(url)
 
 AsyncSessionLocal = async_sessionmaker(
     bind=engine,
@@ -26,3 +93,128 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
             yield session
         finally:
             await session.close()
+
+read_engine: Optional[AsyncEngine] = None
+ReadSessionLocal = AsyncSessionLocal
+if settings.DATABASE_READ_URL:
+    read_url = make_url(str(settings.DATABASE_READ_URL))
+    # A short connect timeout so an unreachable replica falls back quickly
+    read_engine = create_engine(
+        read_url, **({"timeout": settings.DB_REPLICA_CONNECT_TIMEOUT} if read_url.get_driver_name() == "asyncpg" else {})
+    )
+    ReadSessionLocal = async_sessionmaker(
+        bind=read_engine,
+        class_=AsyncSession,
+        expire_on_commit=False,
+        autoflush=False,
+        autocommit=False,
+    )
+
+class ReadRouting:
+    """Decides whether a read may go to the replica.
+
+    Reads stay on the primary while the replica is marked down after a failed
+    connect, and for ``sticky_seconds`` after this worker handled a write, so
+    caches filled here are not refilled from a replica that still lags.
+    Per-client stickiness (a cookie) is handled by the caller.
+    """
+
+    def __init__(self, sticky_seconds: float, retry_seconds: float):
+        self.sticky_seconds = sticky_seconds
+        self.retry_seconds = retry_seconds
+        self.replica_down_until = 0.0
+        self.last_write_at = float("-inf")
+        self.replica_reads = 0
+        self.primary_reads = 0
+        self.replica_failures = 0
+
+    def note_write(self) -> None:
+        self.last_write_at = time.monotonic()
+
+    def mark_replica_down(self) -> None:
+        self.replica_failures += 1
+        self.replica_down_until = time.monotonic() + self.retry_seconds
+
+    def use_replica(self, prefer_primary: bool = False) -> bool:
+        now = time.monotonic()
+        return (
+            read_engine is not None
+            and not prefer_primary
+            and now >= self.replica_down_until
+            and now - self.last_write_at >= self.sticky_seconds
+        )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "replica_configured": read_engine is not None,
+            "replica_down": time.monotonic() < self.replica_down_until,
+            "replica_reads": self.replica_reads,
+            "primary_reads": self.primary_reads,
+            "replica_failures": self.replica_failures,
+        }
+
+read_routing = ReadRouting(
+    sticky_seconds=settings.DB_READ_STICKY_SECONDS,
+    retry_seconds=settings.DB_REPLICA_RETRY_SECONDS,
+)
+
+@asynccontextmanager
+async def read_session(prefer_primary: bool = False) -> AsyncIterator[AsyncSession]:
+    """Session for read-only work: the replica when usable, otherwise the primary."""
+    if read_routing.use_replica(prefer_primary):
+        session = ReadSessionLocal()
+        try:
+            # Connect up front so an unreachable replica can still fall back
+            await session.connection()
+        except (OSError, exc.DBAPIError, asyncio.TimeoutError) as error:
+            await session.close()
+            read_routing.mark_replica_down()
+            logger.warning("Read replica unavailable, using the primary for %ss: %s", read_routing.retry_seconds, error)
+        else:
+            read_routing.replica_reads += 1
+            async with session:
+                yield session
+            return
+
+    read_routing.primary_reads += 1
+    async with AsyncSessionLocal() as session:
+        yield session
+
+async def warm_up_pool(engine: AsyncEngine, connections: int) -> int:
+    """Open ``connections`` pooled connections at once and return them to the pool.
+
+    Returns how many were opened; failures are logged, not raised, so the app
+    still starts while the database is unavailable.
+    """
+    async def open_one():
+        return await engine.connect()
+
+    results = await asyncio.gather(*(open_one() for _ in range(connections)), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    for result in results:
+        if not isinstance(result, BaseException):
+            await result.close()
+    if errors:
+        logger.warning("Pool warm-up opened %d of %d connections: %s", connections - len(errors), connections, errors[0])
+    return connections - len(errors)
+
+def pool_stats(engine: AsyncEngine = engine) -> Dict[str, Any]:
+    pool = engine.pool
+    capacity = pool.size() + max(pool._max_overflow, 0)
+    stats: Dict[str, Any] = {
+        "size": pool.size(),
+        "max_overflow": pool._max_overflow,
+        "checked_out": pool.checkedout(),
+        "idle": pool.checkedin(),
+        # QueuePool counts overflow from -pool_size while the pool fills up
+        "overflow": max(pool.overflow(), 0),
+        "saturation": pool.checkedout() / capacity if capacity else 0.0,
+    }
+    if isinstance(pool, InstrumentedPool):
+        stats.update(
+            checkouts=pool.checkouts,
+            checkout_timeouts=pool.checkout_timeouts,
+            avg_wait_ms=pool.total_wait / pool.checkouts * 1000 if pool.checkouts else 0.0,
+            max_wait_ms=pool.max_wait * 1000,
+        )
+    return stats
@@ -1,8 +1,9 @@
 import asyncio
 import logging
 from app.db.session import AsyncSessionLocal
+from app.core.cache import CATALOG_ROOMS_SCOPE, CATALOG_SCOPE, response_cache, warn_if_cache_not_shared
 from app.models import User, Hotel, RoomType, RateAdjustment
-from app.core.security import get_password_hash
+from app.core.security import aget_password_hash
 from sqlalchemy import select
 from datetime import date
 
@@ -26,7 +27,7 @@ async def init_db() -> None:
         if not user:
             user = User(
                 email="admin@example.com",
-                hashed_password=get_password_hash("admin123"),
+                hashed_password=await aget_password_hash("admin123"),
                 is_active=True,
                 is_superuser=True,
             )
@@ -35,51 +36,40 @@ async def init_db() -> None:
         else:
             logger.info("User 'admin@example.com' already exists.")
 
-        # 2. Seed Hotels
+        # 2. Seed Hotels, their room types and rate adjustments, checked in one query
         logger.info("Creating hotels...")
-        result = await session.execute(select(Hotel).where(Hotel.name == "Grand Hotel"))
-        hotel = result.scalar_one_or_none()
-        
-        if not hotel:
-            hotel = Hotel(name="Grand Hotel", location="New York, NY")
-            session.add(hotel)
-            await session.flush() # Flush to get ID
-            
-            # 3. Room Types for Grand Hotel
-            std_room = RoomType(hotel_id=hotel.id, name="Standard Room", base_price=100.0)
-            deluxe_room = RoomType(hotel_id=hotel.id, name="Deluxe Suite", base_price=200.0)
-            session.add_all([std_room, deluxe_room])
-            await session.flush() 
+        result = await session.execute(select(Hotel.name).where(Hotel.name.in_(["Grand Hotel", "Ocean View Resort"])))
+        existing = set(result.scalars())
 
-            # 4. Rate Adjustments
+        if "Grand Hotel" not in existing:
             # +20 for Holiday Season (Dec 25)
-            adj1 = RateAdjustment(
-                room_type_id=std_room.id,
-                adjustment_amount=20.0,
-                effective_date=date(2025, 12, 25),
-                reason="Holiday Season Surcharge"
+            std_room = RoomType(
+                name="Standard Room",
+                base_price=100.0,
+                rate_adjustments=[RateAdjustment(
+                    adjustment_amount=20.0,
+                    effective_date=date(2025, 12, 25),
+                    reason="Holiday Season Surcharge",
+                )],
             )
-            session.add(adj1)
+            deluxe_room = RoomType(name="Deluxe Suite", base_price=200.0)
+            session.add(Hotel(name="Grand Hotel", location="New York, NY", room_types=[std_room, deluxe_room]))
             logger.info("Grand Hotel and rooms created.")
         else:
             logger.info("Hotel 'Grand Hotel' already exists.")
 
         # Another Hotel
-        result = await session.execute(select(Hotel).where(Hotel.name == "Ocean View Resort"))
-        hotel2 = result.scalar_one_or_none()
-        if not hotel2:
-            hotel2 = Hotel(name="Ocean View Resort", location="Miami, FL")
-            session.add(hotel2)
-            await session.flush()
-            
-            # Rooms
-            ocean_room = RoomType(hotel_id=hotel2.id, name="Ocean View King", base_price=350.0)
-            session.add(ocean_room)
+        if "Ocean View Resort" not in existing:
+            ocean_room = RoomType(name="Ocean View King", base_price=350.0)
+            session.add(Hotel(name="Ocean View Resort", location="Miami, FL", room_types=[ocean_room]))
             logger.info("Ocean View Resort created.")
 
         await session.commit()
+        # The hotel list's ETag follows the catalog cache version
+        await response_cache.bump(CATALOG_SCOPE, CATALOG_ROOMS_SCOPE)
 
 if __name__ == "__main__":
+    warn_if_cache_not_shared("initial_data")
     try:
         asyncio.run(init_db())
     except Exception as e:
@@ -1,14 +1,72 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager, suppress
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from app.core import metrics
+from app.core.cache import response_cache
 from app.core.config import settings
+from app.core.logging import configure_logging
+from app.core.security import hashing_pool
+from app.db.session import engine, pool_stats, read_engine, warm_up_pool
+from app.api.middleware import MetricsMiddleware, QueryDebugMiddleware, ReadYourWritesMiddleware, RequestIdMiddleware
+from app.api.v1.endpoints.login import login_limiter
+from app.tasks import sweep_expired_holds
 from app.api.v1.api import api_router
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if settings.DB_POOL_WARMUP:
+        await warm_up_pool(engine, settings.DB_POOL_SIZE)
+        if read_engine is not None:
+            await warm_up_pool(read_engine, settings.DB_POOL_SIZE)
+    sweeper = asyncio.create_task(
+        sweep_expired_holds(settings.HOLD_SWEEP_INTERVAL_SECONDS, settings.HOLD_SWEEP_BATCH_SIZE)
+    )
+    yield
+    sweeper.cancel()
+    with suppress(asyncio.CancelledError):
+        await sweeper
+    await response_cache.close()
+    hashing_pool.shutdown()
+    await engine.dispose()
+    if read_engine is not None:
+        await read_engine.dispose()
+
+db_pool_connections = metrics.registry.gauge(
+    "db_pool_connections", "Pooled database connections by state.", ("engine", "state")
+)
+db_pool_checkouts = metrics.registry.counter("db_pool_checkouts_total", "Connection checkouts.", ("engine",))
+db_pool_checkout_timeouts = metrics.registry.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up waiting for a connection.", ("engine",)
+)
+login_queue = metrics.registry.gauge("login_requests", "Login requests by state.", ("state",))
+password_hashing_in_flight = metrics.registry.gauge(
+    "password_hashing_in_flight", "bcrypt calls running or queued on the hashing pool."
+)
+
+def collect_runtime_metrics() -> None:
+    for name, db_engine in (("primary", engine), ("replica", read_engine)):
+        if db_engine is None:
+            continue
+        stats = pool_stats(db_engine)
+        db_pool_connections.set(name, "checked_out", value=stats["checked_out"])
+        db_pool_connections.set(name, "idle", value=stats["idle"])
+        db_pool_connections.set(name, "overflow", value=stats["overflow"])
+        db_pool_checkouts.set(name, value=stats.get("checkouts", 0))
+        db_pool_checkout_timeouts.set(name, value=stats.get("checkout_timeouts", 0))
+    limiter = login_limiter.stats()
+    login_queue.set("active", value=limiter["active"])
+    login_queue.set("waiting", value=limiter["waiting"])
+    password_hashing_in_flight.set(value=hashing_pool.stats()["in_flight"])
+
 def create_app() -> FastAPI:
+    configure_logging()
     app = FastAPI(
         title=settings.PROJECT_NAME,
         openapi_url=f"{settings.API_V1_STR}/openapi.json",
         description="Basic Hotel Platform",
         version="1.0.0",
+        lifespan=lifespan,
     )
 
     # Set all CORS enabled origins
@@ -20,7 +78,30 @@ def create_app() -> FastAPI:
             allow_methods=["*"],
             allow_headers=["*"],
         )
-    
+
+    if read_engine is not None:
+        app.add_middleware(ReadYourWritesMiddleware, sticky_seconds=settings.DB_READ_STICKY_SECONDS)
+
+    # One set of statement hooks feeds both the metrics and the query debugging
+    if settings.METRICS_ENABLED or settings.QUERY_DEBUG:
+        metrics.instrument_engine(engine, "primary")
+        if read_engine is not None:
+            metrics.instrument_engine(read_engine, "replica")
+
+    if settings.QUERY_DEBUG:
+        app.add_middleware(QueryDebugMiddleware, repeat_threshold=settings.QUERY_DEBUG_REPEAT_THRESHOLD)
+
+    if settings.METRICS_ENABLED:
+        metrics.registry.add_collector(collect_runtime_metrics)
+        app.add_middleware(MetricsMiddleware)
+
+        @app.get("/metrics", include_in_schema=False)
+        async def read_metrics():
+            return Response(content=metrics.registry.render(), media_type=metrics.CONTENT_TYPE)
+
+    # Outermost, so everything logged while handling the request carries its id
+    app.add_middleware(RequestIdMiddleware)
+
     app.include_router(api_router, prefix=settings.API_V1_STR)
 
     return app
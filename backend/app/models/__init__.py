@@ -1,4 +1,6 @@
 from app.models.user import User
 from app.models.hotel import Hotel, RoomType
 from app.models.rate import RateAdjustment
+from app.models.inventory import RoomInventory
+from app.models.booking import Booking
 from app.db.base import Base
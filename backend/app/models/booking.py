@@ -0,0 +1,37 @@
+import uuid
+from typing import Optional
+from datetime import date, datetime
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, ForeignKey, Date, DateTime, String, Uuid, Index, CheckConstraint, func, text
+from app.db.base import Base
+
+class Booking(Base):
+    """Rooms of one type taken for a stay: a hold until confirmed, then a booking.
+
+    Holds expire at ``expires_at`` and are swept back into inventory. Every
+    status change bumps ``version``, so a client acting on a stale read is
+    refused instead of overwriting a concurrent change. Only the owner (or a
+    superuser) can see or change a booking.
+    """
+    __tablename__ = "bookings"
+    __table_args__ = (
+        CheckConstraint('end_date > start_date', name='ck_bookings_stay_range'),
+        CheckConstraint('quantity > 0', name='ck_bookings_quantity_positive'),
+        # Expiry sweep: oldest live holds first
+        Index('ix_bookings_held_expires_at', 'expires_at', postgresql_where=text("status = 'held'")),
+    )
+
+    # Random, so ids cannot be enumerated
+    id: Mapped[uuid.UUID] = mapped_column(Uuid, primary_key=True, default=uuid.uuid4)
+    # Owner; NULL for bookings made before holds required an account
+    user_id: Mapped[Optional[int]] = mapped_column(ForeignKey("users.id", ondelete="SET NULL"), nullable=True, index=True)
+    room_type_id: Mapped[int] = mapped_column(ForeignKey("room_types.id", ondelete="CASCADE"), index=True)
+    start_date: Mapped[date] = mapped_column(Date)
+    end_date: Mapped[date] = mapped_column(Date)  # check-out (exclusive)
+    quantity: Mapped[int] = mapped_column(Integer, default=1)
+    guest_email: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # held -> confirmed | cancelled | expired; confirmed -> cancelled
+    status: Mapped[str] = mapped_column(String, default="held")
+    expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now())
+    version: Mapped[int] = mapped_column(Integer, default=1)
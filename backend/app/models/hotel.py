@@ -1,10 +1,18 @@
 from typing import List, Optional
-from sqlalchemy.orm import Mapped, mapped_column, relationship
-from sqlalchemy import String, Integer, ForeignKey, Float, Text
+from datetime import datetime
+from sqlalchemy.orm import Mapped, mapped_column, relationship, query_expression
+from sqlalchemy import String, Integer, ForeignKey, Float, Text, DateTime, Index, func, text
 from app.db.base import Base
 
 class Hotel(Base):
     __tablename__ = "hotels"
+    # Keyset pagination by name
+    __table_args__ = (
+        Index('ix_hotels_name_id', 'name', 'id'),
+        # Substring (ILIKE) and similarity search
+        Index('ix_hotels_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        Index('ix_hotels_location_trgm', 'location', postgresql_using='gin', postgresql_ops={'location': 'gin_trgm_ops'}),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     name: Mapped[str] = mapped_column(String, index=True)
@@ -12,46 +20,59 @@ class Hotel(Base):
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     rating: Mapped[float] = mapped_column(Float, default=0.0)
     image_url: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    # Drives ETag / Last-Modified of the public catalog endpoints
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
-    room_types: Mapped[List["RoomType"]] = relationship(back_populates="hotel", cascade="all, delete-orphan")
+    room_types: Mapped[List["RoomType"]] = relationship(
+        back_populates="hotel", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    # Cheapest effective room price; populated by search queries, None otherwise
+    min_price: Mapped[Optional[float]] = query_expression()
+
+def hotel_search_document():
+    """Full-text document of a hotel; must match the expression of ix_hotels_search_document.
+
+    Constants are inline SQL rather than bound parameters so the planner can
+    match the expression index.
+    """
+    return func.to_tsvector(
+        text("'simple'::regconfig"),
+        func.coalesce(Hotel.name, text("''"))
+        .op("||")(text("' '"))
+        .op("||")(func.coalesce(Hotel.description, text("''"))),
+    )
+
+Index('ix_hotels_search_document', hotel_search_document(), postgresql_using='gin')
 
 class RoomType(Base):
     __tablename__ = "room_types"
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
-    hotel_id: Mapped[int] = mapped_column(ForeignKey("hotels.id"))
+    hotel_id: Mapped[int] = mapped_column(ForeignKey("hotels.id", ondelete="CASCADE"), index=True)
     name: Mapped[str] = mapped_column(String)
     description: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
     base_price: Mapped[float] = mapped_column(Float)
     capacity: Mapped[int] = mapped_column(Integer, default=2)
+    # Physical rooms of this type: the default nightly allotment (see RoomInventory)
+    room_count: Mapped[int] = mapped_column(Integer, default=1, server_default='1')
     amenities: Mapped[Optional[str]] = mapped_column(Text, nullable=True) # Storing as comma-separated string for simplicity
+    # Also touched by rate writes, since they change the room's effective price
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
     
     hotel: Mapped["Hotel"] = relationship(back_populates="room_types")
     
-    rate_adjustments: Mapped[List["RateAdjustment"]] = relationship(back_populates="room_type", cascade="all, delete-orphan")
+    # The database cascades deletes (ON DELETE CASCADE); adjustments are never loaded just to delete them
+    rate_adjustments: Mapped[List["RateAdjustment"]] = relationship(
+        back_populates="room_type", cascade="all, delete-orphan", passive_deletes=True
+    )
+
+    # Base price plus the latest adjustment on or before the requested date.
+    # Populated by crud from the price cache or SQL; None when not requested.
+    resolved_price: Mapped[Optional[float]] = query_expression()
 
     @property
     def effective_price(self) -> float:
-        from datetime import date
-        today = date.today()
-        
-        try:
-            # Check if rate_adjustments is loaded to avoid LazyLoad error in async
-            adjustments = self.rate_adjustments
-        except Exception:
-            return self.base_price
-
-        # Sort adjustments by effective_date descending
-        # We process in Python because the list is expected to be small per room type
-        relevant_adjustments = [
-            adj for adj in adjustments 
-            if adj.effective_date <= today
-        ]
-        
-        if not relevant_adjustments:
+        if self.resolved_price is None:
             return self.base_price
-            
-        # Get the latest one (closest to today but in the past/today)
-        latest_adjustment = max(relevant_adjustments, key=lambda x: x.effective_date)
-        
-        return self.base_price + latest_adjustment.adjustment_amount
+        return self.resolved_price
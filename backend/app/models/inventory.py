@@ -0,0 +1,24 @@
+from typing import Optional
+from datetime import date
+from sqlalchemy.orm import Mapped, mapped_column
+from sqlalchemy import Integer, ForeignKey, Date, CheckConstraint
+from app.db.base import Base
+
+class RoomInventory(Base):
+    """Sellable rooms of a room type on one night.
+
+    Rows exist only for nights that were allocated or given an explicit
+    allotment; any other night offers ``RoomType.room_count`` rooms.
+    """
+    __tablename__ = "room_inventory"
+    __table_args__ = (
+        CheckConstraint('reserved >= 0', name='ck_room_inventory_reserved_non_negative'),
+        CheckConstraint('allotment IS NULL OR reserved <= allotment', name='ck_room_inventory_not_oversold'),
+    )
+
+    room_type_id: Mapped[int] = mapped_column(ForeignKey("room_types.id", ondelete="CASCADE"), primary_key=True)
+    stay_date: Mapped[date] = mapped_column(Date, primary_key=True)
+    # Rooms for sale that night; NULL falls back to the room type's room_count
+    allotment: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    # Rooms held or booked that night
+    reserved: Mapped[int] = mapped_column(Integer, default=0, server_default='0')
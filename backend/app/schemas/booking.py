@@ -0,0 +1,39 @@
+import uuid
+from datetime import date, datetime
+from typing import Literal, Optional
+from pydantic import BaseModel, Field, model_validator
+
+class BookingCreate(BaseModel):
+    room_type_id: int = Field(..., alias="roomTypeId")
+    start: date
+    end: date  # check-out date (exclusive)
+    quantity: int = Field(1, ge=1, le=10)
+    guest_email: Optional[str] = Field(None, alias="guestEmail")
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.end <= self.start:
+            raise ValueError("end must be after start")
+        return self
+
+    class Config:
+        populate_by_name = True
+
+class BookingTransition(BaseModel):
+    # Version the client last saw; the change is refused if the booking moved on since
+    version: Optional[int] = None
+
+class Booking(BaseModel):
+    id: uuid.UUID
+    room_type_id: int = Field(..., alias="roomTypeId")
+    start: date = Field(..., validation_alias="start_date")
+    end: date = Field(..., validation_alias="end_date")
+    quantity: int
+    guest_email: Optional[str] = Field(None, alias="guestEmail")
+    status: Literal["held", "confirmed", "cancelled", "expired"]
+    expires_at: Optional[datetime] = Field(None, alias="expiresAt")
+    version: int
+
+    class Config:
+        from_attributes = True
+        populate_by_name = True
@@ -1,4 +1,5 @@
 from typing import List, Optional
+from datetime import date
 from pydantic import BaseModel, Field
 
 # RoomType Schemas
@@ -7,6 +8,7 @@ class RoomTypeBase(BaseModel):
     description: Optional[str] = None
     base_price: float = Field(..., alias="basePrice")
     capacity: int = 2
+    room_count: int = Field(1, alias="roomCount", ge=0)
     amenities: Optional[str] = None
 
 class RoomTypeCreate(RoomTypeBase):
@@ -17,6 +19,7 @@ class RoomTypeUpdate(RoomTypeBase):
     name: Optional[str] = None
     base_price: Optional[float] = Field(None, alias="basePrice")
     capacity: Optional[int] = None
+    room_count: Optional[int] = Field(None, alias="roomCount", ge=0)
     
     class Config:
         populate_by_name = True
@@ -30,6 +33,33 @@ class RoomType(RoomTypeBase):
         from_attributes = True
         populate_by_name = True
 
+# Price calendar Schemas
+class NightlyPrice(BaseModel):
+    stay_date: date = Field(..., alias="date")
+    price: float
+
+    class Config:
+        populate_by_name = True
+
+class RoomTypePriceCalendar(BaseModel):
+    room_type_id: int = Field(..., alias="roomTypeId")
+    name: str
+    nights: List[NightlyPrice]
+    total_price: float = Field(..., alias="totalPrice")
+
+    class Config:
+        populate_by_name = True
+
+class PriceCalendar(BaseModel):
+    hotel_id: int = Field(..., alias="hotelId")
+    start: date
+    end: date
+    night_count: int = Field(..., alias="nightCount")
+    room_types: List[RoomTypePriceCalendar] = Field(..., alias="roomTypes")
+
+    class Config:
+        populate_by_name = True
+
 # Hotel Schemas
 class HotelBase(BaseModel):
     name: str
@@ -58,3 +88,10 @@ class Hotel(HotelBase):
         from_attributes = True
         populate_by_name = True
 
+
+class HotelWithMinPrice(Hotel):
+    # Cheapest effective price today (among the rooms matching a search, if any)
+    min_price: Optional[float] = Field(None, alias="minPrice")
+
+class HotelWithRooms(HotelWithMinPrice):
+    room_types: List[RoomType] = Field(..., alias="roomTypes")
@@ -0,0 +1,26 @@
+from datetime import date
+from typing import List, Optional
+from pydantic import BaseModel, Field
+
+class RoomTypeAvailability(BaseModel):
+    room_type_id: int = Field(..., alias="roomTypeId")
+    name: str
+    capacity: int
+    # Fewest free rooms over the nights of the stay
+    available_rooms: int = Field(..., alias="availableRooms")
+
+    class Config:
+        populate_by_name = True
+
+class HotelAvailability(BaseModel):
+    hotel_id: int = Field(..., alias="hotelId")
+    room_types: List[RoomTypeAvailability] = Field(..., alias="roomTypes")
+
+    class Config:
+        populate_by_name = True
+
+class AllotmentUpdate(BaseModel):
+    start: date
+    end: date  # check-out date (exclusive)
+    # Rooms for sale on each night; null resets the nights to the room type's roomCount
+    allotment: Optional[int] = Field(None, ge=0)
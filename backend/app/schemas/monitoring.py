@@ -0,0 +1,20 @@
+from pydantic import BaseModel
+
+class DbPoolStats(BaseModel):
+    size: int
+    max_overflow: int
+    checked_out: int
+    idle: int
+    overflow: int
+    saturation: float
+    checkouts: int
+    checkout_timeouts: int
+    avg_wait_ms: float
+    max_wait_ms: float
+
+class ReadRoutingStats(BaseModel):
+    replica_configured: bool
+    replica_down: bool
+    replica_reads: int
+    primary_reads: int
+    replica_failures: int
@@ -0,0 +1,12 @@
+from typing import Generic, List, Optional, TypeVar
+from pydantic import BaseModel, Field
+
+T = TypeVar("T")
+
+class CursorPage(BaseModel, Generic[T]):
+    items: List[T]
+    # Pass back as ?cursor= to fetch the following page; null on the last page
+    next_cursor: Optional[str] = Field(None, alias="nextCursor")
+
+    class Config:
+        populate_by_name = True
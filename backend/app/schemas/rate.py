@@ -1,6 +1,6 @@
 from datetime import date
-from typing import Optional
-from pydantic import BaseModel
+from typing import List, Literal, Optional
+from pydantic import BaseModel, Field, model_validator
 
 class RateAdjustmentBase(BaseModel):
     room_type_id: int
@@ -16,3 +16,54 @@ class RateAdjustment(RateAdjustmentBase):
 
     class Config:
         from_attributes = True
+
+class RateRule(BaseModel):
+    """Compact form of a seasonal load: one adjustment per night of a date range."""
+    room_type_ids: List[int] = Field(..., min_length=1)
+    start_date: date
+    end_date: date  # inclusive
+    adjustment_amount: float
+    reason: Optional[str] = None
+    # 0 = Monday ... 6 = Sunday; every day when omitted
+    weekdays: Optional[List[int]] = None
+
+    @model_validator(mode="after")
+    def check_range(self):
+        if self.end_date < self.start_date:
+            raise ValueError("end_date must not be before start_date")
+        if self.weekdays is not None and any(day < 0 or day > 6 for day in self.weekdays):
+            raise ValueError("weekdays must be between 0 (Monday) and 6 (Sunday)")
+        return self
+
+class RateAdjustmentBulk(BaseModel):
+    adjustments: List[RateAdjustmentCreate] = []
+    rules: List[RateRule] = []
+
+class RateAdjustmentBulkRow(BaseModel):
+    room_type_id: int
+    effective_date: date
+    status: Literal["inserted", "updated", "superseded", "error"]
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class RateAdjustmentBulkResult(BaseModel):
+    received: int
+    inserted: int
+    updated: int
+    superseded: int
+    failed: int
+    elapsed_ms: float
+    rows_per_second: float
+    results: List[RateAdjustmentBulkRow]
+
+class PriceCacheStats(BaseModel):
+    size: int
+    maxsize: int
+    ttl_seconds: float
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    invalidations: int
+    hit_ratio: float
+    rooms: int
@@ -6,3 +6,24 @@ class Token(BaseModel):
 
 class TokenPayload(BaseModel):
     sub: int | None = None
+
+class LoginLimiterStats(BaseModel):
+    limit: int
+    active: int
+    waiting: int
+    admitted: int
+    rejected: int
+
+class HashingPoolStats(BaseModel):
+    workers: int
+    in_flight: int
+    queued: int
+    max_in_flight: int
+    completed: int
+    avg_wait_ms: float
+    max_wait_ms: float
+    avg_run_ms: float
+
+class LoginStats(BaseModel):
+    limiter: LoginLimiterStats
+    hashing: HashingPoolStats
@@ -0,0 +1,21 @@
+import asyncio
+import logging
+
+from app.crud.crud_booking import expire_holds
+from app.db.session import AsyncSessionLocal
+
+logger = logging.getLogger(__name__)
+
+async def sweep_expired_holds(interval: float, batch_size: int) -> None:
+    """Return expired holds to inventory every ``interval`` seconds, until cancelled."""
+    while True:
+        try:
+            async with AsyncSessionLocal() as db:
+                # Keep going while full batches come back
+                while await expire_holds(db, batch_size=batch_size) == batch_size:
+                    pass
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("Hold expiry sweep failed")
+        await asyncio.sleep(interval)
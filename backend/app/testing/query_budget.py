@@ -0,0 +1,58 @@
+"""Pytest plugin that fails tests whose endpoints exceed a query budget.
+
+Enable it from a conftest.py with ``pytest_plugins = ["app.testing.query_budget"]``.
+
+Budget one block::
+
+    def test_list_hotels(client, query_budget):
+        with query_budget(3):
+            client.get("/api/v1/hotels/?include=rooms")
+
+or the whole test with ``@pytest.mark.query_budget(3)``. Both also fail when
+a statement repeats ``max_repeats`` times or more (default 3), the usual
+sign of an N+1 loop; pass ``max_repeats=None`` to allow it. Only statements
+run from the test's own context count: its TestClient requests, not the
+app's background tasks or fixture setup.
+"""
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+import pytest
+
+from app.core.metrics import RequestDbStats, instrument_engine, track_queries
+from app.db.session import engine, read_engine
+
+DEFAULT_MAX_REPEATS = 3
+
+def _check(stats: RequestDbStats, max_queries: int, max_repeats: Optional[int]) -> None:
+    if stats.queries > max_queries:
+        pytest.fail(f"Query budget exceeded: {stats.queries} > {max_queries}\n{stats.report()}", pytrace=False)
+    if max_repeats is not None and stats.repeated(max_repeats):
+        pytest.fail(f"Statement repeated {max_repeats} times or more (N+1?)\n{stats.report()}", pytrace=False)
+
+@contextmanager
+def _budget(max_queries: int, max_repeats: Optional[int] = DEFAULT_MAX_REPEATS) -> Iterator[RequestDbStats]:
+    # No-ops when the app already instrumented them for metrics or query debugging
+    instrument_engine(engine, "primary")
+    if read_engine is not None:
+        instrument_engine(read_engine, "replica")
+    with track_queries() as stats:
+        yield stats
+    _check(stats, max_queries, max_repeats)
+
+@pytest.fixture
+def query_budget():
+    return _budget
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        "markers", "query_budget(max_queries, max_repeats=3): fail when the test runs more statements"
+    )
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker("query_budget")
+    if marker is None:
+        return (yield)
+    with _budget(*marker.args, **marker.kwargs):
+        return (yield)
@@ -0,0 +1,121 @@
+import argparse
+import asyncio
+import statistics
+import time
+from datetime import date, timedelta
+from typing import List, Optional
+
+from pydantic import TypeAdapter
+
+from app.api.v1.endpoints.hotels import _dump_json
+from app.core.serialization import dumps
+from app.crud import crud_hotel, crud_rate
+from app.db.session import AsyncSessionLocal
+from app.models.hotel import Hotel
+from app.models.rate import RateAdjustment
+from app.schemas import hotel as hotel_schemas
+from app.schemas import rate as rate_schemas
+# Import all models to ensure they are registered
+import app.models # noqa
+
+hotel_list_adapter = TypeAdapter(List[hotel_schemas.Hotel])
+room_type_list_adapter = TypeAdapter(List[hotel_schemas.RoomType])
+rate_list_adapter = TypeAdapter(List[rate_schemas.RateAdjustment])
+
+def report(label: str, timings: List[float], baseline: Optional[float] = None) -> float:
+    median = statistics.median(timings) * 1000
+    speedup = f"  {baseline / median:.1f}x" if baseline else ""
+    print(f"  {label:<28} median {median:8.2f} ms  min {min(timings) * 1000:8.2f} ms{speedup}")
+    return median
+
+def measure(fn, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+async def measure_async(fn, repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        async with AsyncSessionLocal() as db:
+            started = time.perf_counter()
+            await fn(db)
+            timings.append(time.perf_counter() - started)
+    return timings
+
+def encode_only(rows: int, repeat: int) -> None:
+    """Encoding stage alone: ORM instances through Pydantic vs dicts through orjson."""
+    today = date.today()
+    hotels = [
+        Hotel(id=i, name=f"Hotel {i}", location="Somewhere", description="A" * 200, rating=4.5, image_url=None)
+        for i in range(rows)
+    ]
+    hotel_rows = [
+        {"name": h.name, "location": h.location, "description": h.description, "rating": h.rating, "imageUrl": None, "id": h.id}
+        for h in hotels
+    ]
+    rates = [
+        RateAdjustment(id=i, room_type_id=i % 50, adjustment_amount=-12.5, effective_date=today - timedelta(days=i % 365), reason="Season")
+        for i in range(rows)
+    ]
+    rate_rows = [
+        {"room_type_id": r.room_type_id, "adjustment_amount": r.adjustment_amount, "effective_date": r.effective_date, "reason": r.reason, "id": r.id}
+        for r in rates
+    ]
+    assert _dump_json(hotel_list_adapter, hotels) == dumps(hotel_rows)
+    assert _dump_json(rate_list_adapter, rates) == dumps(rate_rows)
+
+    print(f"encode only, {rows} rows")
+    baseline = report("hotels: pydantic", measure(lambda: _dump_json(hotel_list_adapter, hotels), repeat))
+    report("hotels: orjson rows", measure(lambda: dumps(hotel_rows), repeat), baseline)
+    baseline = report("rates: pydantic", measure(lambda: _dump_json(rate_list_adapter, rates), repeat))
+    report("rates: orjson rows", measure(lambda: dumps(rate_rows), repeat), baseline)
+
+async def end_to_end(rows: int, repeat: int, hotel_id: int) -> None:
+    """Query plus encoding against DATABASE_URL, each run in a fresh session."""
+    async def hotels_orm(db):
+        return _dump_json(hotel_list_adapter, await crud_hotel.get_hotels(db, limit=rows))
+
+    async def hotels_rows(db):
+        return dumps(await crud_hotel.get_hotel_rows(db, limit=rows))
+
+    async def rooms_orm(db):
+        room_types = await crud_hotel.get_room_types(db, hotel_id=hotel_id)
+        return _dump_json(room_type_list_adapter, room_types)
+
+    async def rooms_rows(db):
+        return dumps(await crud_hotel.get_room_type_rows(db, hotel_id=hotel_id))
+
+    async def rates_orm(db):
+        return _dump_json(rate_list_adapter, await crud_rate.get_rate_adjustments(db, limit=rows))
+
+    async def rates_rows(db):
+        return dumps(await crud_rate.get_rate_adjustment_rows(db, limit=rows))
+
+    print(f"query + encode, limit {rows}")
+    for label, orm_path, fast_path in (
+        ("hotels", hotels_orm, hotels_rows),
+        (f"rooms of hotel {hotel_id}", rooms_orm, rooms_rows),
+        ("rates", rates_orm, rates_rows),
+    ):
+        async with AsyncSessionLocal() as db:
+            if await orm_path(db) != await fast_path(db):
+                print(f"  {label}: responses differ")
+        baseline = report(f"{label}: orm + pydantic", await measure_async(orm_path, repeat))
+        report(f"{label}: rows + orjson", await measure_async(fast_path, repeat), baseline)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the ORM + Pydantic serialization path of the list endpoints "
+        "with the Core rows + orjson fast path."
+    )
+    parser.add_argument("--rows", type=int, default=1000, help="rows per list (page limit with --db)")
+    parser.add_argument("--repeat", type=int, default=50)
+    parser.add_argument("--db", action="store_true", help="also run query + encode against DATABASE_URL")
+    parser.add_argument("--hotel-id", type=int, default=1, help="hotel whose rooms are listed with --db")
+    args = parser.parse_args()
+    encode_only(args.rows, args.repeat)
+    if args.db:
+        asyncio.run(end_to_end(args.rows, args.repeat, args.hotel_id))
@@ -0,0 +1,13 @@
+"""Reproducible API benchmarks against a local uvicorn + Postgres.
+
+Typical session, from backend/ with DATABASE_URL pointing at a scratch database::
+
+    alembic upgrade head
+    python -m benchmarks.datagen --hotels 2000 --rooms 5 --adjustments 60 --reset
+    python -m benchmarks.run --start-server --workloads catalog_browse,price_lookup
+    python -m benchmarks.compare benchmarks/results/<before>.json benchmarks/results/<after>.json
+
+Data generation is deterministic for a given --seed and size, and workloads
+draw their requests from a seeded generator, so runs on different commits
+exercise the same data and the same request mix.
+"""
@@ -0,0 +1,58 @@
+import argparse
+import json
+import sys
+from typing import Optional
+
+METRICS = ("p50_ms", "p95_ms", "p99_ms", "throughput_rps")
+
+def change(before: Optional[float], after: Optional[float]) -> Optional[float]:
+    if not before or after is None:
+        return None
+    return (after - before) / before * 100
+
+def is_regression(metric: str, pct: Optional[float], threshold: float) -> bool:
+    # Latency going up or throughput going down by more than the threshold
+    if pct is None:
+        return False
+    return pct < -threshold if metric == "throughput_rps" else pct > threshold
+
+def compare(before: dict, after: dict, threshold: float) -> int:
+    regressions = 0
+    print(f"before: {before['meta'].get('commit')} {before['meta'].get('label') or ''}")
+    print(f"after:  {after['meta'].get('commit')} {after['meta'].get('label') or ''}")
+    if before["meta"].get("dataset") != after["meta"].get("dataset"):
+        print(f"warning: datasets differ {before['meta'].get('dataset')} vs {after['meta'].get('dataset')}")
+    for workload in sorted(set(before["workloads"]) | set(after["workloads"])):
+        old, new = before["workloads"].get(workload), after["workloads"].get(workload)
+        if old is None or new is None:
+            print(f"\n{workload}: only in {'after' if old is None else 'before'}")
+            continue
+        print(f"\n{workload}")
+        rows = [("(all)", old, new)] + [
+            (endpoint, old["endpoints"].get(endpoint), new["endpoints"].get(endpoint))
+            for endpoint in sorted(set(old["endpoints"]) | set(new["endpoints"]))
+        ]
+        for label, old_row, new_row in rows:
+            if old_row is None or new_row is None:
+                continue
+            cells = []
+            for metric in METRICS:
+                pct = change(old_row.get(metric), new_row.get(metric))
+                flag = ""
+                if is_regression(metric, pct, threshold):
+                    regressions += 1
+                    flag = " !"
+                shown = f"{pct:+.1f}%" if pct is not None else "n/a"
+                cells.append(f"{metric} {old_row.get(metric) or 0:.1f} -> {new_row.get(metric) or 0:.1f} ({shown}){flag}")
+            print(f"  {label:<40} " + "  ".join(cells))
+    print(f"\n{regressions} regression(s) beyond {threshold:.0f}%")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare two benchmark result files (before, after).")
+    parser.add_argument("before")
+    parser.add_argument("after")
+    parser.add_argument("--threshold", type=float, default=10.0, help="percent change flagged as a regression")
+    args = parser.parse_args()
+    with open(args.before) as before_file, open(args.after) as after_file:
+        sys.exit(compare(json.load(before_file), json.load(after_file), args.threshold))
@@ -0,0 +1,62 @@
+import argparse
+import asyncio
+import os
+import time
+from datetime import date
+
+from app.db.bulk_seed import (
+    MAX_ADJUSTMENTS_PER_ROOM, analyze_catalog, catalog_size, finish_load, load_catalog, reset_catalog, seed_users,
+)
+from app.core.cache import CATALOG_ROOMS_SCOPE, CATALOG_SCOPE, response_cache, warn_if_cache_not_shared
+from app.db.session import engine
+
+BENCH_EMAIL = "bench@example.com"
+BENCH_PASSWORD = "benchpassword"
+
+async def load(
+    hotels: int, rooms: int, adjustments: int, seed: int, today: date, reset: bool, batch: int, workers: int, chunk_size: int
+) -> None:
+    async with engine.begin() as conn:
+        existing = await catalog_size(conn)
+        if existing and not reset:
+            raise SystemExit(f"hotels already has {existing} rows; pass --reset to replace the catalog")
+        if reset:
+            await reset_catalog(conn)
+
+    await asyncio.to_thread(load_catalog, hotels, rooms, adjustments, seed, today, workers, chunk_size, batch)
+
+    async with engine.begin() as conn:
+        await finish_load(conn)
+        await seed_users(conn, {BENCH_EMAIL: BENCH_PASSWORD})
+    await response_cache.bump(CATALOG_SCOPE, CATALOG_ROOMS_SCOPE)
+    await analyze_catalog()
+
+async def main(args) -> None:
+    if args.adjustments > MAX_ADJUSTMENTS_PER_ROOM:
+        raise SystemExit(f"--adjustments cannot exceed {MAX_ADJUSTMENTS_PER_ROOM} per room")
+    today = date.fromisoformat(args.today) if args.today else date.today()
+    started = time.perf_counter()
+    await load(args.hotels, args.rooms, args.adjustments, args.seed, today, args.reset, args.batch, args.workers, args.chunk_size)
+    await engine.dispose()
+    rooms = args.hotels * args.rooms
+    print(
+        f"loaded {args.hotels} hotels, {rooms} room types, {rooms * args.adjustments} adjustments "
+        f"(seed {args.seed}) in {time.perf_counter() - started:.1f}s; login as {BENCH_EMAIL} / {BENCH_PASSWORD}"
+    )
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Replace the catalog with a deterministic synthetic dataset for benchmarks. "
+        "Uses DATABASE_URL; point it at a scratch database."
+    )
+    parser.add_argument("--hotels", type=int, default=2000)
+    parser.add_argument("--rooms", type=int, default=5, help="room types per hotel")
+    parser.add_argument("--adjustments", type=int, default=60, help="rate adjustments per room type")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--today", help="reference date for adjustments (YYYY-MM-DD), default today")
+    parser.add_argument("--batch", type=int, default=500, help="hotels per COPY round")
+    parser.add_argument("--workers", type=int, default=min(4, os.cpu_count() or 1), help="parallel loader processes")
+    parser.add_argument("--chunk-size", type=int, default=2000, help="hotels per worker transaction")
+    parser.add_argument("--reset", action="store_true", help="truncate the catalog, inventory and bookings first")
+    warn_if_cache_not_shared("benchmarks.datagen")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,194 @@
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import httpx
+from sqlalchemy import func, select
+
+from app.db.session import engine
+from app.models.hotel import Hotel, RoomType
+from app.models.rate import RateAdjustment
+from benchmarks.workloads import AUTHENTICATED, Context, Sample, login, parse_workloads
+# Import all models to ensure they are registered
+import app.models # noqa
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+def percentile(values: List[float], pct: float) -> float:
+    # Nearest rank on sorted values, in milliseconds
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000
+
+def summarize(samples: List[Sample], elapsed: float) -> dict:
+    by_endpoint: Dict[str, List[Sample]] = defaultdict(list)
+    for sample in samples:
+        by_endpoint[sample.endpoint].append(sample)
+    endpoints = {}
+    for endpoint, endpoint_samples in sorted(by_endpoint.items()):
+        latencies = [sample.seconds for sample in endpoint_samples]
+        statuses: Dict[str, int] = defaultdict(int)
+        for sample in endpoint_samples:
+            statuses[str(sample.status)] += 1
+        endpoints[endpoint] = {
+            "requests": len(endpoint_samples),
+            "errors": sum(1 for sample in endpoint_samples if sample.status == 0 or sample.status >= 500),
+            "statuses": dict(statuses),
+            "throughput_rps": len(endpoint_samples) / elapsed,
+            "mean_ms": sum(latencies) / len(latencies) * 1000,
+            "p50_ms": percentile(latencies, 0.50),
+            "p95_ms": percentile(latencies, 0.95),
+            "p99_ms": percentile(latencies, 0.99),
+            "max_ms": max(latencies) * 1000,
+        }
+    latencies = [sample.seconds for sample in samples]
+    return {
+        "duration_s": elapsed,
+        "requests": len(samples),
+        "errors": sum(endpoint["errors"] for endpoint in endpoints.values()),
+        "throughput_rps": len(samples) / elapsed if elapsed else 0.0,
+        "p50_ms": percentile(latencies, 0.50) if latencies else None,
+        "p95_ms": percentile(latencies, 0.95) if latencies else None,
+        "p99_ms": percentile(latencies, 0.99) if latencies else None,
+        "endpoints": endpoints,
+    }
+
+async def drive(client: httpx.AsyncClient, ctx: Context, workload, concurrency: int, duration: float, seed: int) -> float:
+    """Run ``concurrency`` loops of the workload for ``duration`` seconds; returns the elapsed time."""
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        rng = random.Random(f"{seed}:{index}")
+        while time.perf_counter() < deadline:
+            await workload(client, ctx, rng)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(index) for index in range(concurrency)))
+    return time.perf_counter() - started
+
+async def dataset_context() -> Context:
+    async with engine.connect() as conn:
+        hotels = await conn.scalar(select(func.max(Hotel.id)))
+        room_types = await conn.scalar(select(func.max(RoomType.id)))
+        adjustments = await conn.scalar(select(func.count()).select_from(RateAdjustment))
+    await engine.dispose()
+    if not hotels:
+        raise SystemExit("No hotels found; run python -m benchmarks.datagen first")
+    return Context(
+        hotels=hotels,
+        room_types=room_types or 0,
+        rooms_per_hotel=max(1, (room_types or 0) // hotels),
+        today=date.today(),
+        adjustments=adjustments,
+    )
+
+def git_revision() -> Dict[str, Optional[str]]:
+    def git(*args) -> Optional[str]:
+        try:
+            return subprocess.run(["git", *args], capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+    status = git("status", "--porcelain", "--untracked-files=no")
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(status) if status is not None else None}
+
+def start_server(port: int, workers: int) -> subprocess.Popen:
+    env = {**os.environ, "LOG_LEVEL": os.environ.get("LOG_LEVEL", "WARNING")}
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--workers", str(workers), "--no-access-log"],
+        env=env,
+    )
+
+async def wait_until_ready(base_url: str, timeout: float = 30.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get(base_url.rsplit("/api/", 1)[0] + "/")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.2)
+    raise SystemExit(f"Server at {base_url} did not become ready within {timeout}s")
+
+async def main(args) -> int:
+    workloads = parse_workloads(args.workloads)
+    ctx = await dataset_context()
+    server = start_server(args.port, args.server_workers) if args.start_server else None
+    base_url = args.base_url or f"http://127.0.0.1:{args.port}/api/v1"
+    try:
+        if server is not None:
+            await wait_until_ready(base_url)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        results = {}
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+            if any(name in AUTHENTICATED for name, _ in workloads):
+                ctx.auth_headers = await login(client)
+            for name, workload in workloads:
+                if args.warmup:
+                    await drive(client, ctx, workload, args.concurrency, args.warmup, args.seed)
+                ctx.samples = []
+                elapsed = await drive(client, ctx, workload, args.concurrency, args.duration, args.seed)
+                results[name] = summarize(ctx.samples, elapsed)
+                summary = results[name]
+                print(
+                    f"{name}: {summary['requests']} requests, {summary['throughput_rps']:.1f} req/s, "
+                    f"p50 {summary['p50_ms']:.1f} ms, p95 {summary['p95_ms']:.1f} ms, "
+                    f"p99 {summary['p99_ms']:.1f} ms, {summary['errors']} errors"
+                )
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait(timeout=30)
+
+    revision = git_revision()
+    report = {
+        "meta": {
+            "label": args.label,
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            **revision,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "base_url": base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+            "server_workers": args.server_workers if server is not None else None,
+            "dataset": {"hotels": ctx.hotels, "room_types": ctx.room_types, "adjustments": ctx.adjustments},
+        },
+        "workloads": results,
+    }
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"{datetime.now():%Y%m%d-%H%M%S}-{(revision['commit'] or 'unknown')[:10]}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+    print(f"results written to {output}")
+    return 1 if any(summary["errors"] for summary in results.values()) else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Drive scripted workloads against the API and record latency percentiles and "
+        "throughput as JSON. Reads dataset sizes from DATABASE_URL (see benchmarks.datagen)."
+    )
+    parser.add_argument("--workloads", default="catalog_browse,price_lookup,bulk_rate_write,login_burst")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds per workload")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds per workload first")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--base-url", help="default http://127.0.0.1:PORT/api/v1")
+    parser.add_argument("--start-server", action="store_true", help="run uvicorn for the duration of the benchmark")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--server-workers", type=int, default=1)
+    parser.add_argument("--label", help="free-form note stored with the results")
+    parser.add_argument("--output", help="results file, default benchmarks/results/<time>-<commit>.json")
+    sys.exit(asyncio.run(main(parser.parse_args())))
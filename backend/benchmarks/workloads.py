@@ -0,0 +1,133 @@
+import random
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.datagen import BENCH_EMAIL, BENCH_PASSWORD
+
+SEARCH_TERMS = ("grand", "resort", "harbor", "lodge", "suites", "garden")
+
+@dataclass
+class Sample:
+    endpoint: str
+    status: int  # 0 when the request failed without a response
+    seconds: float
+
+@dataclass
+class Context:
+    """What the workloads need to know about the dataset and the server."""
+    hotels: int
+    room_types: int
+    rooms_per_hotel: int
+    today: date
+    adjustments: int = 0
+    # Cookie header of the benchmark user, for workloads that write
+    auth_headers: Dict[str, str] = field(default_factory=dict)
+    samples: List[Sample] = field(default_factory=list)
+
+    def hotel_id(self, rng: random.Random) -> int:
+        return rng.randint(1, self.hotels)
+
+    async def request(self, client: httpx.AsyncClient, endpoint: str, method: str, url: str, **kwargs) -> Optional[httpx.Response]:
+        """Send one request and record its latency under ``endpoint`` (the route template)."""
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except httpx.HTTPError:
+            self.samples.append(Sample(endpoint, 0, time.perf_counter() - started))
+            return None
+        finally:
+            # Requests carry only the cookies a workload passes explicitly
+            client.cookies.clear()
+        self.samples.append(Sample(endpoint, response.status_code, time.perf_counter() - started))
+        return response
+
+Workload = Callable[[httpx.AsyncClient, Context, random.Random], Awaitable[None]]
+WORKLOADS: Dict[str, Workload] = {}
+# Workloads that need the benchmark user's session cookie
+AUTHENTICATED = set()
+
+def workload(name: str, authenticated: bool = False):
+    def register(fn: Workload) -> Workload:
+        WORKLOADS[name] = fn
+        if authenticated:
+            AUTHENTICATED.add(name)
+        return fn
+    return register
+
+@workload("catalog_browse")
+async def catalog_browse(client: httpx.AsyncClient, ctx: Context, rng: random.Random) -> None:
+    """A visitor paging the catalog, searching, then opening a hotel and its rooms."""
+    response = await ctx.request(client, "GET /hotels/", "GET", "/hotels/", params={"cursor": "", "limit": 20, "order_by": "name"})
+    if response is not None and response.status_code == 200 and response.json().get("nextCursor"):
+        await ctx.request(
+            client, "GET /hotels/ (next page)", "GET", "/hotels/",
+            params={"cursor": response.json()["nextCursor"], "limit": 20, "order_by": "name"},
+        )
+    await ctx.request(
+        client, "GET /hotels/search", "GET", "/hotels/search",
+        params={"q": rng.choice(SEARCH_TERMS), "sort": "rating", "limit": 20},
+    )
+    hotel_id = ctx.hotel_id(rng)
+    await ctx.request(client, "GET /hotels/{hotel_id}", "GET", f"/hotels/{hotel_id}")
+    await ctx.request(client, "GET /hotels/{hotel_id}/rooms", "GET", f"/hotels/{hotel_id}/rooms")
+
+@workload("price_lookup")
+async def price_lookup(client: httpx.AsyncClient, ctx: Context, rng: random.Random) -> None:
+    """Price calendar and availability for a random stay at a random hotel."""
+    hotel_id = ctx.hotel_id(rng)
+    start = ctx.today + timedelta(days=rng.randint(0, 180))
+    end = start + timedelta(days=rng.randint(1, 14))
+    await ctx.request(
+        client, "GET /hotels/{hotel_id}/rooms/prices", "GET", f"/hotels/{hotel_id}/rooms/prices",
+        params={"start": start.isoformat(), "end": end.isoformat()},
+    )
+    await ctx.request(
+        client, "GET /availability/", "GET", "/availability/",
+        params={"start": start.isoformat(), "end": end.isoformat(), "hotelId": [hotel_id, ctx.hotel_id(rng)]},
+    )
+
+@workload("bulk_rate_write", authenticated=True)
+async def bulk_rate_write(client: httpx.AsyncClient, ctx: Context, rng: random.Random) -> None:
+    """A revenue manager loading a month of weekend rates for one hotel's rooms."""
+    hotel_id = ctx.hotel_id(rng)
+    first_room = (hotel_id - 1) * ctx.rooms_per_hotel + 1
+    start = ctx.today + timedelta(days=rng.randint(0, 300))
+    payload = {
+        "rules": [{
+            "room_type_ids": list(range(first_room, first_room + ctx.rooms_per_hotel)),
+            "start_date": start.isoformat(),
+            "end_date": (start + timedelta(days=30)).isoformat(),
+            "adjustment_amount": float(rng.randrange(-50, 100, 5)),
+            "reason": "Benchmark",
+            "weekdays": [4, 5],
+        }]
+    }
+    await ctx.request(client, "POST /rates/bulk", "POST", "/rates/bulk", json=payload, headers=ctx.auth_headers)
+
+@workload("login_burst")
+async def login_burst(client: httpx.AsyncClient, ctx: Context, rng: random.Random) -> None:
+    """Logins, mostly successful, each paying for a bcrypt verification."""
+    password = BENCH_PASSWORD if rng.random() < 0.9 else "wrong-password"
+    await ctx.request(
+        client, "POST /login/access-token", "POST", "/login/access-token",
+        data={"username": BENCH_EMAIL, "password": password},
+    )
+
+async def login(client: httpx.AsyncClient) -> Dict[str, str]:
+    """Cookie header authenticating as the benchmark user."""
+    response = await client.post("/login/access-token", data={"username": BENCH_EMAIL, "password": BENCH_PASSWORD})
+    response.raise_for_status()
+    client.cookies.clear()
+    return {"Cookie": f"access_token={response.cookies['access_token']}"}
+
+def parse_workloads(names: str) -> List[Tuple[str, Workload]]:
+    selected = []
+    for name in (part.strip() for part in names.split(",")):
+        if name not in WORKLOADS:
+            raise SystemExit(f"Unknown workload {name!r} (available: {', '.join(WORKLOADS)})")
+        selected.append((name, WORKLOADS[name]))
+    return selected
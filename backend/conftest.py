@@ -0,0 +1,71 @@
+import asyncio
+from typing import Iterator, List, NamedTuple
+
+import pytest
+from sqlalchemy import delete, text
+from sqlalchemy.exc import DBAPIError
+
+pytest_plugins = ["app.testing.query_budget"]
+
+async def _ping() -> None:
+    from app.db.session import engine
+
+    async with engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+@pytest.fixture(scope="session")
+def client() -> Iterator["TestClient"]:
+    """The app with its lifespan running; skips the tests using it when PostgreSQL is unreachable."""
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    with TestClient(app) as client:
+        try:
+            # On the app's event loop, which owns the connection pool
+            client.portal.call(_ping)
+        except (OSError, DBAPIError, asyncio.TimeoutError) as exc:
+            pytest.skip(f"PostgreSQL is not reachable: {exc}")
+        yield client
+
+class Catalog(NamedTuple):
+    hotel_id: int
+    room_type_ids: List[int]
+
+async def _create_catalog(rooms: int, room_count: int) -> Catalog:
+    from app.core.cache import CATALOG_SCOPE, bump_rooms, response_cache
+    from app.db.session import AsyncSessionLocal
+    from app.models.hotel import Hotel, RoomType
+
+    async with AsyncSessionLocal() as db:
+        hotel = Hotel(name="Test hotel", location="Nowhere", rating=4.0)
+        db.add(hotel)
+        await db.flush()
+        room_types = [
+            RoomType(hotel_id=hotel.id, name=f"Test room {n + 1}", base_price=100.0 + n, room_count=room_count)
+            for n in range(rooms)
+        ]
+        db.add_all(room_types)
+        await db.commit()
+    await response_cache.bump(CATALOG_SCOPE)
+    await bump_rooms([hotel.id])
+    return Catalog(hotel.id, [room_type.id for room_type in room_types])
+
+async def _delete_catalog(hotel_id: int) -> None:
+    from app.core.cache import CATALOG_SCOPE, hotel_scope, response_cache
+    from app.db.session import AsyncSessionLocal
+    from app.models.hotel import Hotel
+
+    async with AsyncSessionLocal() as db:
+        # Room types, inventory and bookings go with it (ON DELETE CASCADE)
+        await db.execute(delete(Hotel).where(Hotel.id == hotel_id))
+        await db.commit()
+    await response_cache.bump(CATALOG_SCOPE, hotel_scope(hotel_id))
+
+@pytest.fixture
+def catalog(client) -> Iterator[Catalog]:
+    """A hotel with three room types of two rooms each, deleted after the test."""
+    catalog = client.portal.call(_create_catalog, 3, 2)
+    try:
+        yield catalog
+    finally:
+        client.portal.call(_delete_catalog, catalog.hotel_id)
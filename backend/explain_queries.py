@@ -0,0 +1,65 @@
+import argparse
+import asyncio
+from datetime import date
+
+from sqlalchemy import delete, func, select, text
+from sqlalchemy.dialects import postgresql
+
+from app.crud.crud_rate import price_calendar_query, effective_price_expr
+from app.db.session import AsyncSessionLocal
+from app.models.hotel import Hotel, RoomType
+from app.models.rate import RateAdjustment
+# Import all models to ensure they are registered
+import app.models # noqa
+
+def endpoint_queries(hotel_id: int, room_type_id: int, today: date) -> dict:
+    """The statements behind the main endpoints, keyed by a label."""
+    return {
+        "GET /hotels (keyset by name)": select(Hotel).order_by(Hotel.name, Hotel.id).limit(101),
+        "GET /hotels/{id}/rooms validators": (
+            select(func.count(RoomType.id), func.max(RoomType.updated_at))
+            .select_from(Hotel)
+            .outerjoin(RoomType, RoomType.hotel_id == Hotel.id)
+            .where(Hotel.id == hotel_id)
+            .group_by(Hotel.id)
+        ),
+        "GET /hotels/{id}/rooms effective prices": (
+            select(RoomType.id, effective_price_expr(today)).where(RoomType.hotel_id == hotel_id)
+        ),
+        "GET /hotels/{id}/rooms/prices (30 nights)": (
+            price_calendar_query(today, 30).where(RoomType.hotel_id == hotel_id)
+        ),
+        "GET /rates (history of one room)": (
+            select(RateAdjustment)
+            .where(RateAdjustment.room_type_id == room_type_id)
+            .order_by(RateAdjustment.effective_date.desc())
+            .limit(100)
+        ),
+        "DELETE /hotels/{id}": delete(Hotel).where(Hotel.id == hotel_id),
+    }
+
+async def explain(hotel_id: int, analyze: bool) -> None:
+    options = "ANALYZE, BUFFERS" if analyze else "COSTS"
+    async with AsyncSessionLocal() as db:
+        room_type_id = await db.scalar(
+            select(RoomType.id).where(RoomType.hotel_id == hotel_id).order_by(RoomType.id).limit(1)
+        )
+        for label, query in endpoint_queries(hotel_id, room_type_id or 0, date.today()).items():
+            sql = query.compile(dialect=postgresql.dialect(), compile_kwargs={"literal_binds": True})
+            result = await db.execute(text(f"EXPLAIN ({options}) {sql}"))
+            print(f"-- {label}")
+            for (line,) in result:
+                print(line)
+            print()
+        # ANALYZE executes the statements; never keep the DELETE
+        await db.rollback()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Print query plans of the main endpoints. Run before and after "
+        "`alembic upgrade head` and diff the output to compare plans."
+    )
+    parser.add_argument("--hotel-id", type=int, default=1)
+    parser.add_argument("--analyze", action="store_true", help="run EXPLAIN ANALYZE (rolled back)")
+    args = parser.parse_args()
+    asyncio.run(explain(args.hotel_id, args.analyze))
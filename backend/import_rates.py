@@ -0,0 +1,42 @@
+import argparse
+import asyncio
+import json
+import sys
+
+from app.core.cache import bump_rooms, warn_if_cache_not_shared
+from app.core.config import settings
+from app.crud.crud_rate_import import import_rate_adjustments, iter_lines, iter_records
+from app.db.session import AsyncSessionLocal
+# Import all models to ensure they are registered
+import app.models # noqa
+
+async def import_file(path: str, fmt: str, chunk_size: int) -> dict:
+    summary = {}
+    with open(path, "rb") as f:
+        async def read(size: int) -> bytes:
+            return f.read(size)
+
+        async with AsyncSessionLocal() as db:
+            async for event in import_rate_adjustments(
+                db,
+                iter_records(iter_lines(read), fmt),
+                chunk_size=chunk_size,
+                max_errors=settings.RATE_IMPORT_MAX_ERRORS,
+                on_chunk=lambda room_hotels: bump_rooms(room_hotels.values()),
+            ):
+                # Progress and rejected rows go to stdout as they happen
+                print(json.dumps(event, default=str), flush=True)
+                summary = event
+    return summary
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Import a CSV/NDJSON rate sheet into rate_adjustments.")
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="defaults from the file extension")
+    parser.add_argument("--chunk-size", type=int, default=settings.RATE_IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    warn_if_cache_not_shared("import_rates")
+    fmt = args.format or ("ndjson" if args.path.lower().endswith((".ndjson", ".jsonl")) else "csv")
+    summary = asyncio.run(import_file(args.path, fmt, args.chunk_size))
+    sys.exit(1 if summary.get("failed") else 0)
@@ -0,0 +1,140 @@
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from collections import Counter
+from datetime import date, timedelta
+
+import httpx
+from sqlalchemy import and_, delete, func, select
+
+from app.core import security
+from app.core.config import settings
+from app.db.session import AsyncSessionLocal
+from app.models.booking import Booking
+from app.models.hotel import Hotel, RoomType
+from app.models.inventory import RoomInventory
+from app.models.user import User
+# Import all models to ensure they are registered
+import app.models # noqa
+
+# Per fixture hotel, so runs kept with --keep do not collide
+USER_EMAIL = "load-holds-{hotel}-{n}@example.com"
+
+async def create_fixture(room_count: int, users: int) -> tuple:
+    """(hotel id, room type id, cookie headers of ``users`` fresh users)."""
+    async with AsyncSessionLocal() as db:
+        hotel = Hotel(name="Load test hotel", location="Nowhere", rating=0.0)
+        db.add(hotel)
+        await db.flush()
+        room = RoomType(hotel_id=hotel.id, name="Load test room", base_price=100.0, room_count=room_count)
+        db.add(room)
+        # Holds need an account; tokens are minted directly, so the users never log in
+        accounts = [User(email=USER_EMAIL.format(hotel=hotel.id, n=n), hashed_password="!", is_active=True) for n in range(users)]
+        db.add_all(accounts)
+        await db.commit()
+        headers = [{"Cookie": f"access_token={security.create_access_token(user.id)}"} for user in accounts]
+        return hotel.id, room.id, headers
+
+async def fire(
+    base_url: str, room_type_id: int, start: date, end: date, total: int, concurrency: int, quantity: int, auth_headers: list
+):
+    statuses: Counter = Counter()
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+    payload = {"roomTypeId": room_type_id, "start": start.isoformat(), "end": end.isoformat(), "quantity": quantity}
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        async def one(headers):
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.post("/bookings/", json=payload, headers=headers)
+                    statuses[response.status_code] += 1
+                except httpx.HTTPError as exc:
+                    statuses[type(exc).__name__] += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one(auth_headers[n % len(auth_headers)]) for n in range(total)))
+        elapsed = time.perf_counter() - started
+    return statuses, latencies, elapsed
+
+async def verify(room_type_id: int, room_count: int, start: date, nights: int) -> tuple:
+    """(oversold nights, nights where inventory disagrees with the live bookings)."""
+    oversold, mismatched = [], []
+    async with AsyncSessionLocal() as db:
+        for offset in range(nights):
+            night = start + timedelta(days=offset)
+            booked = await db.scalar(
+                select(func.coalesce(func.sum(Booking.quantity), 0)).where(
+                    Booking.room_type_id == room_type_id,
+                    Booking.status.in_(["held", "confirmed"]),
+                    and_(Booking.start_date <= night, Booking.end_date > night),
+                )
+            )
+            reserved = await db.scalar(
+                select(func.coalesce(func.max(RoomInventory.reserved), 0)).where(
+                    RoomInventory.room_type_id == room_type_id, RoomInventory.stay_date == night
+                )
+            )
+            if booked > room_count:
+                oversold.append((night, booked))
+            if booked != reserved:
+                mismatched.append((night, booked, reserved))
+    return oversold, mismatched
+
+async def cleanup(hotel_id: int) -> None:
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Hotel).where(Hotel.id == hotel_id))
+        await db.execute(delete(User).where(User.email.like(USER_EMAIL.format(hotel=hotel_id, n="%"))))
+        await db.commit()
+
+def percentile(values, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct))] * 1000
+
+async def main(args) -> int:
+    start = date.today() + timedelta(days=30)
+    end = start + timedelta(days=args.nights)
+    # Enough users that none reaches the per-user cap on live holds
+    users = -(-args.requests // settings.HOLD_MAX_ACTIVE_PER_USER)
+    hotel_id, room_type_id, auth_headers = await create_fixture(args.rooms, users)
+    try:
+        statuses, latencies, elapsed = await fire(
+            args.base_url, room_type_id, start, end, args.requests, args.concurrency, args.quantity, auth_headers
+        )
+        oversold, mismatched = await verify(room_type_id, args.rooms, start, args.nights)
+    finally:
+        if not args.keep:
+            await cleanup(hotel_id)
+
+    print(f"requests: {args.requests}  concurrency: {args.concurrency}  rooms: {args.rooms}  nights: {args.nights}")
+    print(f"responses: {dict(statuses)}")
+    print(f"throughput: {args.requests / elapsed:.1f} req/s over {elapsed:.2f}s")
+    print(
+        f"latency ms: p50 {statistics.median(latencies) * 1000:.1f}  "
+        f"p95 {percentile(latencies, 0.95):.1f}  p99 {percentile(latencies, 0.99):.1f}"
+    )
+    expected_holds = min(args.requests, args.rooms // args.quantity)
+    print(f"holds granted: {statuses[201]} (expected {expected_holds})")
+    print(f"oversold nights: {len(oversold)}  inventory mismatches: {len(mismatched)}")
+    for row in oversold + mismatched:
+        print(f"  {row}")
+    return 1 if oversold or mismatched or statuses[201] != expected_holds else 0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Hammer POST /bookings/ for one room type and check nothing was oversold. "
+        "Needs a running API and its database (DATABASE_URL), and the API's SECRET_KEY."
+    )
+    parser.add_argument("--base-url", default="http://localhost:8000/api/v1")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--rooms", type=int, default=50, help="room_count of the test room type")
+    parser.add_argument("--nights", type=int, default=3)
+    parser.add_argument("--quantity", type=int, default=1, help="rooms per hold")
+    parser.add_argument("--keep", action="store_true", help="keep the test hotel and its bookings")
+    sys.exit(asyncio.run(main(parser.parse_args())))
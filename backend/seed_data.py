@@ -1,15 +1,23 @@
+import argparse
 import logging
 import asyncio
+import os
+import time
 from datetime import date, timedelta
 
-from app.db.session import AsyncSessionLocal
-from app.crud.crud_hotel import create_hotel, create_room_type
-from app.schemas.hotel import HotelCreate, RoomTypeCreate
-from app.core.security import get_password_hash
-# Import all models to ensure they are registered
-import app.models # noqa
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import configure_mappers
 from sqlalchemy import select
+
+from app.db.bulk_seed import (
+    MAX_ADJUSTMENTS_PER_ROOM, analyze_catalog, catalog_size, finish_load, load_catalog, reset_catalog,
+    seed_numbered_users,
+)
+from app.db.session import AsyncSessionLocal, engine
+from app.core.cache import CATALOG_ROOMS_SCOPE, CATALOG_SCOPE, response_cache, warn_if_cache_not_shared
+from app.core.security import aget_password_hash
+# Import all models to ensure they are registered
+import app.models # noqa
 from app.models.hotel import Hotel, RoomType
 from app.models.user import User
 from app.models.rate import RateAdjustment
@@ -35,20 +43,17 @@ async def init_db() -> None:
                 "is_superuser": False
             })
 
-        for user_data in users_data:
-            existing_user = await db.execute(select(User).filter(User.email == user_data["email"]))
-            if existing_user.scalars().first():
-                print(f"User {user_data['email']} already exists, skipping.")
-                continue
-            
-            db_user = User(
-                email=user_data["email"],
-                hashed_password=get_password_hash(user_data["password"]),
-                is_superuser=user_data["is_superuser"]
-            )
-            db.add(db_user)
-        await db.commit()
-        print("Seeded 10 users.")
+        existing_emails = set((await db.execute(
+            select(User.email).where(User.email.in_([user_data["email"] for user_data in users_data]))
+        )).scalars())
+        new_users = [user_data for user_data in users_data if user_data["email"] not in existing_emails]
+        # bcrypt runs on the hashing pool's threads, so the hashes are computed in parallel
+        hashes = await asyncio.gather(*(aget_password_hash(user_data["password"]) for user_data in new_users))
+        db.add_all(
+            User(email=user_data["email"], hashed_password=hashed_password, is_superuser=user_data["is_superuser"])
+            for user_data, hashed_password in zip(new_users, hashes)
+        )
+        logger.info("Seeding %d users (%d already exist).", len(new_users), len(existing_emails))
 
         hotels_data = [
             {
@@ -163,68 +168,88 @@ async def init_db() -> None:
             }
         ]
 
+        existing_hotels = set((await db.execute(
+            select(Hotel.name).where(Hotel.name.in_([hotel_data["name"] for hotel_data in hotels_data]))
+        )).scalars())
         for hotel_data in hotels_data:
-            try:
-                # Check if hotel exists
-                existing_hotel = await db.execute(select(Hotel).filter(Hotel.name == hotel_data["name"]))
-                if existing_hotel.scalars().first():
-                    # print(f"Hotel {hotel_data['name']} already exists, skipping.")
-                    continue
+            if hotel_data["name"] in existing_hotels:
+                continue
+            logger.info("Creating hotel: %s", hotel_data["name"])
+            room_types = hotel_data.pop("room_types")
+            db.add(Hotel(**hotel_data, room_types=[RoomType(**rt_data) for rt_data in room_types]))
+        # One flush inserts the hotels, then their room types, as multi-row statements
+        await db.flush()
+
+        # Seed 10 Rate Adjustments on the first room types, skipping nights that already have one
+        room_type_ids = (await db.execute(select(RoomType.id).order_by(RoomType.id).limit(10))).scalars().all()
+        if room_type_ids:
+            await db.execute(
+                insert(RateAdjustment)
+                .values([
+                    {
+                        "room_type_id": room_type_id,
+                        "adjustment_amount": 20.0 + (i * 5.0),
+                        "effective_date": date.today() + timedelta(days=i*2),
+                        "reason": f"Seasonal adjustment {i+1}",
+                    }
+                    for i, room_type_id in enumerate(room_type_ids)
+                ])
+                .on_conflict_do_nothing(index_elements=["room_type_id", "effective_date"])
+            )
+        await db.commit()
+        # Catalog ETags come from the cache version, not the tables
+        await response_cache.bump(CATALOG_SCOPE, CATALOG_ROOMS_SCOPE)
+        logger.info("Seeded %d hotels and %d rate adjustments.", len(hotels_data) - len(existing_hotels), len(room_type_ids))
 
-                print(f"Creating hotel: {hotel_data['name']}")
-                room_types = hotel_data.pop("room_types")
-                
-                db_hotel = Hotel(
-                    name=hotel_data["name"],
-                    location=hotel_data["location"],
-                    description=hotel_data["description"],
-                    rating=hotel_data["rating"],
-                    image_url=hotel_data["image_url"]
-                )
-                db.add(db_hotel)
-                await db.commit()
-                await db.refresh(db_hotel)
-                
-                for rt_data in room_types:
-                    db_room_type = RoomType(
-                        name=rt_data["name"],
-                        description=rt_data["description"],
-                        base_price=rt_data["base_price"],
-                        capacity=rt_data["capacity"],
-                        hotel_id=db_hotel.id
-                    )
-                    db.add(db_room_type)
-                await db.commit()
-            except Exception as e:
-                print(f"Error creating hotel {hotel_data.get('name')}: {e}")
+async def bulk_seed(args) -> None:
+    """Synthetic catalog of ``args.hotels`` hotels loaded with COPY by parallel workers."""
+    today = date.fromisoformat(args.today) if args.today else date.today()
+    started = time.perf_counter()
+    async with engine.begin() as conn:
+        existing = await catalog_size(conn)
+        if existing and not args.reset:
+            raise SystemExit(f"hotels already has {existing} rows; pass --reset to replace the catalog")
+        if args.reset:
+            await reset_catalog(conn)
 
-        # Seed 10 Rate Adjustments
-        # Get some room type IDs
-        result = await db.execute(select(RoomType).limit(10))
-        room_types = result.scalars().all()
-        
-        if room_types:
-            for i, rt in enumerate(room_types):
-                # Check if adjustment exists for this date/reason to avoid duplicates
-                effective_date = date.today() + timedelta(days=i*2)
-                existing_adj = await db.execute(
-                    select(RateAdjustment)
-                    .filter(RateAdjustment.room_type_id == rt.id, RateAdjustment.effective_date == effective_date)
-                )
-                if existing_adj.scalars().first():
-                    continue
+    loaded = await asyncio.to_thread(
+        load_catalog, args.hotels, args.rooms, args.adjustments, args.seed, today, args.workers, args.chunk_size, args.batch
+    )
 
-                adj = RateAdjustment(
-                    room_type_id=rt.id,
-                    adjustment_amount=20.0 + (i * 5.0),
-                    effective_date=effective_date,
-                    reason=f"Seasonal adjustment {i+1}"
-                )
-                db.add(adj)
-            await db.commit()
-            print("Seeded 10 rate adjustments.")
+    async with engine.begin() as conn:
+        await finish_load(conn)
+        if args.users:
+            await seed_numbered_users(conn, args.users, args.user_password)
+    await response_cache.bump(CATALOG_SCOPE, CATALOG_ROOMS_SCOPE)
+    await analyze_catalog()
+    await engine.dispose()
+    logger.info(
+        "Loaded %d hotels, %d room types, %d rate adjustments and %d users (seed %d) in %.1fs.",
+        *loaded, args.users, args.seed, time.perf_counter() - started,
+    )
 
 if __name__ == "__main__":
-    print("Starting seeding...")
-    asyncio.run(init_db())
-    print("Seeding completed!")
+    parser = argparse.ArgumentParser(
+        description="Seed the demo dataset, or with --bulk a large deterministic synthetic one."
+    )
+    parser.add_argument("--bulk", action="store_true", help="generate a synthetic catalog instead of the demo data")
+    bulk = parser.add_argument_group("bulk options")
+    bulk.add_argument("--hotels", type=int, default=100_000)
+    bulk.add_argument("--rooms", type=int, default=5, help="room types per hotel")
+    bulk.add_argument("--adjustments", type=int, default=20, help="rate adjustments per room type")
+    bulk.add_argument("--users", type=int, default=1000, help="users loadN@example.com, all sharing one password")
+    bulk.add_argument("--user-password", default="loadpassword")
+    bulk.add_argument("--seed", type=int, default=42)
+    bulk.add_argument("--today", help="reference date for adjustments (YYYY-MM-DD), default today")
+    bulk.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="parallel loader processes")
+    bulk.add_argument("--chunk-size", type=int, default=2000, help="hotels per worker transaction")
+    bulk.add_argument("--batch", type=int, default=500, help="hotels per COPY round")
+    bulk.add_argument("--reset", action="store_true", help="truncate the catalog, inventory and bookings first")
+    args = parser.parse_args()
+    if args.adjustments > MAX_ADJUSTMENTS_PER_ROOM:
+        parser.error(f"--adjustments cannot exceed {MAX_ADJUSTMENTS_PER_ROOM} per room")
+
+    warn_if_cache_not_shared("seed_data")
+    logger.info("Starting seeding...")
+    asyncio.run(bulk_seed(args) if args.bulk else init_db())
+    logger.info("Seeding completed!")
@@ -0,0 +1,49 @@
+import asyncio
+
+import pytest
+
+from app.core.cache import InMemoryCacheBackend, ResponseCache
+
+def _cache() -> ResponseCache:
+    return ResponseCache(InMemoryCacheBackend(maxsize=10), ttl=60, lock_ttl=5)
+
+def test_waiters_survive_the_first_caller_being_cancelled():
+    async def scenario():
+        cache = _cache()
+        calls = 0
+
+        async def producer():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.05)
+            return b"value"
+
+        first = asyncio.ensure_future(cache.get_or_set("key", producer))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(cache.get_or_set("key", producer))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        assert await second == b"value"
+        assert first.cancelled()
+        assert calls == 1
+        # Stored by the shared task although its first caller went away
+        assert await cache.get_or_set("key", producer) == b"value"
+        assert calls == 1
+
+    asyncio.run(scenario())
+
+def test_producer_errors_reach_every_caller():
+    async def scenario():
+        cache = _cache()
+
+        async def producer():
+            await asyncio.sleep(0.01)
+            raise ValueError("boom")
+
+        results = await asyncio.gather(
+            cache.get_or_set("key", producer), cache.get_or_set("key", producer), return_exceptions=True
+        )
+        assert [type(result) for result in results] == [ValueError, ValueError]
+        assert not cache._inflight
+
+    asyncio.run(scenario())
@@ -0,0 +1,51 @@
+"""Holds against room count changes on a real database; need PostgreSQL (see the ``client`` fixture)."""
+import asyncio
+from datetime import date, timedelta
+
+from app.crud import crud_hotel, crud_inventory
+from app.db.session import AsyncSessionLocal
+from app.schemas.hotel import RoomTypeUpdate
+
+# Long enough for a statement that is not blocked to finish
+BLOCKED = 0.3
+
+def _night() -> date:
+    return date.today() + timedelta(days=30)
+
+async def _lower_during_hold(hotel_id: int, room_type_id: int) -> None:
+    night = _night()
+    async with AsyncSessionLocal() as hold_db, AsyncSessionLocal() as admin_db:
+        assert await crud_inventory.allocate(hold_db, room_type_id, night, nights=1, quantity=2)
+
+        async def lower():
+            assert await crud_inventory.lock_room_type(admin_db, hotel_id=hotel_id, room_type_id=room_type_id)
+            return await crud_inventory.overbooked_nights(admin_db, room_type_id=room_type_id, room_count=1)
+
+        lowering = asyncio.ensure_future(lower())
+        await asyncio.sleep(BLOCKED)
+        assert not lowering.done(), "the room count change did not wait for the hold in flight"
+        await hold_db.commit()
+        assert await asyncio.wait_for(lowering, 5) == [night]
+        await admin_db.rollback()
+
+async def _hold_during_lowering(hotel_id: int, room_type_id: int) -> None:
+    night = _night()
+    async with AsyncSessionLocal() as hold_db, AsyncSessionLocal() as admin_db:
+        assert await crud_inventory.lock_room_type(admin_db, hotel_id=hotel_id, room_type_id=room_type_id)
+        assert await crud_inventory.overbooked_nights(admin_db, room_type_id=room_type_id, room_count=1) == []
+
+        holding = asyncio.ensure_future(crud_inventory.allocate(hold_db, room_type_id, night, nights=1, quantity=2))
+        await asyncio.sleep(BLOCKED)
+        assert not holding.done(), "the hold did not wait for the room count change"
+        # Commits the new count of 1 and releases the lock
+        assert await crud_hotel.update_room_type(
+            admin_db, hotel_id=hotel_id, room_id=room_type_id, room_type=RoomTypeUpdate(room_count=1)
+        )
+        assert await asyncio.wait_for(holding, 5) is False
+        await hold_db.rollback()
+
+def test_room_count_decrease_waits_for_a_hold_in_flight(client, catalog):
+    client.portal.call(_lower_during_hold, catalog.hotel_id, catalog.room_type_ids[0])
+
+def test_hold_waits_for_a_room_count_decrease(client, catalog):
+    client.portal.call(_hold_during_lowering, catalog.hotel_id, catalog.room_type_ids[0])
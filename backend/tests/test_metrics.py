@@ -0,0 +1,66 @@
+import threading
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine, text
+
+from app.core.metrics import RequestDbStats, fingerprint, instrument_engine, track_queries
+
+def test_fingerprint_collapses_asyncpg_in_lists():
+    two = fingerprint("SELECT hotels.id FROM hotels WHERE hotels.id IN ($1::INTEGER, $2::INTEGER)")
+    three = fingerprint("SELECT hotels.id FROM hotels WHERE hotels.id IN ($1::INTEGER, $2::INTEGER, $3::INTEGER)")
+    assert two == three == "SELECT hotels.id FROM hotels WHERE hotels.id IN (...)"
+
+def test_fingerprint_strips_multi_word_and_array_casts():
+    statement = (
+        "SELECT * FROM room_types WHERE updated_at > $1::TIMESTAMP WITH TIME ZONE "
+        "AND base_price > $2::DOUBLE PRECISION AND name = ANY($3::VARCHAR[])"
+    )
+    assert fingerprint(statement) == (
+        "SELECT * FROM room_types WHERE updated_at > ? AND base_price > ? AND name = ANY(...)"
+    )
+
+def test_fingerprint_replaces_literals_and_pyformat_parameters():
+    assert fingerprint("SELECT 'it''s', 4.5 FROM t WHERE a = %(a_1)s AND b IN (%(b_1)s, %(b_2)s)") == (
+        "SELECT ?, ? FROM t WHERE a = ? AND b IN (...)"
+    )
+
+def test_fingerprint_normalizes_whitespace():
+    assert fingerprint("SELECT 1\n  FROM   t") == "SELECT ? FROM t"
+
+def test_request_db_stats_counts_fingerprints_on_demand():
+    stats = RequestDbStats()
+    stats.record("SELECT $1::INTEGER", 0.001)
+    assert stats.queries == 1 and stats.fingerprints is None
+
+    stats.count_statements()
+    for value in range(3):
+        stats.record(f"SELECT * FROM hotels WHERE id = {value}", 0.001)
+    assert stats.queries == 4
+    assert stats.repeated(3) == [("SELECT * FROM hotels WHERE id = ?", 3)]
+    assert stats.repeated(4) == []
+
+def test_request_db_stats_record_reaches_parents():
+    outer = RequestDbStats()
+    outer.count_statements()
+    inner = RequestDbStats(parent=outer)
+    inner.record("SELECT 1", 0.002)
+    assert inner.queries == outer.queries == 1
+    assert inner.fingerprints is None
+    assert outer.fingerprints == {"SELECT ?": 1}
+
+def test_track_queries_ignores_other_threads():
+    engine = create_engine("sqlite://")
+    instrument_engine(SimpleNamespace(sync_engine=engine), "primary")
+
+    def run():
+        with engine.connect() as conn:
+            conn.execute(text("SELECT 1"))
+
+    with track_queries() as stats:
+        run()
+        # Stands in for the app's background tasks and concurrent requests
+        other = threading.Thread(target=run)
+        other.start()
+        other.join()
+    run()
+    assert stats.queries == 1
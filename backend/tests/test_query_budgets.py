@@ -0,0 +1,26 @@
+"""Query budgets of the hot read endpoints; need PostgreSQL (see the ``client`` fixture)."""
+import pytest
+
+# Creating the catalog bumps the cache versions, so each request below runs
+# its queries instead of reading a cached entry
+
+def test_hotel_list_with_rooms(client, catalog, query_budget):
+    # Hotels, their room types and one price query for the whole page
+    with query_budget(3):
+        response = client.get("/api/v1/hotels/", params={"include": "rooms", "limit": 50})
+    assert response.status_code == 200
+    assert response.json()
+
+def test_hotel_list_cursor_page(client, catalog, query_budget):
+    with query_budget(1):
+        response = client.get("/api/v1/hotels/", params={"cursor": "", "order_by": "name", "limit": 50})
+    assert response.status_code == 200
+    assert response.json()["items"]
+
+# Validators, the hotel, its room types and their prices; the catalog fixture
+# is set up before the marker's budget starts
+@pytest.mark.query_budget(4)
+def test_room_list(client, catalog):
+    response = client.get(f"/api/v1/hotels/{catalog.hotel_id}/rooms")
+    assert response.status_code == 200
+    assert sorted(room["id"] for room in response.json()) == sorted(catalog.room_type_ids)